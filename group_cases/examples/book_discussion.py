@@ -2,14 +2,14 @@
 Example script demonstrating a discussion about evaluating a new book idea.
 """
 from ..src.core.discussion_manager import DiscussionManager
-from ..src.core.base_discussion import BaseDiscussion, DiscussionType
+from ..src.core.base_discussion import BaseDiscussion, BRAINSTORMING
 
 class BookDiscussion(BaseDiscussion):
     """Discussion about evaluating and developing a book idea."""
     
     def __init__(self):
         self.name = "Book Concept Evaluation"
-        self.discussion_type = DiscussionType.BRAINSTORMING
+        self.discussion_type = BRAINSTORMING
         self.context = {
             "concept": "A science fiction novel about a society where dreams can be recorded and traded",
             "target_audience": "Young Adult and Adult readers",
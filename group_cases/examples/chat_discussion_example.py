@@ -1,7 +1,7 @@
 """
 Example of using chat interface and word processing in discussions.
 """
-from group_cases.src.core.base_discussion import BaseDiscussion, DiscussionType
+from group_cases.src.core.base_discussion import BaseDiscussion, DiscussionType, BRAINSTORMING
 from group_cases.src.tools.chat_interface import ChatInterface
 from group_cases.src.tools.word_processor import WordProcessor
 import json
@@ -47,7 +47,7 @@ def main():
     # Create discussion
     discussion = ChatBasedDiscussion(
         "Product Feature Planning",
-        DiscussionType.BRAINSTORMING
+        BRAINSTORMING
     )
     
     # Add participants
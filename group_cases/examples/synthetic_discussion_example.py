@@ -2,7 +2,7 @@
 Example of using synthetic data generation for discussions.
 """
 from group_cases.src.utils.synthetic_data import SyntheticDataGenerator
-from group_cases.src.core.base_discussion import DiscussionType
+from group_cases.src.core.base_discussion import BRAINSTORMING, EVALUATION, INTERVIEW
 import json
 import os
 
@@ -13,19 +13,19 @@ def main():
     # Generate data for different discussion types
     discussion_configs = [
         {
-            "type": DiscussionType.BRAINSTORMING,
+            "type": BRAINSTORMING,
             "name": "product_features",
             "participants": 5,
             "steps": 4
         },
         {
-            "type": DiscussionType.EVALUATION,
+            "type": EVALUATION,
             "name": "design_review",
             "participants": 4,
             "steps": 3
         },
         {
-            "type": DiscussionType.INTERVIEW,
+            "type": INTERVIEW,
             "name": "user_research",
             "participants": 3,
             "steps": 4
@@ -2,14 +2,14 @@
 Example script demonstrating the DiscussionManager in action.
 """
 from group_cases.src.core.discussion_manager import DiscussionManager
-from group_cases.src.core.base_discussion import BaseDiscussion, DiscussionType
+from group_cases.src.core.base_discussion import BaseDiscussion, BRAINSTORMING
 
 class ProductDiscussion(BaseDiscussion):
     """Example discussion about product features."""
     
     def __init__(self):
         self.name = "Product Feature Discussion"
-        self.discussion_type = DiscussionType.BRAINSTORMING
+        self.discussion_type = BRAINSTORMING
         self.context = {
             "product": "Mobile App",
             "current_features": ["User Authentication", "Profile Management"],
@@ -5,6 +5,7 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
-        "tinytroupe"
+        "tinytroupe",
+        "orjson"
     ],
 )
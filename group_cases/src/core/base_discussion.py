@@ -1,16 +1,20 @@
 """
 Base discussion module providing core functionality for all discussion types.
 """
-from enum import Enum
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Final, List, Literal, Optional, TypeAlias, get_args
 
-class DiscussionType(Enum):
-    FOCUS_GROUP = "focus_group"
-    INTERVIEW = "interview"
-    BRAINSTORMING = "brainstorming"
-    EVALUATION = "evaluation"
+# Discussion types are plain (interned) strings, so dispatching on them is a cheap string/identity
+# comparison and they serialize to JSON as-is.
+DiscussionType: TypeAlias = Literal["focus_group", "interview", "brainstorming", "evaluation"]
+
+FOCUS_GROUP: Final = "focus_group"
+INTERVIEW: Final = "interview"
+BRAINSTORMING: Final = "brainstorming"
+EVALUATION: Final = "evaluation"
+
+DISCUSSION_TYPES: Final = get_args(DiscussionType)
 
 class BaseDiscussion:
     """Base class for all discussion types."""
@@ -21,14 +25,14 @@ class BaseDiscussion:
         
         Args:
             name: Name/identifier for the discussion
-            discussion_type: Type of discussion from DiscussionType enum
+            discussion_type: Type of discussion, one of DISCUSSION_TYPES
         """
         self.name = name
         self.discussion_type = discussion_type
         self.context: Dict[str, Any] = {}
         self.metadata: Dict[str, Any] = {
             "name": name,
-            "type": discussion_type.value
+            "type": discussion_type
         }
         
     def add_context(self, key: str, value: Any) -> None:
@@ -4,20 +4,24 @@ This integrates the TinyTroupe character system with our group discussion functi
 """
 
 import os
-import sys
-from typing import List, Dict, Any
+import json
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import random
-
-# Add TinyTroupe to Python path
-tinytroupe_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
-sys.path.insert(0, tinytroupe_path)
-
-from group_cases.src.core.characters import TinyPerson, EpisodicMemory, RecallFaculty, FilesAndWebGroundingFaculty
+import re
+import threading
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tinytroupe.agent import TinyPerson, EpisodicMemory, RecallFaculty, FilesAndWebGroundingFaculty
 from tinytroupe.memory import EnhancedSemanticMemory
-from group_cases.src.core.environment import TinyWorld
-from .discussion import GroupDiscussion, MessageType, DiscussionType
+from tinytroupe.environment import TinyWorld
+from enhanced_group_memory.src.core.discussion import GroupDiscussion, MessageType, DiscussionType
+from ..utils.semantic_cache import SemanticCache
+from ..utils.concurrency import agent_concurrency
 
 __all__ = [
     'Character',
@@ -33,7 +37,126 @@ __all__ = [
     'create_elena_the_urban_planner'
 ]
 
-@dataclass
+# Maximum number of character responses generated concurrently
+MAX_CONCURRENT_RESPONSES = 8
+
+# Context of a character that is not taking part in a discussion yet
+_INITIAL_CONTEXT = "Ready to engage in meaningful discussion"
+
+# Interests that are considered personal (hobbies) rather than professional
+_PERSONAL_INTERESTS = frozenset({'music', 'sports', 'arts', 'photography', 'rock climbing', 'martial arts'})
+
+# Keywords used by the simple sentiment analysis, compiled once into a single matcher that
+# finds both kinds of keywords in one scan of the text
+_POSITIVE_WORDS = frozenset({'great', 'good', 'excellent', 'agree', 'positive', 'interesting', 'helpful', 'valuable', 'excited'})
+_NEGATIVE_WORDS = frozenset({'bad', 'disagree', 'negative', 'wrong', 'difficult', 'concerned', 'worried', 'problematic'})
+_SENTIMENT_WORDS_RE = re.compile(
+    r'\b(?:(?P<positive>' + '|'.join(sorted(_POSITIVE_WORDS)) + r')|(?P<negative>' + '|'.join(sorted(_NEGATIVE_WORDS)) + r'))\b',
+    re.IGNORECASE
+)
+
+# Detailed descriptions of well-known occupations
+_OCCUPATION_DESCRIPTIONS: Dict[str, str] = {
+    "Senior Data Scientist": "specializes in advanced machine learning and data analytics, focusing on ethical AI development and practical applications of statistical analysis",
+    "Sustainable Architecture Specialist": "focuses on designing environmentally conscious buildings and urban spaces, integrating renewable materials and sustainable practices",
+    "Clinical Psychologist": "helps individuals and groups navigate complex emotional and behavioral challenges using evidence-based therapeutic approaches",
+    "Tech Startup Founder": "leads innovative technology initiatives, combining entrepreneurial vision with practical business strategy and technical expertise"
+}
+
+# Fallback response templates based on occupation
+_FALLBACK_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "Senior Data Scientist": (
+        "From a data-driven perspective, {prompt}",
+        "Looking at this analytically, {prompt}",
+        "The data suggests that {prompt}"
+    ),
+    "Sustainable Architecture Specialist": (
+        "From a sustainable design standpoint, {prompt}",
+        "Considering environmental impact, {prompt}",
+        "In architectural terms, {prompt}"
+    )
+}
+
+_DEFAULT_FALLBACK_TEMPLATES: Tuple[str, ...] = (
+    "Based on my experience as a {occupation}, {prompt}",
+    "From my perspective in {occupation}, {prompt}",
+    "As someone working in {occupation}, {prompt}"
+)
+
+# Action types and markers that carry what a character said or thought, by priority
+_SPEECH_TYPES = frozenset({'SPEAK', 'TALK', 'SAY'})
+_MARKER_PRIORITIES = {'TALK': 3, 'SAY': 3, 'THINK': 2}
+# A marker and its content, which runs up to the next marker
+_ACTION_MARKER_RE = re.compile(r'\[(TALK|SAY|THINK)\](.*?)(?=\[(?:TALK|SAY|THINK)\]|\Z)', re.DOTALL)
+_FALLBACK_CONTENT_KEYS = ('response', 'message', 'output', 'result')
+
+def _score_action(action: Any) -> Tuple[int, Optional[str]]:
+    """
+    Score an action by how well it represents a character's response: speech (3),
+    thought (2) or any other text (1). Returns the score and the extracted content.
+    """
+    if isinstance(action, str):
+        # Handle string actions (TinyTroupe format)
+        # Of several markers, the first one with the highest priority wins
+        best_score, best_content = 0, None
+        for match in _ACTION_MARKER_RE.finditer(action):
+            score = _MARKER_PRIORITIES[match.group(1)]
+            if score > best_score:
+                content = match.group(2).strip().lstrip('> ')
+                if content:
+                    best_score, best_content = score, content
+        if best_content:
+            return best_score, best_content
+
+        # Remove any action markers and check if there's content
+        cleaned = action.split(']')[-1].strip().lstrip('> ')
+        if cleaned:
+            return 1, cleaned
+
+    elif isinstance(action, dict):
+        # Handle dictionary actions, unwrapping those returned by TinyPerson.act
+        # (e.g. {'action': {'type': 'TALK', ...}, 'cognitive_state': {...}})
+        if isinstance(action.get('action'), dict):
+            action = action['action']
+
+        action_type = action.get('type')
+        if action_type in _SPEECH_TYPES or action_type == 'THINK':
+            if action.get('content'):
+                content = action['content']
+            elif action.get('text'):
+                content = action['text']
+            elif action.get('lines'):
+                content = '\n'.join(action['lines'])
+            else:
+                content = None
+
+            if content:
+                return (3 if action_type in _SPEECH_TYPES else 2), content
+
+        # Try to find any content in the dictionary
+        for key in _FALLBACK_CONTENT_KEYS:
+            if action.get(key):
+                return 1, str(action[key])
+
+    return 0, None
+
+def _sentiment_label(positive_count: int, negative_count: int) -> str:
+    """The sentiment of a text, given how many positive and negative keywords it contains."""
+    if positive_count > negative_count:
+        return 'positive'
+    elif negative_count > positive_count:
+        return 'negative'
+    return 'neutral'
+
+def _escape_braces(text: str) -> str:
+    """Escape a text so that it is kept as is in a str.format template."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+def _new_unique_id() -> str:
+    """Unique suffix for the names of the TinyPersons backing characters."""
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+@dataclass(slots=True)
 class Character:
     """Represents a character in the discussion."""
     name: str
@@ -42,15 +165,63 @@ class Character:
     nationality: str
     interests: List[str]
     personality: List[str]
-    tiny_person: TinyPerson = None
-    _unique_id: str = field(default_factory=lambda: datetime.now().strftime("%Y%m%d_%H%M%S_%f"))
+    _unique_id: str = field(default_factory=_new_unique_id)
+    _tiny: Optional[TinyPerson] = field(default=None, init=False, repr=False, compare=False)
+
+    # Derived data, computed in __post_init__ or on first access
+    _personal_interests: List[str] = field(default=None, init=False, repr=False, compare=False)
+    _professional_interests: List[str] = field(default=None, init=False, repr=False, compare=False)
+    _interests_csv: str = field(default=None, init=False, repr=False, compare=False)
+    _personality_csv: str = field(default=None, init=False, repr=False, compare=False)
+    _goal_template: str = field(default=None, init=False, repr=False, compare=False)
+    _thought_template: str = field(default=None, init=False, repr=False, compare=False)
+    _context_template: str = field(default=None, init=False, repr=False, compare=False)
+    _background_description: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _occupation_description: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _communication_style: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        """Initialize the TinyPerson instance with character traits."""
-        if not self.tiny_person:
+        """Precompute the character data used when building prompts."""
+        # Precompute the interest partition and joined strings used when building prompts
+        self._personal_interests = [interest for interest in self.interests if interest.lower() in _PERSONAL_INTERESTS]
+        self._professional_interests = [interest for interest in self.interests if interest.lower() not in _PERSONAL_INTERESTS]
+        self._interests_csv = ', '.join(self.interests)
+        self._personality_csv = ', '.join(self.personality)
+
+        # Prompt templates specialized for this character, only the discussion-specific parts are left to fill in
+        occupation = _escape_braces(self.occupation)
+        interests_csv = _escape_braces(self._interests_csv)
+        self._goal_template = (
+            "Respond thoughtfully to the discussion about {topic} "
+            f"by sharing insights based on my expertise as a {occupation} "
+            "and engaging meaningfully with the conversation."
+        )
+        self._thought_template = (
+            f"As a {occupation}, I should provide a thoughtful response about {{topic}} "
+            f"based on my expertise in {interests_csv}."
+        )
+        self._context_template = f"""As {_escape_braces(self.name)}, a {occupation} with expertise in {interests_csv}, 
+you are participating in a discussion about {{topic}}.
+
+Your personality traits are: {_escape_braces(self._personality_csv)}
+Your background: {_escape_braces(self.background_description)}
+
+Current discussion context:
+{{prompt}}
+
+Recent messages:
+"""
+
+    @property
+    def tiny_person(self) -> TinyPerson:
+        """
+        The TinyPerson backing this character. It is only created, with the character traits
+        configured, when first accessed, so characters that never take part in a discussion stay cheap.
+        """
+        if self._tiny is None:
             # Create TinyPerson instance with mental faculties
             unique_name = f"{self.name.replace(' ', '_')}_{self._unique_id}"
-            self.tiny_person = TinyPerson(
+            self._tiny = TinyPerson(
                 name=unique_name,
                 mental_faculties=[
                     RecallFaculty(),
@@ -64,12 +235,27 @@ class Character:
             self._configure_character_traits()
             
             # Initialize the prompt
-            self.tiny_person.reset_prompt()
+            self._tiny.reset_prompt()
+
+        return self._tiny
+
+    @tiny_person.setter
+    def tiny_person(self, tiny_person: Optional[TinyPerson]):
+        """Use a given TinyPerson for this character, or None to have a new one created on next access."""
+        self._tiny = tiny_person
+
+    def reset_state(self):
+        """
+        Clear the discussion-specific state (goals, context and accessible agents) of the
+        character's TinyPerson, keeping its faculties and memories, so it can be reused in a new discussion.
+        """
+        self.tiny_person.make_all_agents_inaccessible()
+        self.tiny_person._update_cognitive_state(goals=[], context=_INITIAL_CONTEXT)
 
     def _configure_character_traits(self):
         """Configure the character's traits and background in TinyPerson."""
         # Create a rich background description
-        background = self._generate_background_description()
+        background = self.background_description
         
         # Update TinyPerson configuration
         self.tiny_person._configuration.update({
@@ -77,13 +263,13 @@ class Character:
             "age": self.age,
             "nationality": self.nationality,
             "occupation": self.occupation,
-            "occupation_description": self._generate_occupation_description(),
+            "occupation_description": self.occupation_description,
             "personality_traits": self.personality,
-            "professional_interests": [int for int in self.interests if not int.lower() in ['music', 'sports', 'arts', 'photography', 'rock climbing', 'martial arts']],
-            "personal_interests": [int for int in self.interests if int.lower() in ['music', 'sports', 'arts', 'photography', 'rock climbing', 'martial arts']],
+            "professional_interests": self._professional_interests,
+            "personal_interests": self._personal_interests,
             "background": background,
-            "communication_style": self._derive_communication_style(),
-            "current_context": "Ready to engage in meaningful discussion"
+            "communication_style": self.communication_style,
+            "current_context": _INITIAL_CONTEXT
         })
 
         # Store character information in semantic memory
@@ -97,43 +283,70 @@ class Character:
             }
         })
 
-    def _generate_background_description(self) -> str:
-        """Generate a detailed background description for the character."""
-        return f"{self.name} is a {self.age}-year-old {self.nationality} {self.occupation}. " \
-               f"They are known for being {', '.join(self.personality[:-1])} and {self.personality[-1]}. " \
-               f"Their expertise spans across {', '.join(self.interests[:-1])} and {self.interests[-1]}."
-
-    def _generate_occupation_description(self) -> str:
-        """Generate a detailed description of the character's occupation."""
-        occupation_descriptions = {
-            "Senior Data Scientist": "specializes in advanced machine learning and data analytics, focusing on ethical AI development and practical applications of statistical analysis",
-            "Sustainable Architecture Specialist": "focuses on designing environmentally conscious buildings and urban spaces, integrating renewable materials and sustainable practices",
-            "Clinical Psychologist": "helps individuals and groups navigate complex emotional and behavioral challenges using evidence-based therapeutic approaches",
-            "Tech Startup Founder": "leads innovative technology initiatives, combining entrepreneurial vision with practical business strategy and technical expertise"
-        }
-        return occupation_descriptions.get(self.occupation, f"works as a {self.occupation}, bringing expertise and innovation to their field")
-
-    def _derive_communication_style(self) -> dict:
-        """Derive the character's communication style based on their personality traits."""
-        style = {
-            "formality_level": "formal" if "professional" in self.personality else "casual",
-            "detail_orientation": "high" if "detail-oriented" in self.personality else "moderate",
-            "emotional_expression": "high" if any(trait in self.personality for trait in ["empathetic", "energetic"]) else "moderate",
-            "technical_language": "high" if self.occupation in ["Senior Data Scientist", "Sustainable Architecture Specialist"] else "moderate"
-        }
-        return style
+    @property
+    def background_description(self) -> str:
+        """Detailed background description for the character, computed once per character."""
+        if self._background_description is None:
+            self._background_description = f"{self.name} is a {self.age}-year-old {self.nationality} {self.occupation}. " \
+                f"They are known for being {', '.join(self.personality[:-1])} and {self.personality[-1]}. " \
+                f"Their expertise spans across {', '.join(self.interests[:-1])} and {self.interests[-1]}."
+        return self._background_description
+
+    @property
+    def occupation_description(self) -> str:
+        """Detailed description of the character's occupation, computed once per character."""
+        if self._occupation_description is None:
+            self._occupation_description = _OCCUPATION_DESCRIPTIONS.get(
+                self.occupation, f"works as a {self.occupation}, bringing expertise and innovation to their field"
+            )
+        return self._occupation_description
+
+    @property
+    def communication_style(self) -> dict:
+        """The character's communication style derived from their personality traits, computed once per character."""
+        if self._communication_style is None:
+            self._communication_style = {
+                "formality_level": "formal" if "professional" in self.personality else "casual",
+                "detail_orientation": "high" if "detail-oriented" in self.personality else "moderate",
+                "emotional_expression": "high" if any(trait in self.personality for trait in ["empathetic", "energetic"]) else "moderate",
+                "technical_language": "high" if self.occupation in ["Senior Data Scientist", "Sustainable Architecture Specialist"] else "moderate"
+            }
+        return self._communication_style
 
 class CharacterGroup:
     """Manages a group of characters participating in a discussion."""
     
-    def __init__(self, characters: List[Character]):
-        """Initialize the character group."""
+    def __init__(self, characters: List[Character], use_response_cache: bool = False,
+                 cache_dir: Optional[str] = None, results_dir: Optional[str] = None):
+        """
+        Initialize the character group.
+
+        Args:
+            characters: Characters participating in the discussion
+            use_response_cache: Whether to reuse character responses for identical or very similar contexts.
+                A reused response is not heard by the character, and needs sentence-transformers for the embeddings.
+            cache_dir: Optional directory where response caches are persisted, one per discussion
+            results_dir: Optional directory where the insights are logged (as JSONL) instead of being kept in memory
+        """
         self.characters = characters
+        self.use_response_cache = use_response_cache
+        self.cache_dir = cache_dir
+        self._response_caches: Dict[str, SemanticCache] = {}
+        # Responses are generated concurrently, so the caches are created under a lock
+        self._response_caches_lock = threading.Lock()
+        # The formatted recent messages of the last discussion turn, shared by all characters
+        self._recent_block_cache: Optional[Tuple[int, int, str]] = None
         self.discussion_results = {
             'insights': [],
             'key_points': [],
             'sentiment_analysis': []
         }
+
+        # Aggregates of the discussion results, kept up to date as responses come in
+        self._participation_counts = Counter()
+        self._last_contributions: Dict[str, str] = {}
+        # Seeded in this order, so that ties are resolved in favour of the first sentiment
+        self._sentiment_counts = Counter({'positive': 0, 'negative': 0, 'neutral': 0})
         
         # Clear all existing environments
         TinyWorld.clear_environments()
@@ -143,15 +356,27 @@ class CharacterGroup:
         
         # Create the world with the unique name
         self.world = TinyWorld(env_name)
+
+        # With a results directory, the insights are streamed to an append-only log
+        self._insights_log_file = None
+        self._insights_log = None
+        if results_dir:
+            os.makedirs(results_dir, exist_ok=True)
+            self._insights_log_file = os.path.join(results_dir, f"{env_name}.insights.jsonl")
+            self._insights_log = open(self._insights_log_file, 'a', buffering=65536, encoding='utf-8')
         
         # Add all characters to the environment
         for char in self.characters:
+            # Characters from a previous group keep their fully configured agent, only its state is reset
+            if char._tiny is not None:
+                char.reset_state()
+
             try:
                 self.world.add_agent(char.tiny_person)
             except ValueError as e:
                 # If agent already exists, recreate it with a new unique name
+                char._unique_id = _new_unique_id()
                 char.tiny_person = None
-                char.__post_init__()
                 self.world.add_agent(char.tiny_person)
                 
         self.world.make_everyone_accessible()
@@ -188,184 +413,157 @@ Focus on how your unique background and expertise can contribute to the discussi
                 f"Share expertise as a {char.occupation}",
                 "Respond thoughtfully to others' perspectives"
             ])
-            
-            # Generate character's initial response
-            response = self._generate_character_response(char, initial_prompt, discussion)
-            
+
+        # The initial responses only depend on the shared starting context, so the (IO-bound)
+        # LLM calls are made concurrently (unless that is unsafe, see agent_concurrency); results
+        # are then added in the characters' order
+        recent_block = self._get_recent_block(discussion)
+        responses = [None] * len(self.characters)
+        max_workers = agent_concurrency(min(len(self.characters), MAX_CONCURRENT_RESPONSES))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._generate_character_response, char, initial_prompt, discussion, recent_block): i
+                for i, char in enumerate(self.characters)
+            }
+            for future in as_completed(futures):
+                responses[futures[future]] = future.result()
+
+        for char, (response, timestamp) in zip(self.characters, responses):
             if response:
                 discussion.chat_interface.add_message(
                     sender=char.name,
                     content=response,
                     msg_type=MessageType.TEXT
                 )
-                self._update_discussion_results(char, response)
+                self._update_discussion_results(char, response, timestamp)
+
+        # The responses cached in this round are persisted once, rather than on every response
+        if self.use_response_cache:
+            self._get_response_cache(discussion).save()
 
         return discussion
 
-    def _generate_character_response(self, character: Character, prompt: str, discussion: GroupDiscussion) -> str:
-        """Generate a response from a character based on their expertise and personality."""
+    def _generate_character_response(self, character: Character, prompt: str, discussion: GroupDiscussion,
+                                     recent_block: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Generate a response from a character based on their expertise and personality. Returns the
+        response and its timestamp, which the caller uses for the other records of the response.
+        """
         # Create a detailed context for the character
-        context = self._create_response_context(character, prompt, discussion)
+        context = self._create_response_context(character, prompt, discussion, recent_block)
         
         # Have the character process the context
         character.tiny_person.change_context([context])
         
         # Create a specific goal for the character to respond
-        goal_str = (
-            f"Respond thoughtfully to the discussion about {discussion.discussion_name} "
-            f"by sharing insights based on my expertise as a {character.occupation} "
-            "and engaging meaningfully with the conversation."
-        )
+        goal_str = character._goal_template.format(topic=discussion.discussion_name)
         character.tiny_person.internalize_goal(goal_str)
 
         # Add a thought to help guide the response
-        thought = (
-            f"As a {character.occupation}, I should provide a thoughtful response about {discussion.discussion_name} "
-            f"based on my expertise in {', '.join(character.interests)}."
-        )
+        thought = character._thought_template.format(topic=discussion.discussion_name)
         character.tiny_person.think(thought)
         
-        # Generate the response action
-        actions = character.tiny_person.listen_and_act(prompt, return_actions=True)
+        # Generate the response action, reusing a cached one for identical or very similar contexts
+        if self.use_response_cache:
+            actions = self._get_response_cache(discussion).get_or_compute(
+                character.name,
+                context,
+                lambda: character.tiny_person.listen_and_act(prompt, return_actions=True)
+            )
+        else:
+            actions = character.tiny_person.listen_and_act(prompt, return_actions=True)
         
-        # Extract response from actions, prioritizing TALK actions
-        response = None
+        # Extract response from actions, prioritizing speech actions
+        response = timestamp = None
         if actions:
-            # First try to find direct TALK actions
-            for action in actions:
-                if isinstance(action, dict) and 'action' in action:
-                    action_data = action['action']
-                    if action_data.get('type') == 'TALK' and action_data.get('content'):
-                        response = action_data['content']
-                        break
-            
-            # If no TALK action found, try other action types
-            if not response:
-                response = self._extract_response_from_actions(actions)
+            response = self._extract_response_from_actions(actions)
             
-            # If still no response, use fallback
+            # If no response, use fallback
             if not response:
                 response = self._generate_fallback_response(character, prompt)
             
-            # Store the response in character's memory
+            # Store the response in character's memory, with the timestamp shared by all its records
             if response:
-                character.tiny_person.episodic_memory.store({
-                    'role': 'assistant',
-                    'name': character.name,
-                    'content': response,
-                    'timestamp': datetime.now().isoformat(),
-                    'context': context,
-                    'discussion_topic': discussion.discussion_name
-                })
-        
-        return response
-
-    def _create_response_context(self, character: Character, prompt: str, discussion: GroupDiscussion) -> str:
-        """Create a detailed context for character response generation."""
-        recent_messages = discussion.chat_interface.messages[-5:] if discussion.chat_interface.messages else []
+                timestamp = datetime.now().isoformat()
+                self._store_contribution(character, response, timestamp, context, discussion)
         
-        context = f"""As {character.name}, a {character.occupation} with expertise in {', '.join(character.interests)}, 
-you are participating in a discussion about {discussion.discussion_name}.
+        return response, timestamp
 
-Your personality traits are: {', '.join(character.personality)}
-Your background: {character._generate_background_description()}
-
-Current discussion context:
-{prompt}
+    def _store_contribution(self, character: Character, response: str, timestamp: str, context: str,
+                            discussion: GroupDiscussion):
+        """Store a response in the character's memory, together with its context and metadata."""
+        character.tiny_person.episodic_memory.store({
+            'role': 'assistant',
+            'name': character.name,
+            'content': response,
+            'timestamp': timestamp,
+            'type': 'discussion_contribution',
+            'context': context,
+            'discussion_topic': discussion.discussion_name,
+            'metadata': {
+                'occupation': character.occupation,
+                'interests': character.interests,
+                'personality': character.personality
+            }
+        })
 
-Recent messages:
-"""
-        for msg in recent_messages:
-            context += f"{msg.sender}: {msg.content}\n"
-            
-        return context
+    def _get_response_cache(self, discussion: GroupDiscussion) -> SemanticCache:
+        """Get the response cache of a discussion, persisted under cache_dir when one is configured."""
+        with self._response_caches_lock:
+            cache = self._response_caches.get(discussion.discussion_name)
+            if cache is None:
+                cache_file = None
+                if self.cache_dir:
+                    safe_name = re.sub(r'\W+', '_', discussion.discussion_name)
+                    cache_file = os.path.join(self.cache_dir, f"{safe_name}.responses.pkl")
+                cache = SemanticCache(cache_file=cache_file)
+                self._response_caches[discussion.discussion_name] = cache
+            return cache
+
+    def _get_recent_block(self, discussion: GroupDiscussion) -> str:
+        """
+        Get the recent messages of a discussion formatted for the prompts, one per line. The block is
+        the same for all characters in a turn, so it is only rebuilt once a new message was added.
+        """
+        messages = discussion.chat_interface.messages
+        key = (id(discussion), len(messages))
+        if self._recent_block_cache is None or self._recent_block_cache[:2] != key:
+            recent_block = "".join(f"{msg.sender}: {msg.content}\n" for msg in messages[-5:])
+            self._recent_block_cache = (*key, recent_block)
+        return self._recent_block_cache[2]
+
+    def _create_response_context(self, character: Character, prompt: str, discussion: GroupDiscussion,
+                                 recent_block: Optional[str] = None) -> str:
+        """
+        Create a detailed context for character response generation.
+
+        Args:
+            character: The character who is going to respond
+            prompt: The current discussion context
+            discussion: The discussion
+            recent_block: The formatted recent messages, if already computed for this turn
+        """
+        if recent_block is None:
+            recent_block = self._get_recent_block(discussion)
+        
+        context = character._context_template.format(topic=discussion.discussion_name, prompt=prompt)
+        return context + recent_block
 
     def _extract_response_from_actions(self, actions: list) -> str:
-        """Extract response from character actions."""
+        """
+        Extract response from character actions, preferring speech over thoughts over any
+        other text. Among actions of the same priority, the first one wins.
+        """
         if not actions:
             return None
 
-        # First try to find direct speech actions    
-        for action in actions:
-            if isinstance(action, str):
-                # Handle string actions (TinyTroupe format)
-                if '[TALK]' in action:
-                    parts = action.split('[TALK]')
-                    if len(parts) > 1:
-                        response = parts[1].strip().lstrip('> ')
-                        if response:
-                            return response
-                elif '[SAY]' in action:
-                    parts = action.split('[SAY]')
-                    if len(parts) > 1:
-                        response = parts[1].strip().lstrip('> ')
-                        if response:
-                            return response
-            elif isinstance(action, dict):
-                # Handle dictionary actions
-                if action.get('type') in ['SPEAK', 'TALK', 'SAY']:
-                    if 'content' in action and action['content']:
-                        return action['content']
-                    elif 'text' in action and action['text']:
-                        return action['text']
-                    elif 'lines' in action and action['lines']:
-                        return '\n'.join(action['lines'])
-
-        # If no direct speech found, try thought actions
-        for action in actions:
-            if isinstance(action, str):
-                if '[THINK]' in action:
-                    parts = action.split('[THINK]')
-                    if len(parts) > 1:
-                        response = parts[1].strip().lstrip('> ')
-                        if response:
-                            return response
-            elif isinstance(action, dict):
-                if action.get('type') == 'THINK':
-                    if 'content' in action and action['content']:
-                        return action['content']
-                    elif 'text' in action and action['text']:
-                        return action['text']
-                    elif 'lines' in action and action['lines']:
-                        return '\n'.join(action['lines'])
-
-        # If no speech or thought actions found, try to extract any meaningful text
-        for action in actions:
-            if isinstance(action, str):
-                # Remove any action markers and check if there's content
-                cleaned = action.split(']')[-1].strip().lstrip('> ')
-                if cleaned:
-                    return cleaned
-            elif isinstance(action, dict):
-                # Try to find any content in the dictionary
-                for key in ['response', 'message', 'output', 'result']:
-                    if key in action and action[key]:
-                        return str(action[key])
-
-        return None
+        score, content = max(map(_score_action, actions), key=lambda scored: scored[0])
+        return content if score > 0 else None
 
     def _generate_fallback_response(self, character: Character, prompt: str) -> str:
         """Generate a fallback response based on character traits when normal response generation fails."""
-        # Create response templates based on occupation
-        occupation_templates = {
-            "Senior Data Scientist": [
-                "From a data-driven perspective, {prompt}",
-                "Looking at this analytically, {prompt}",
-                "The data suggests that {prompt}"
-            ],
-            "Sustainable Architecture Specialist": [
-                "From a sustainable design standpoint, {prompt}",
-                "Considering environmental impact, {prompt}",
-                "In architectural terms, {prompt}"
-            ]
-        }
-        
         # Select template based on character's occupation
-        templates = occupation_templates.get(character.occupation, [
-            "Based on my experience as a {occupation}, {prompt}",
-            "From my perspective in {occupation}, {prompt}",
-            "As someone working in {occupation}, {prompt}"
-        ])
+        templates = _FALLBACK_TEMPLATES.get(character.occupation, _DEFAULT_FALLBACK_TEMPLATES)
         
         # Generate response using template
         template = random.choice(templates)
@@ -379,18 +577,16 @@ Recent messages:
     def get_character_response(self, character: Character, discussion: GroupDiscussion) -> str:
         """Get a response from a character based on the discussion context."""
         # Get the recent discussion history
-        recent_messages = discussion.chat_interface.messages[-5:] if len(discussion.chat_interface.messages) > 0 else []
+        recent_block = self._get_recent_block(discussion)
         
         # Format the discussion context
         discussion_context = f"""
 Topic: {discussion.discussion_name}
 Current Discussion:
-"""
-        for msg in recent_messages:
-            discussion_context += f"{msg.sender}: {msg.content}\n"
+""" + recent_block
         
         # Create detailed context for response generation
-        context = self._create_response_context(character, discussion_context, discussion)
+        context = self._create_response_context(character, discussion_context, discussion, recent_block)
         
         # Have the character process the context
         character.tiny_person.change_context([context])
@@ -404,36 +600,29 @@ Current Discussion:
             response = self._generate_fallback_response(character, discussion_context)
         
         if response:
+            # A single timestamp is shared by all the records of this response
+            timestamp = datetime.now().isoformat()
+
             # Store the response in character's memory
-            character.tiny_person.episodic_memory.store({
-                'role': 'assistant',
-                'name': character.name,
-                'content': response,
-                'timestamp': datetime.now().isoformat(),
-                'context': context,
-                'discussion_topic': discussion.discussion_name
-            })
+            self._store_contribution(character, response, timestamp, context, discussion)
             
             # Update discussion results
-            self._update_discussion_results(character, response)
+            self._update_discussion_results(character, response, timestamp)
         
         return response
     
-    def _update_discussion_results(self, character: Character, response: str):
-        """Update discussion results with new insights and analysis."""
-        # Store the response in character's memory with additional metadata
-        character.tiny_person.episodic_memory.store({
-            'role': 'assistant',
-            'name': character.name,
-            'content': response,
-            'timestamp': datetime.now().isoformat(),
-            'type': 'discussion_contribution',
-            'metadata': {
-                'occupation': character.occupation,
-                'interests': character.interests,
-                'personality': character.personality
-            }
-        })
+    def _update_discussion_results(self, character: Character, response: str, timestamp: Optional[str] = None):
+        """
+        Update discussion results with new insights and analysis. The response itself is
+        stored in the character's memory by the caller, together with its context.
+
+        Args:
+            character: The character who gave the response
+            response: The response content
+            timestamp: Timestamp of the response, shared by all its records. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
 
         # Extract insights and key points
         if len(response) > 0:
@@ -441,40 +630,88 @@ Current Discussion:
             insight = {
                 'character': character.name,
                 'content': response,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timestamp,
                 'expertise': character.occupation,
                 'traits': character.personality
             }
-            self.discussion_results['insights'].append(insight)
             
             # Perform basic sentiment analysis
             sentiment = self._analyze_sentiment(response)
-            self.discussion_results['sentiment_analysis'].append({
+            sentiment_entry = {
                 'character': character.name,
                 'sentiment': sentiment,
-                'timestamp': datetime.now().isoformat()
-            })
+                'timestamp': timestamp
+            }
+
+            self._participation_counts[character.name] += 1
+            self._last_contributions[character.name] = timestamp
+            self._sentiment_counts[sentiment] += 1
+
+            if self._insights_log is not None:
+                self._insights_log.write(json.dumps({'insight': insight, 'sentiment_analysis': sentiment_entry}) + '\n')
+            else:
+                self.discussion_results['insights'].append(insight)
+                self.discussion_results['sentiment_analysis'].append(sentiment_entry)
+
+    def _iter_results(self):
+        """Iterate over the (insight, sentiment analysis) pairs of the discussion, in order."""
+        if self._insights_log_file is None:
+            yield from zip(self.discussion_results['insights'], self.discussion_results['sentiment_analysis'])
+            return
+
+        if self._insights_log is not None:
+            self._insights_log.flush()
+        with open(self._insights_log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                yield record['insight'], record['sentiment_analysis']
+
+    def close(self):
+        """Close the insights log, if any. The results logged so far can still be summarized."""
+        if self._insights_log is not None:
+            self._insights_log.close()
+            self._insights_log = None
             
     def _analyze_sentiment(self, text: str) -> str:
         """Simple sentiment analysis based on keyword presence."""
-        positive_words = {'great', 'good', 'excellent', 'agree', 'positive', 'interesting', 'helpful', 'valuable', 'excited'}
-        negative_words = {'bad', 'disagree', 'negative', 'wrong', 'difficult', 'concerned', 'worried', 'problematic'}
+        # Each match is either a positive or a negative keyword, telling which one is enough
+        positive_count = 0
+        negative_count = 0
+        for match in _SENTIMENT_WORDS_RE.finditer(text):
+            if match.lastgroup == 'positive':
+                positive_count += 1
+            else:
+                negative_count += 1
         
-        words = set(text.lower().split())
-        positive_count = len(words.intersection(positive_words))
-        negative_count = len(words.intersection(negative_words))
-        
-        if positive_count > negative_count:
-            return 'positive'
-        elif negative_count > positive_count:
-            return 'negative'
-        return 'neutral'
+        return _sentiment_label(positive_count, negative_count)
+
+    def batch_analyze_sentiment(self, messages: List[str]) -> List[str]:
+        """
+        Sentiment analysis of many messages at once, e.g. to rerun it over a whole discussion
+        transcript. All the messages are scanned in a single pass of the keyword matcher.
+        """
+        # Offsets where each message starts in the joined transcript. The separator is not
+        # a word character, so keywords never span two messages.
+        starts = list(accumulate((len(message) + 1 for message in messages[:-1]), initial=0))
+        counts = [[0, 0] for _ in messages]
+        for match in _SENTIMENT_WORDS_RE.finditer('\n'.join(messages)):
+            counts[bisect_right(starts, match.start()) - 1][match.lastgroup == 'negative'] += 1
+
+        return [_sentiment_label(positive_count, negative_count) for positive_count, negative_count in counts]
     
     def get_discussion_summary(self) -> dict:
         """Get a summary of the discussion results with enhanced analytics."""
+        if self._insights_log_file is None:
+            insights = self.discussion_results['insights']
+            sentiment_analysis = self.discussion_results['sentiment_analysis']
+        else:
+            results = list(self._iter_results())
+            insights = [insight for insight, _ in results]
+            sentiment_analysis = [entry for _, entry in results]
+
         summary = {
-            'insights': self.discussion_results['insights'],
-            'sentiment_analysis': self.discussion_results['sentiment_analysis'],
+            'insights': insights,
+            'sentiment_analysis': sentiment_analysis,
             'participation': self._analyze_participation(),
             'interaction_patterns': self._analyze_interaction_patterns(),
             'timestamp': datetime.now().isoformat()
@@ -485,12 +722,10 @@ Current Discussion:
         """Analyze participation patterns in the discussion."""
         participation = {}
         for char in self.characters:
-            char_messages = [msg for msg in self.discussion_results['insights'] 
-                           if msg['character'] == char.name]
             participation[char.name] = {
-                'message_count': len(char_messages),
+                'message_count': self._participation_counts[char.name],
                 'expertise_utilized': char.occupation,
-                'last_contribution': char_messages[-1]['timestamp'] if char_messages else None
+                'last_contribution': self._last_contributions.get(char.name)
             }
         return participation
 
@@ -504,29 +739,26 @@ Current Discussion:
 
     def _get_sentiment_trends(self) -> dict:
         """Analyze sentiment trends over time."""
-        sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-        for analysis in self.discussion_results['sentiment_analysis']:
-            sentiment_counts[analysis['sentiment']] += 1
+        sentiment_counts = self._sentiment_counts
         
         return {
-            'overall_sentiment': max(sentiment_counts.items(), key=lambda x: x[1])[0],
-            'sentiment_distribution': sentiment_counts
+            'overall_sentiment': sentiment_counts.most_common(1)[0][0] if sentiment_counts.total() else 'neutral',
+            'sentiment_distribution': dict(sentiment_counts)
         }
 
     def _get_discussion_flow(self) -> list:
         """Analyze the flow of discussion between characters."""
         flow = []
-        insights = sorted(self.discussion_results['insights'], 
-                        key=lambda x: x['timestamp'])
-        
-        for i in range(len(insights) - 1):
-            current = insights[i]
-            next_insight = insights[i + 1]
-            flow.append({
-                'from': current['character'],
-                'to': next_insight['character'],
-                'timestamp': next_insight['timestamp']
-            })
+        # Insights are recorded as they happen, so they are already in chronological order
+        current = None
+        for next_insight, _ in self._iter_results():
+            if current is not None:
+                flow.append({
+                    'from': current['character'],
+                    'to': next_insight['character'],
+                    'timestamp': next_insight['timestamp']
+                })
+            current = next_insight
         
         return flow
 
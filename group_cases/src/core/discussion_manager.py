@@ -1,31 +1,96 @@
 """
 Discussion manager module for handling discussion flow and agent interactions.
 """
-from typing import Dict, List, Any, Optional
-import json
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+import asyncio
+import logging
+import os
+import sys
+import textwrap
+import types
+import orjson
 from tinytroupe.agent import TinyPerson as Agent
 from tinytroupe.environment import TinyWorld
 from .agent_group import AgentGroup
 from .prompt import Prompt
 from ..utils.result_processor import format_results
-from .base_discussion import BaseDiscussion, DiscussionType
+from ..utils.response_cache import ResponseCache
+from ..utils.concurrency import agent_concurrency
+from .base_discussion import BaseDiscussion
+
+logger = logging.getLogger(__name__)
+
+# Personality trait scores of well-known roles, and of any other role
+_BASE_TRAITS = types.MappingProxyType({
+    "Moderator": types.MappingProxyType({"assertiveness": 0.8, "empathy": 0.9}),
+    "Facilitator": types.MappingProxyType({"assertiveness": 0.7, "empathy": 0.9}),
+    "Interviewer": types.MappingProxyType({"assertiveness": 0.7, "curiosity": 0.9}),
+    "Critic": types.MappingProxyType({"assertiveness": 0.9, "skepticism": 0.8}),
+    "Devil's Advocate": types.MappingProxyType({"assertiveness": 0.9, "skepticism": 0.9}),
+})
+_DEFAULT_TRAITS = types.MappingProxyType({"adaptability": 0.7, "engagement": 0.8})
+
+def _dumps(obj: Any) -> str:
+    """Serialize an object as JSON indented by 2 spaces, like json.dumps(obj, indent=2)."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
 
 class DiscussionManager:
     """Manages the flow of discussions and agent interactions."""
+
+    __slots__ = (
+        "discussion", "use_prompt_cache", "agents", "_agents_by_name", "agent_group", "discussion_history", "_world",
+        "_static_context_json", "_static_prefix", "_result_json_cache", "_response_cache",
+        "max_concurrency", "_loop", "_semaphore", "_agent_locks"
+    )
     
-    def __init__(self, discussion: BaseDiscussion):
+    def __init__(self, discussion: BaseDiscussion, use_prompt_cache: bool = False,
+                 use_cache: bool = False, cache_ttl: Optional[float] = None,
+                 cache_file: str = os.path.join(".tinytroupe_cache", "responses.pkl")):
         """
         Initialize discussion manager.
         
         Args:
             discussion: BaseDiscussion instance to manage
+            use_prompt_cache: Whether step prompts start with the static coordination prompt, so that
+                LLM providers can cache that prefix across steps and agents. The agents are sent plain
+                text, so this only pays off with providers that cache prompt prefixes automatically.
+            use_cache: Whether to reuse the responses of agents that were already given the same prompt
+                in the same phase, e.g. when rerunning scenarios, instead of having them act again
+            cache_ttl: Optional time to live of the cached responses, in seconds
+            cache_file: Where the cached responses are persisted
         """
         self.discussion = discussion
+        self.use_prompt_cache = use_prompt_cache
         self.agents: List[Agent] = []
+        self._agents_by_name: Dict[str, Agent] = {}
         self.agent_group: Optional[AgentGroup] = None
         self.discussion_history = []
-        self.world = TinyWorld(name=discussion.name)
+        self._world: Optional[TinyWorld] = None
+
+        # The discussion context doesn't change while it runs, so the static prompt parts are built once
+        self._static_context_json = _dumps(self.discussion.context)
+        self._static_prefix = self._get_coordination_prompt()
+
+        # Serializations of the results of previous steps, which are not modified once produced
+        self._result_json_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
+
+        self._response_cache = ResponseCache(cache_file=cache_file, ttl=cache_ttl) if use_cache else None
+
+        # Maximum number of concurrent LLM calls, to respect rate limits
+        self.max_concurrency = int(os.getenv("LLM_CONCURRENCY", "8"))
+
+        # Asyncio primitives are bound to an event loop, so they are recreated for each loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._agent_locks: Dict[str, asyncio.Lock] = {}
         
+    @property
+    def world(self) -> TinyWorld:
+        """The world of the discussion's agents, only created once it is needed."""
+        if self._world is None:
+            self._world = TinyWorld(name=self.discussion.name, agents=self.agents)
+        return self._world
+
     def setup_agents(self, roles: List[Dict[str, str]]) -> None:
         """
         Setup agents for the discussion using TinyTroupe.
@@ -33,6 +98,7 @@ class DiscussionManager:
         Args:
             roles: List of role definitions for agents
         """
+        new_agents = []
         for role in roles:
             # Create TinyTroupe agent with role and personality
             config = self._generate_personality(role)
@@ -41,9 +107,14 @@ class DiscussionManager:
             # Configure agent
             agent.define("traits", config["traits"])
             agent.define("role", config["role"])
+            agent.define("trait_scores", dict(_BASE_TRAITS.get(config["name"], _DEFAULT_TRAITS)))
             
-            self.agents.append(agent)
-            self.world.add_agent(agent)
+            new_agents.append(agent)
+
+        self.agents.extend(new_agents)
+        self._agents_by_name.update((agent.name, agent) for agent in new_agents)
+        if self._world is not None:
+            self._world.add_agents(new_agents)
             
         # Create agent group for collaboration
         self.agent_group = AgentGroup(
@@ -51,6 +122,18 @@ class DiscussionManager:
             agents=self.agents
         )
         
+    def get_agent(self, name: str) -> Optional[Agent]:
+        """
+        Get the agent playing a role, e.g. to target a role-specific request at it.
+        
+        Args:
+            name: Name of the agent's role
+            
+        Returns:
+            The agent, or None if no agent was set up for that role
+        """
+        return self._agents_by_name.get(name)
+        
     def _generate_personality(self, role: Dict[str, str]) -> Dict[str, str]:
         """
         Generate a personality configuration for an agent.
@@ -59,10 +142,13 @@ class DiscussionManager:
             role: Role definition for the agent
             
         Returns:
-            Dict containing the agent's personality configuration
+            Dict containing the agent's personality configuration, including the trait scores of its role
         """
+        # Role names usually come from configuration files, interning them makes trait lookups identity checks
+        name = sys.intern(role.get("name", "Agent"))
         return {
-            "name": role.get("name", "Agent"),
+            **_BASE_TRAITS.get(name, _DEFAULT_TRAITS),
+            "name": name,
             "role": role.get("description", ""),
             "traits": role.get("traits", [])
         }
@@ -77,6 +163,19 @@ class DiscussionManager:
         Returns:
             Formatted prompt string
         """
+        return self._build_step_prompt(context).format_cached()
+
+    def _build_step_prompt(self, context: Dict[str, Any]) -> Prompt:
+        """
+        Build the prompt for a discussion step, starting with the static prefix when the prompt
+        cache is used.
+        
+        Args:
+            context: Context for the step prompt
+            
+        Returns:
+            Prompt with all its variables defined
+        """
         template = """
 You are participating in a {discussion_type} discussion about {product}.
 
@@ -91,15 +190,75 @@ Previous Discussion:
 
 Your role is to {role}. Please provide your thoughts and suggestions based on your role and expertise.
 """
-        prompt = Prompt(template=template)
-        prompt.add_variable("discussion_type", self.discussion.discussion_type.value)
+        if self.use_prompt_cache:
+            escaped_prefix = self._static_prefix.replace("{", "{{").replace("}", "}}")
+            prompt = Prompt(template=escaped_prefix + "\n" + template)
+        else:
+            prompt = Prompt(template=template)
+        prompt.add_variable("discussion_type", self.discussion.discussion_type)
         prompt.add_variable("product", self.discussion.context.get("product", ""))
-        prompt.add_variable("context", json.dumps(context.get("discussion_context", {}), indent=2))
+        prompt.add_variable("context", _dumps(context.get("discussion_context", {})))
         prompt.add_variable("task", context.get("phase", "").title())
-        prompt.add_variable("previous_discussion", json.dumps(context.get("previous_results", []), indent=2))
+        prompt.add_variable("previous_discussion", self._dumps_results(context.get("previous_results", [])))
         prompt.add_variable("role", context.get("role", "contribute to the discussion"))
-        return prompt.format()
+        return prompt
         
+    def _bind_loop(self) -> None:
+        """Create the asyncio primitives for the running event loop, if not done yet."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(agent_concurrency(self.max_concurrency))
+            self._agent_locks = {}
+
+    async def _aact(self, agent: Agent, step_prompt: str, phase: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Deliver the step prompt to an agent and have it act, without blocking the event loop
+        (the underlying LLM call being blocking). Returns the agent's last action, if any.
+        """
+        if self._response_cache is not None:
+            cache_key = ResponseCache.make_key(agent.name, phase, step_prompt)
+            cached_action = self._response_cache.get(cache_key)
+            if cached_action is not None:
+                return cached_action
+
+        last_action = await self._aact_uncached(agent, step_prompt)
+
+        if self._response_cache is not None and last_action:
+            self._response_cache.put(cache_key, last_action)
+        return last_action
+
+    async def _aact_uncached(self, agent: Agent, step_prompt: str) -> Optional[Dict[str, Any]]:
+        """Same as _aact, without the response cache."""
+        self._bind_loop()
+
+        # An agent handles one step at a time, so that concurrent steps don't mix their prompts
+        agent_lock = self._agent_locks.setdefault(agent.name, asyncio.Lock())
+        async with agent_lock:
+            agent.listen(step_prompt)
+            async with self._semaphore:
+                actions = await asyncio.to_thread(agent.act, return_actions=True)
+        return actions[-1] if actions else None  # Take only the last action
+
+    def _dumps_results(self, results: List[Dict[str, Any]]) -> str:
+        """
+        Serialize the results of previous steps as an indented JSON array. Each step result is
+        only serialized once, however many later steps include it in their prompts.
+        """
+        if not results:
+            return "[]"
+
+        items = []
+        for result in results:
+            cached = self._result_json_cache.get(id(result))
+            # The result is kept in the cache, so its id can't be reused by another object
+            if cached is None or cached[0] is not result:
+                cached = (result, _dumps(result))
+                self._result_json_cache[id(result)] = cached
+            items.append(textwrap.indent(cached[1], "  "))
+
+        return "[\n" + ",\n".join(items) + "\n]"
+
     def run_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
         """
         Run a single discussion step.
@@ -110,56 +269,90 @@ Your role is to {role}. Please provide your thoughts and suggestions based on yo
         Returns:
             Dict containing list of agent responses and summary
         """
-        # Create step prompt
-        step_prompt = self._create_step_prompt(step)
+        return asyncio.run(self.arun_step(step))
+
+    async def arun_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a single discussion step, with all agents acting concurrently. Several steps
+        can be run concurrently as well, each agent then handling them in turn.
         
-        # Run group discussion with fewer steps to avoid context length issues
-        self.world.broadcast(step_prompt)
-        try:
-            responses = []
-            for agent in self.agents:
-                try:
-                    agent_response = agent.act(return_actions=True)
-                    if agent_response:
-                        responses.append(agent_response[-1])  # Take only the last action
-                except Exception as e:
-                    print(f"Warning: Error during agent {agent.name} response: {str(e)}")
-                    continue
-        except Exception as e:
-            print(f"Warning: Error during discussion step: {str(e)}")
-            responses = []
-        
-        # Process and format responses
-        formatted_responses = []
-        for response in responses:
-            if not isinstance(response, dict):
-                continue
-                
-            agent = response.get("agent", "")
-            action = response.get("action", {})
+        Args:
+            step: Step configuration with context and task
             
-            if isinstance(action, dict):
-                response_text = action.get("content", "")
-            else:
-                response_text = str(action)
-                
-            formatted_response = {
-                "agent": agent,
-                "response": response_text
-            }
-            formatted_responses.append(formatted_response)
+        Returns:
+            Dict containing list of agent responses and summary
+        """
+        responses = [indexed_response async for indexed_response in self._aiter_step(step)]
+        # Responses arrive as agents finish, but are reported in the order of the agents
+        responses.sort(key=lambda indexed_response: indexed_response[0])
         
         return {
-            "responses": formatted_responses,
+            "responses": [response for _, response in responses],
             "summary": "Discussion step completed"
         }
+
+    async def astream_step(self, step: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a single discussion step like arun_step, yielding each agent's formatted response
+        as soon as that agent has acted, instead of waiting for the slowest agent.
+        
+        Args:
+            step: Step configuration with context and task
+            
+        Yields:
+            Dict with the agent and its response
+        """
+        async for _, response in self._aiter_step(step):
+            yield response
+
+    async def _aiter_step(self, step: Dict[str, Any]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Run a discussion step, yielding (agent position, formatted response) pairs as agents finish."""
+        # Create step prompt
+        step_prompt = self._create_step_prompt(step)
+        phase = step.get("phase", "")
+
+        async def act(position: int, agent: Agent) -> Tuple[int, Agent, Any]:
+            try:
+                return position, agent, await self._aact(agent, step_prompt, phase)
+            except Exception as e:
+                return position, agent, e
+
+        tasks = [asyncio.ensure_future(act(position, agent)) for position, agent in enumerate(self.agents)]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                position, agent, last_action = await next_completed
+                if isinstance(last_action, Exception):
+                    logger.warning("Error during agent %s response: %s", agent.name, last_action)
+                    continue
+
+                formatted_response = self._format_response(last_action)
+                if formatted_response is not None:
+                    yield position, formatted_response
+        finally:
+            # The consumer may stop early, leaving agents that didn't finish yet
+            for task in tasks:
+                task.cancel()
+            if self._response_cache is not None:
+                self._response_cache.save()
+
+    @staticmethod
+    def _format_response(response: Any) -> Optional[Dict[str, Any]]:
+        """Format an agent's last action as a step response, or None if it isn't one."""
+        if not response or not isinstance(response, dict):
+            return None
+
+        action = response.get("action", {})
+        return {
+            "agent": response.get("agent", ""),
+            "response": action.get("content", "") if isinstance(action, dict) else str(action)
+        }
         
     def _get_coordination_prompt(self) -> str:
         """Get prompt for agent group coordination."""
-        return f"""You are participating in a {self.discussion.discussion_type.value} about {self.discussion.name}.
+        return f"""You are participating in a {self.discussion.discussion_type} about {self.discussion.name}.
         
         Context:
-        {json.dumps(self.discussion.context, indent=2)}
+        {self._static_context_json}
         
         Guidelines:
         1. Stay focused on the discussion objective
@@ -172,4 +365,4 @@ Your role is to {role}. Please provide your thoughts and suggestions based on yo
         
     def extract_results(self, raw_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Extract and format final results."""
-        return format_results(raw_results, self.discussion.discussion_type.value)
+        return format_results(raw_results, self.discussion.discussion_type)
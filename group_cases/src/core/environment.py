@@ -1,53 +1,98 @@
 """
 Environment classes for managing discussion worlds and social networks.
 """
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Union
+import numpy as np
+from tinytroupe import environment as tinytroupe_environment
 from .characters import TinyPerson
 
-class TinyWorld:
-    """A world environment for discussions"""
+# Environment names are registered by TinyTroupe and must be unique, so they are picked under a lock
+_environment_names_lock = threading.Lock()
+
+class TinyWorld(tinytroupe_environment.TinyWorld):
+    """A world environment for discussions, where every agent can talk to every other one"""
     
     def __init__(self, name: str, agents: List[TinyPerson]):
-        self.name = name
-        self.agents = agents
+        # Several discussions (or worlds of one discussion) may share a name, so later ones are numbered
+        with _environment_names_lock:
+            unique_name, number = name, 1
+            while unique_name in tinytroupe_environment.TinyWorld.all_environments:
+                number += 1
+                unique_name = f"{name} ({number})"
+            super().__init__(unique_name, agents)
         self.social_network = TinySocialNetwork(agents)
         self.messages = []
+        self.make_everyone_accessible()
         
-    def broadcast(self, message: str):
-        """Broadcast a message to all agents"""
-        self.messages.append({"type": "broadcast", "content": message})
-        for agent in self.agents:
-            agent.receive_message(message)
+    def broadcast(self, speech: str, source=None):
+        """Broadcast a message to all agents (but its source), recording it in the world's messages"""
+        self.messages.append({"type": "broadcast", "content": speech})
+        super().broadcast(speech, source=source)
+
+    def close(self):
+        """Unregister the world from TinyTroupe's environments, once the discussion no longer needs it"""
+        with _environment_names_lock:
+            if tinytroupe_environment.TinyWorld.all_environments.get(self.name) is self:
+                del tinytroupe_environment.TinyWorld.all_environments[self.name]
 
 class TinySocialNetwork:
     """Manages relationships between agents"""
     
     def __init__(self, agents: List[TinyPerson]):
         self.agents = agents
-        self.relationships = {}
         self._initialize_relationships()
         
     def _initialize_relationships(self):
-        """Initialize basic relationships between all agents"""
-        for agent1 in self.agents:
-            self.relationships[agent1.name] = {}
-            for agent2 in self.agents:
-                if agent1 != agent2:
-                    self.relationships[agent1.name][agent2.name] = {
-                        "trust": 0.5,
-                        "familiarity": 0.0
-                    }
+        """
+        Initialize basic relationships between all agents. Each metric is a matrix indexed by
+        the agents' positions, where [i, j] is how agent i relates to agent j.
+        """
+        num_agents = len(self.agents)
+        self._index = {agent.name: i for i, agent in enumerate(self.agents)}
+        self.trust = np.full((num_agents, num_agents), 0.5, dtype=np.float32)
+        self.familiarity = np.zeros((num_agents, num_agents), dtype=np.float32)
+
+        # Agents have no relationship with themselves
+        np.fill_diagonal(self.trust, np.nan)
+        np.fill_diagonal(self.familiarity, np.nan)
+
+    @property
+    def relationships(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Relationship metrics between all agents, as {agent1: {agent2: {"trust": ..., "familiarity": ...}}}"""
+        return {
+            agent1: {
+                agent2: {
+                    "trust": float(self.trust[i, j]),
+                    "familiarity": float(self.familiarity[i, j])
+                }
+                for agent2, j in self._index.items() if i != j
+            }
+            for agent1, i in self._index.items()
+        }
     
     def update_relationship(self, agent1: str, agent2: str, 
                           trust_delta: float = 0.0, 
                           familiarity_delta: float = 0.1):
         """Update relationship metrics between two agents"""
-        if agent1 in self.relationships and agent2 in self.relationships[agent1]:
-            self.relationships[agent1][agent2]["trust"] += trust_delta
-            self.relationships[agent1][agent2]["familiarity"] += familiarity_delta
-            
-            # Ensure values stay in valid range
-            self.relationships[agent1][agent2]["trust"] = max(0.0, min(1.0, 
-                self.relationships[agent1][agent2]["trust"]))
-            self.relationships[agent1][agent2]["familiarity"] = max(0.0, min(1.0,
-                self.relationships[agent1][agent2]["familiarity"]))
+        i = self._index.get(agent1)
+        j = self._index.get(agent2)
+        if i is None or j is None or i == j:
+            return
+
+        # Ensure values stay in valid range
+        self.trust[i, j] = min(1.0, max(0.0, self.trust[i, j] + trust_delta))
+        self.familiarity[i, j] = min(1.0, max(0.0, self.familiarity[i, j] + familiarity_delta))
+
+    def bulk_update(self, trust_deltas: Union[float, np.ndarray] = 0.0,
+                    familiarity_deltas: Union[float, np.ndarray] = 0.1):
+        """
+        Update the relationship metrics between all agents at once, e.g. after a broadcast.
+
+        Args:
+            trust_deltas: Trust change, either for all relationships or as an agents x agents matrix
+            familiarity_deltas: Familiarity change, either for all relationships or as an agents x agents matrix
+        """
+        # The diagonal stays NaN, so agents still have no relationship with themselves
+        np.clip(self.trust + trust_deltas, 0.0, 1.0, out=self.trust)
+        np.clip(self.familiarity + familiarity_deltas, 0.0, 1.0, out=self.familiarity)
@@ -1,7 +1,53 @@
 """
 Prompt module for managing and formatting prompts.
 """
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Format specs that can be inlined in generated f-strings as they are
+_SIMPLE_FORMAT_SPEC_RE = re.compile(r'[\w<>=^+\- #.,%]*')
+
+@lru_cache(maxsize=128)
+def _compile_template(template: str) -> Optional[Callable[[Dict[str, Any]], str]]:
+    """
+    Compile a template into a function formatting it like str.format() from a dict of variables,
+    as an f-string, so the template is not parsed again on each formatting. Returns None for
+    templates using positional, attribute or index fields or nested format specs, which are
+    left to str.format().
+    """
+    lines = []
+    body = []
+    names = {}
+    for literal, name, spec, conversion in Formatter().parse(template):
+        body.append(literal.replace("{", "{{").replace("}", "}}"))
+        if name is None:
+            continue
+        if not name.isidentifier() or not _SIMPLE_FORMAT_SPEC_RE.fullmatch(spec):
+            return None
+        if name not in names:
+            names[name] = f"_{len(names)}"
+            lines.append(f"    {names[name]} = v[{name!r}]")
+        body.append("{" + names[name] + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+
+    source = "def build(v):\n" + "\n".join(lines) + f"\n    return f{''.join(body)!r}\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<prompt template>", "exec"), namespace)
+    return namespace["build"]
+
+def _format(template: str, variables: Dict[str, Any]) -> str:
+    """Format a template with the given variables, like template.format(**variables)."""
+    builder = _compile_template(template)
+    return builder(variables) if builder is not None else template.format(**variables)
+
+@lru_cache(maxsize=128)
+def _format_template(template: str, variables: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """
+    Format a template with the given (name, type, value) variables, remembering recent results.
+    The types are part of the key, as equal values of different types (e.g. 1 and True) are formatted differently.
+    """
+    return _format(template, {name: value for name, _, value in variables})
 
 class Prompt:
     """A class for managing and formatting prompts."""
@@ -29,7 +75,26 @@ class Prompt:
         """
         # Combine stored variables with new ones, new ones take precedence
         variables = {**self.variables, **kwargs}
-        return self.template.format(**variables)
+        return _format(self.template, variables)
+        
+    def format_cached(self, **kwargs) -> str:
+        """
+        Format the prompt like format(), reusing the result of a recent identical formatting
+        (same template and variable values). Unhashable variable values are formatted directly.
+        
+        Args:
+            **kwargs: Variables to format the template with
+            
+        Returns:
+            str: Formatted prompt
+        """
+        variables = {**self.variables, **kwargs}
+        try:
+            key = tuple((name, type(value), value) for name, value in sorted(variables.items()))
+            return _format_template(self.template, key)
+        except TypeError:
+            # Unhashable variable values can't be cached
+            return _format(self.template, variables)
         
     def add_variable(self, name: str, value: Any) -> None:
         """
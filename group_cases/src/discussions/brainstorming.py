@@ -2,7 +2,7 @@
 Specialized discussion implementation for brainstorming sessions.
 """
 from typing import Dict, List, Any, Optional
-from ..core.base_discussion import BaseDiscussion, DiscussionType
+from ..core.base_discussion import BaseDiscussion, BRAINSTORMING
 from ..core.discussion_manager import DiscussionManager
 
 class BrainstormingDiscussion(BaseDiscussion):
@@ -16,7 +16,7 @@ class BrainstormingDiscussion(BaseDiscussion):
             topic: Topic to brainstorm about
             domain: Domain/industry context
         """
-        super().__init__(f"{topic} Brainstorming", DiscussionType.BRAINSTORMING)
+        super().__init__(f"{topic} Brainstorming", BRAINSTORMING)
         self.topic = topic
         self.domain = domain
         self.add_metadata("topic", topic)
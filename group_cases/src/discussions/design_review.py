@@ -2,7 +2,8 @@
 Specialized discussion implementation for design review sessions.
 """
 from typing import Dict, List, Any, Optional
-from ..core.base_discussion import BaseDiscussion, DiscussionType
+import asyncio
+from ..core.base_discussion import BaseDiscussion, EVALUATION
 from ..core.discussion_manager import DiscussionManager
 
 class DesignReviewDiscussion(BaseDiscussion):
@@ -16,7 +17,7 @@ class DesignReviewDiscussion(BaseDiscussion):
             design_name: Name of the design to review
             design_type: Type of design (UI/UX, architecture, etc.)
         """
-        super().__init__(f"{design_name} Design Review", DiscussionType.EVALUATION)
+        super().__init__(f"{design_name} Design Review", EVALUATION)
         self.design_name = design_name
         self.design_type = design_type
         self.add_metadata("design_name", design_name)
@@ -26,6 +27,19 @@ class DesignReviewDiscussion(BaseDiscussion):
         """
         Run the design review session.
         
+        Args:
+            num_steps: Number of review segments
+            
+        Returns:
+            Design review results
+        """
+        return asyncio.run(self.arun_discussion(num_steps))
+
+    async def arun_discussion(self, num_steps: int = 3) -> Dict[str, Any]:
+        """
+        Run the design review session. Each segment reviews its own subset of the aspects,
+        independently of the other segments, so the segments are run concurrently.
+        
         Args:
             num_steps: Number of review segments
             
@@ -43,7 +57,6 @@ class DesignReviewDiscussion(BaseDiscussion):
         ]
         manager.setup_agents(roles)
         
-        results = []
         review_aspects = [
             "design_principles",
             "usability",
@@ -52,18 +65,18 @@ class DesignReviewDiscussion(BaseDiscussion):
             "scalability"
         ]
         
+        step_configs = []
         for step in range(num_steps):
             aspects = review_aspects[step::num_steps]
-            step_config = {
+            step_configs.append({
                 "aspects": aspects,
                 "context": self.context,
-                "previous_results": results,
+                "previous_results": [],
                 "review_criteria": self.get_review_criteria(aspects)
-            }
-            step_result = manager.run_step(step_config)
-            results.append(step_result)
+            })
+        results = await asyncio.gather(*(manager.arun_step(step_config) for step_config in step_configs))
             
-        return manager.extract_results(results)
+        return manager.extract_results(list(results))
     
     def get_review_criteria(self, aspects: List[str]) -> Dict[str, List[str]]:
         """Get review criteria for each aspect."""
@@ -2,7 +2,8 @@
 Specialized discussion implementation for evaluation sessions.
 """
 from typing import Dict, List, Any, Optional
-from ..core.base_discussion import BaseDiscussion, DiscussionType
+import asyncio
+from ..core.base_discussion import BaseDiscussion, EVALUATION
 from ..core.discussion_manager import DiscussionManager
 
 class EvaluationDiscussion(BaseDiscussion):
@@ -16,7 +17,7 @@ class EvaluationDiscussion(BaseDiscussion):
             subject: Subject to evaluate
             criteria: List of evaluation criteria
         """
-        super().__init__(f"{subject} Evaluation", DiscussionType.EVALUATION)
+        super().__init__(f"{subject} Evaluation", EVALUATION)
         self.subject = subject
         self.criteria = criteria
         self.add_metadata("subject", subject)
@@ -26,6 +27,19 @@ class EvaluationDiscussion(BaseDiscussion):
         """
         Run the evaluation session.
         
+        Args:
+            num_steps: Number of evaluation rounds
+            
+        Returns:
+            Evaluation results
+        """
+        return asyncio.run(self.arun_discussion(num_steps))
+
+    async def arun_discussion(self, num_steps: int = 3) -> Dict[str, Any]:
+        """
+        Run the evaluation session. Each round evaluates its own subset of the criteria,
+        independently of the other rounds, so the rounds are run concurrently.
+        
         Args:
             num_steps: Number of evaluation rounds
             
@@ -43,15 +57,14 @@ class EvaluationDiscussion(BaseDiscussion):
         ]
         manager.setup_agents(roles)
         
-        results = []
-        for step in range(num_steps):
-            criteria_subset = self.criteria[step::num_steps]
-            step_config = {
-                "criteria": criteria_subset,
+        step_configs = [
+            {
+                "criteria": self.criteria[step::num_steps],
                 "context": self.context,
-                "previous_results": results
+                "previous_results": []
             }
-            step_result = manager.run_step(step_config)
-            results.append(step_result)
+            for step in range(num_steps)
+        ]
+        results = await asyncio.gather(*(manager.arun_step(step_config) for step_config in step_configs))
             
-        return manager.extract_results(results)
+        return manager.extract_results(list(results))
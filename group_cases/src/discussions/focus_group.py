@@ -2,7 +2,7 @@
 Specialized discussion implementation for focus group sessions.
 """
 from typing import Dict, List, Any, Optional
-from ..core.base_discussion import BaseDiscussion, DiscussionType
+from ..core.base_discussion import BaseDiscussion, FOCUS_GROUP
 from ..core.discussion_manager import DiscussionManager
 
 class FocusGroupDiscussion(BaseDiscussion):
@@ -16,7 +16,7 @@ class FocusGroupDiscussion(BaseDiscussion):
             topic: Topic for discussion
             target_demographic: Target demographic group
         """
-        super().__init__(f"{topic} Focus Group", DiscussionType.FOCUS_GROUP)
+        super().__init__(f"{topic} Focus Group", FOCUS_GROUP)
         self.topic = topic
         self.target_demographic = target_demographic
         self.add_metadata("topic", topic)
@@ -2,7 +2,7 @@
 Specialized discussion implementation for interview sessions.
 """
 from typing import Dict, List, Any, Optional
-from ..core.base_discussion import BaseDiscussion, DiscussionType
+from ..core.base_discussion import BaseDiscussion, INTERVIEW
 from ..core.discussion_manager import DiscussionManager
 
 class InterviewDiscussion(BaseDiscussion):
@@ -16,7 +16,7 @@ class InterviewDiscussion(BaseDiscussion):
             interviewee_type: Type/role of the interviewee
             objective: Main objective of the interview
         """
-        super().__init__(f"{interviewee_type} Interview", DiscussionType.INTERVIEW)
+        super().__init__(f"{interviewee_type} Interview", INTERVIEW)
         self.interviewee_type = interviewee_type
         self.objective = objective
         self.add_metadata("interviewee_type", interviewee_type)
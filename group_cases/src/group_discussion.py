@@ -1,20 +1,104 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import json
+import atexit
+import copy
 import sys
 import os
-from typing import List, Dict, Any, Optional, Union
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple, Union
 from enum import Enum
+import orjson
 sys.path.append('..')
 
 # import tinytroupe  # Removed legacy import
 from group_cases.src.core.characters import TinyPerson
+from tinytroupe.agent import EpisodicMemory
+from tinytroupe.examples import create_lisa_the_data_scientist, create_oscar_the_architect, create_marcos_the_physician
 from group_cases.src.core.environment import TinyWorld, TinySocialNetwork
 # Removed legacy wildcard import
 from group_cases.src.utils.result_processor import ResultsExtractor, default_extractor, ResultsReducer
-from group_cases.src.core.characters import TinyPersonFactory
+from tinytroupe.factory import TinyPersonFactory
 from group_cases.src.utils.db_utils import DatabaseManager
+from group_cases.src.utils.response_cache import ResponseCache
+from group_cases.src.utils.semantic_cache import SemanticCache
+from group_cases.src.utils.concurrency import agent_concurrency
+
+# Results of previous discussions, shared by all discussions and persisted across runs
+RESULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "tinytroupe_group", "results.pkl")
+_result_cache: Optional[ResponseCache] = None
+
+def _get_result_cache() -> ResponseCache:
+    """Get the discussion results cache, loading it on first use"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResponseCache(cache_file=RESULT_CACHE_FILE)
+    return _result_cache
+
+# Results of previous discussions, reused for near-duplicate situations and contexts
+SEMANTIC_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "tinytroupe_group", "semantic_results.pkl")
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+_semantic_cache: Optional[SemanticCache] = None
+
+def _get_semantic_cache() -> SemanticCache:
+    """Get the semantic discussion results cache, loading it on first use"""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(threshold=SEMANTIC_CACHE_THRESHOLD, model_name=SEMANTIC_CACHE_MODEL,
+                                        cache_file=SEMANTIC_CACHE_FILE)
+    return _semantic_cache
+
+def _rename_agent(agent: TinyPerson, name: str):
+    """Rename an agent, also in the registry of agent names, so its previous name is free again"""
+    if TinyPerson.all_agents.get(agent.name) is agent:
+        del TinyPerson.all_agents[agent.name]
+    agent._rename(name)
+    TinyPerson.all_agents.setdefault(name, agent)
+
+# Output directories already created by save_results
+_created_dirs: set = set()
+
+class _AgentPool:
+    """Lends agents built by persona factories, so each persona is only built once and then reused"""
+
+    def __init__(self, max_free: int = 16):
+        """Initialize the pool, keeping at most max_free idle agents (the least recently released ones are dropped)"""
+        self.max_free = max_free
+        # Maps idle agents' ids to (factory, agent), from least to most recently released
+        self._free: "OrderedDict[int, Tuple[Callable[[], TinyPerson], TinyPerson]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, factory: Callable[[], TinyPerson], name: str) -> TinyPerson:
+        """Lend an idle agent built by the factory, or build a new one, under the given name"""
+        with self._lock:
+            for agent_id, (agent_factory, agent) in reversed(self._free.items()):
+                if agent_factory is factory:
+                    del self._free[agent_id]
+                    break
+            else:
+                # Built while holding the lock, as agents can only be built while their persona's name is free
+                agent = factory()
+            _rename_agent(agent, name)
+        return agent
+
+    def release(self, agent: TinyPerson, factory: Callable[[], TinyPerson]):
+        """Return a lent agent, clearing its discussion state so nothing leaks into its next discussion"""
+        agent.make_all_agents_inaccessible()
+        agent._update_cognitive_state(goals=[], context=[])
+        agent.episodic_memory = EpisodicMemory()
+        agent.clear_communications_buffer()
+
+        with self._lock:
+            self._free[id(agent)] = (factory, agent)
+            while len(self._free) > self.max_free:
+                self._free.popitem(last=False)
+
+_agent_pool = _AgentPool()
 
 class DiscussionType(Enum):
     FOCUS_GROUP = "focus_group"
@@ -23,8 +107,30 @@ class DiscussionType(Enum):
     EVALUATION = "evaluation"
     CUSTOM = "custom"
 
+@dataclass(slots=True)
+class ExtractionConfig:
+    """How results are extracted from a discussion"""
+    objective: str = ""
+    fields: Optional[List[str]] = None
+    rapporteur_name: Optional[str] = None
+
 class GroupDiscussion:
     """A generalized class for managing various types of group discussions and interviews"""
+
+    # Database writes of all discussions are buffered, and stored in batches of _batch_size rows
+    _pending_writes: List[Tuple[DatabaseManager, Dict[str, Any], Dict[str, Any]]] = []
+    _pending_writes_lock = threading.Lock()
+    _batch_size = int(os.environ.get("TT_BATCH", 100))
+
+    # Default agents of each discussion type, as (first name, persona factory) pairs
+    _DEFAULT_PERSONAS: Dict[DiscussionType, Tuple[Tuple[str, Callable[[], TinyPerson]], ...]] = {
+        DiscussionType.INTERVIEW: (("Lisa", create_lisa_the_data_scientist),)
+    }
+    _DEFAULT_FALLBACK_PERSONAS: Tuple[Tuple[str, Callable[[], TinyPerson]], ...] = (
+        ("Lisa", create_lisa_the_data_scientist),
+        ("Oscar", create_oscar_the_architect),
+        ("Marcos", create_marcos_the_physician)
+    )
     
     def __init__(self, 
                  discussion_name: str,
@@ -46,25 +152,55 @@ class GroupDiscussion:
         self.context = context
         self.db_manager = DatabaseManager()
         
-        # Initialize agents based on discussion type and inputs
-        if agents:
-            self.agents = agents
-        elif custom_factory:
-            self.agents = self._generate_custom_agents(custom_factory)
-        else:
-            self.agents = self._get_default_agents()
-            
-        # Initialize the discussion world
-        self.world = TinyWorld(discussion_name, self.agents)
+        # Agents and the discussion world are only created once they are needed
+        self._agents: Optional[List[TinyPerson]] = agents or None
+        self._custom_factory = custom_factory
+        self._world: Optional[TinyWorld] = None
+        self._agents_by_name: Optional[Dict[str, TinyPerson]] = None
+        # Extracted results, by fingerprint of the transcript they were extracted from
+        self._extract_cache: Dict[str, Dict[str, Any]] = {}
+        self._broadcasts: List[str] = []
+        # Default agents lent by the agent pool, with the factories that built them
+        self._leased_agents: List[Tuple[TinyPerson, Callable[[], TinyPerson]]] = []
         
         # Initialize discussion parameters
         self.situation = ""
         self.additional_context = {}
-        self.extraction_config = {
-            "objective": "",
-            "fields": None,
-            "rapporteur_name": None
-        }
+        # Metadata is rebuilt only once the context changed
+        self._metadata_cache: Optional[Dict[str, Any]] = None
+        self.extraction_config = ExtractionConfig()
+        
+    @property
+    def agents(self) -> List[TinyPerson]:
+        """The discussion's agents: the predefined ones, or else custom or default agents, created on first access"""
+        if self._agents is None:
+            if self._custom_factory:
+                self._agents = self._generate_custom_agents(self._custom_factory)
+            else:
+                self._agents = self._get_default_agents()
+        return self._agents
+
+    def get_agent(self, name: str) -> Optional[TinyPerson]:
+        """Get one of the discussion's agents by name, or None if there is no such agent"""
+        if self._agents_by_name is None:
+            self._agents_by_name = {agent.name: agent for agent in self.agents}
+        return self._agents_by_name.get(name)
+
+    @property
+    def world(self) -> TinyWorld:
+        """The discussion world, created on first access"""
+        if self._world is None:
+            self._world = TinyWorld(self.discussion_name, self.agents)
+            # Deliver what was broadcast before this world existed
+            for message in self._broadcasts:
+                self._world.broadcast(message)
+        return self._world
+
+    def broadcast(self, message: str):
+        """Broadcast a message to all agents, as soon as the discussion world exists (and whenever it is recreated)"""
+        self._broadcasts.append(message)
+        if self._world is not None:
+            self._world.broadcast(message)
         
     def _generate_custom_agents(self, factory: TinyPersonFactory) -> List[TinyPerson]:
         """Generate custom agents using the provided factory"""
@@ -73,27 +209,39 @@ class GroupDiscussion:
         
     def _get_default_agents(self) -> List[TinyPerson]:
         """Get default agents based on discussion type"""
-        agents = []
+        personas = self._DEFAULT_PERSONAS.get(self.discussion_type, self._DEFAULT_FALLBACK_PERSONAS)
         
-        # Create a unique instance of Lisa for each discussion
-        if self.discussion_type == DiscussionType.INTERVIEW:
-            lisa = create_lisa_the_data_scientist()
-            lisa.name = f"Lisa_{self.discussion_name}"  # Make name unique
-            agents = [lisa]
-        else:
-            # Create unique instances for each agent
-            lisa = create_lisa_the_data_scientist()
-            oscar = create_oscar_the_architect()
-            marcos = create_marcos_the_physician()
-            
-            # Make names unique by appending discussion name
-            lisa.name = f"Lisa_{self.discussion_name}"
-            oscar.name = f"Oscar_{self.discussion_name}"
-            marcos.name = f"Marcos_{self.discussion_name}"
-            
-            agents = [lisa, oscar, marcos]
+        agents = []
+        for first_name, factory in personas:
+            agent = _agent_pool.acquire(factory, f"{first_name}_{self.discussion_name}")  # Make name unique
+            self._leased_agents.append((agent, factory))
+            agents.append(agent)
         
         return agents
+
+    def release_agents(self):
+        """
+        Return the default agents to the agent pool, once the discussion is over. Its world, and so
+        its transcript, is dropped with them: results must be got before releasing the agents.
+        """
+        if not self._leased_agents:
+            return
+            
+        for agent, factory in self._leased_agents:
+            _agent_pool.release(agent, factory)
+        self._leased_agents.clear()
+        self._agents = None
+        self._agents_by_name = None
+        if self._world is not None:
+            self._world.close()
+            self._world = None
+
+    def __enter__(self) -> "GroupDiscussion":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release the agents when leaving the discussion's with block"""
+        self.release_agents()
             
     def set_situation(self, situation: str):
         """Set the situation description"""
@@ -102,109 +250,292 @@ class GroupDiscussion:
     def add_context(self, key: str, value: Any):
         """Add additional context information"""
         self.additional_context[key] = value
+        self._metadata_cache = None
         
     def configure_extraction(self, 
                            objective: str,
                            fields: Optional[List[str]] = None,
                            rapporteur_name: Optional[str] = None):
         """Configure how results should be extracted"""
-        self.extraction_config.update({
-            "objective": objective,
-            "fields": fields,
-            "rapporteur_name": rapporteur_name
-        })
-
-    def get_results(self) -> Dict[str, Any]:
-        """Extract and return results from the discussion"""
+        self.extraction_config.objective = objective
+        self.extraction_config.fields = fields
+        self.extraction_config.rapporteur_name = rapporteur_name
+
+    def _transcript_fingerprint(self) -> str:
+        """
+        Fingerprint the state results are extracted from: the world's messages, what each agent
+        remembers (memories are only ever appended to) and the extraction configuration
+        """
+        transcript = orjson.dumps({
+            "messages": self.world.messages,
+            "memories": [(agent.name, agent.episodic_memory.count()) for agent in self.agents],
+            "extraction_config": self.extraction_config
+        }, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        return ResponseCache.make_key(transcript.decode())
+
+    def get_results(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Extract and return results from the discussion
+        
+        Args:
+            use_cache: Whether to reuse the results already extracted from the same transcript
+                with the same extraction configuration, instead of extracting them again
+        """
+        if not use_cache:
+            return self._extract_results()
+            
+        fingerprint = self._transcript_fingerprint()
+        if fingerprint not in self._extract_cache:
+            self._extract_cache[fingerprint] = self._extract_results()
+        return copy.deepcopy(self._extract_cache[fingerprint])
+
+    def _extract_results(self) -> Dict[str, Any]:
+        """Extract results from the discussion, with an LLM call"""
         # Create an extractor
         extractor = ResultsExtractor()
         
         # Extract results based on configuration
-        if self.extraction_config["rapporteur_name"]:
-            rapporteur = next(
-                (agent for agent in self.agents 
-                 if agent.name == self.extraction_config["rapporteur_name"]),
-                None
-            )
+        if self.extraction_config.rapporteur_name:
+            rapporteur = self.get_agent(self.extraction_config.rapporteur_name)
             if rapporteur:
                 results = extractor.extract_results_from_agent(
                     rapporteur,
-                    extraction_objective=self.extraction_config["objective"],
-                    fields=self.extraction_config["fields"]
+                    extraction_objective=self.extraction_config.objective,
+                    fields=self.extraction_config.fields
                 )
             else:
                 # Fallback to world extraction if rapporteur not found
                 results = extractor.extract_results_from_world(
                     self.world,
-                    extraction_objective=self.extraction_config["objective"],
-                    fields=self.extraction_config["fields"]
+                    extraction_objective=self.extraction_config.objective,
+                    fields=self.extraction_config.fields
                 )
         else:
             results = extractor.extract_results_from_world(
                 self.world,
-                extraction_objective=self.extraction_config["objective"],
-                fields=self.extraction_config["fields"]
+                extraction_objective=self.extraction_config.objective,
+                fields=self.extraction_config.fields
             )
         
         # If fields are specified, ensure they exist in results
-        if results and self.extraction_config["fields"]:
-            for field in self.extraction_config["fields"]:
+        if results and self.extraction_config.fields:
+            for field in self.extraction_config.fields:
                 if field not in results:
                     results[field] = None
         
         return results or {}
     
     def prepare_metadata(self) -> dict:
-        """Prepare metadata for database storage"""
-        metadata = {
+        """Prepare metadata for database storage. The returned dict is shared, and must not be modified."""
+        if self._metadata_cache is None:
+            self._metadata_cache = {
+                "discussion_type": self.discussion_type.value,
+                "discussion_name": self.discussion_name,
+                "context": self.context,
+                **self.additional_context
+            }
+        return self._metadata_cache
+        
+    def _agent_specs(self) -> List[Any]:
+        """
+        Identify the discussion's agents without building them: default agents by the persona factories
+        they are (or would be) built with, other agents by their persona, i.e. their configuration
+        without the current state that changes as they act
+        """
+        if (self._agents is None and not self._custom_factory) or self._leased_agents:
+            personas = self._DEFAULT_PERSONAS.get(self.discussion_type, self._DEFAULT_FALLBACK_PERSONAS)
+            return [(first_name, f"{factory.__module__}.{factory.__qualname__}") for first_name, factory in personas]
+        return [
+            {key: value for key, value in agent._configuration.items() if not key.startswith("current")}
+            for agent in self.agents
+        ]
+
+    def _result_cache_key(self, num_steps: int, reduce_results: bool) -> str:
+        """Build the key identifying a run of this discussion, from everything its results depend on"""
+        run_definition = orjson.dumps({
+            "discussion_class": type(self).__name__,
+            "metadata": self.prepare_metadata(),
+            "situation": self.situation,
+            "extraction_config": self.extraction_config,
+            "agents": self._agent_specs(),
+            "num_steps": num_steps,
+            "reduce_results": reduce_results
+        }, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        return ResponseCache.make_key(run_definition.decode())
+
+    def _semantic_cache_entry(self, num_steps: int, reduce_results: bool) -> Tuple[str, str]:
+        """
+        Build the (namespace, text) under which the results of this discussion are cached semantically:
+        what must match exactly, and the situation and context, which only need to be similar
+        """
+        namespace = orjson.dumps({
+            "discussion_class": type(self).__name__,
             "discussion_type": self.discussion_type.value,
-            "discussion_name": self.discussion_name,
-            "context": self.context,
-            **self.additional_context
-        }
-        return metadata
+            "extraction_config": self.extraction_config,
+            "num_steps": num_steps,
+            "reduce_results": reduce_results
+        }, option=orjson.OPT_SORT_KEYS, default=str).decode()
+        text = self.situation + "\n" + orjson.dumps(
+            self.additional_context, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        ).decode()
+        return namespace, text
+
+    @staticmethod
+    def clear_cache():
+        """Remove all cached discussion results"""
+        cache = _get_result_cache()
+        cache.clear()
+        cache.save()
+        if os.path.exists(SEMANTIC_CACHE_FILE):
+            semantic_cache = _get_semantic_cache()
+            semantic_cache.clear()
+            semantic_cache.save()
         
     def run_discussion(self, 
                       num_steps: int = 3,
-                      reduce_results: bool = False) -> Dict[str, Any]:
+                      reduce_results: bool = False,
+                      use_cache: bool = True,
+                      use_semantic_cache: bool = False) -> Dict[str, Any]:
         """Run the discussion and extract results
         
         Args:
             num_steps: Number of discussion steps
             reduce_results: Whether to reduce results from multiple agents
+            use_cache: Whether to return the results of an identical previous run (same discussion,
+                situation, context, agents, extraction and number of steps) instead of running it again.
+                On by default: the cache is persisted in RESULT_CACHE_FILE, so results are also reused
+                across processes until clear_cache() is called
+            use_semantic_cache: Whether to also return the results of a previous run of the same kind
+                of discussion whose situation and context were nearly the same (cosine similarity of
+                their embeddings of at least SEMANTIC_CACHE_THRESHOLD)
             
         Returns:
             Dictionary containing extracted results
         """
+        if use_cache:
+            cache = _get_result_cache()
+            cache_key = self._result_cache_key(num_steps, reduce_results)
+            cached_results = cache.get(cache_key)
+            if cached_results is not None:
+                return copy.deepcopy(cached_results)
+
+        if use_semantic_cache:
+            semantic_cache = _get_semantic_cache()
+            namespace, text = self._semantic_cache_entry(num_steps, reduce_results)
+            cached_results = semantic_cache.get(namespace, text)
+            if cached_results is not None:
+                return copy.deepcopy(cached_results)
+
         # Broadcast situation if set
         if self.situation:
             self.world.broadcast(self.situation)
-            
+
         # Run the discussion
         self.world.run(num_steps)
-        
+
         # Get results
         results = self.get_results()
-        
+
         # Reduce results if requested
         if reduce_results:
             reducer = ResultsReducer()
             results = reducer.reduce_results([results])
-            
+
+        if use_cache:
+            cache.put(cache_key, copy.deepcopy(results))
+            cache.save()
+        if use_semantic_cache and results:
+            semantic_cache.put(namespace, text, copy.deepcopy(results))
+            semantic_cache.save()
+
         return results
     
+    def _extraction_complete(self, results: Dict[str, Any]) -> bool:
+        """Whether results already have a value for every configured extraction field"""
+        fields = self.extraction_config.fields
+        return bool(fields) and all(results.get(field) is not None for field in fields)
+
+    def run_discussion_stream(self, num_steps: int = 3) -> Iterator[Dict[str, Any]]:
+        """Run the discussion one step at a time, yielding the results extracted after each step
+        
+        The discussion stops early once all the configured extraction fields have a value. Each
+        step's extraction is an LLM call of its own, so this trades some extra calls for early results.
+        
+        Args:
+            num_steps: Maximum number of discussion steps
+            
+        Yields:
+            Dictionary containing the results extracted so far
+        """
+        # Broadcast situation if set
+        if self.situation:
+            self.world.broadcast(self.situation)
+
+        for _ in range(num_steps):
+            self.world.run(1)
+            partial_results = self.get_results()
+            yield partial_results
+            if self._extraction_complete(partial_results):
+                break
+    
     def save_results(self, results: Dict[str, Any], output_file: str):
         """Save results to file and database"""
         # Save to file
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        output_dir = os.path.dirname(output_file)
+        if output_dir and output_dir not in _created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_dirs.add(output_dir)
+        data = orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            f.write(data)
             
-        # Save to databases with metadata
+        # Queue for the databases with metadata
         metadata = self.prepare_metadata()
-        self.db_manager.store_data(results, metadata)
+        with GroupDiscussion._pending_writes_lock:
+            GroupDiscussion._pending_writes.append((self.db_manager, results, metadata))
+            batch_full = len(GroupDiscussion._pending_writes) >= GroupDiscussion._batch_size
+        if batch_full:
+            GroupDiscussion.flush_pending_writes()
+        
+        print(f"Results saved to {output_file} and queued for the databases")
+
+    @classmethod
+    def flush_pending_writes(cls):
+        """Store all the queued results in the databases, one batch per database manager"""
+        with GroupDiscussion._pending_writes_lock:
+            pending = GroupDiscussion._pending_writes[:]
+            GroupDiscussion._pending_writes.clear()
+            
+        batches: Dict[int, Tuple[DatabaseManager, List[Tuple[Dict[str, Any], Dict[str, Any]]]]] = {}
+        for db_manager, results, metadata in pending:
+            batches.setdefault(id(db_manager), (db_manager, []))[1].append((results, metadata))
+        for db_manager, rows in batches.values():
+            db_manager.store_data_batch(rows)
+
+def run_many(discussions: List[GroupDiscussion],
+             num_steps: int = 3,
+             reduce_results: bool = False,
+             max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+    """Run independent discussions concurrently, as they mostly wait on the LLM
+    
+    Args:
+        discussions: Discussions to run, each owning its agents and world
+        num_steps: Number of discussion steps
+        reduce_results: Whether to reduce results from multiple agents
+        max_workers: Maximum number of discussions running at the same time, one at a time
+            while TinyTroupe's API cache or a simulation is in use (see agent_concurrency)
         
-        print(f"Results saved to {output_file} and stored in databases")
+    Returns:
+        Dictionary mapping each discussion name to its extracted results
+    """
+    with ThreadPoolExecutor(max_workers=agent_concurrency(max_workers)) as executor:
+        futures = {
+            executor.submit(discussion.run_discussion, num_steps, reduce_results): discussion
+            for discussion in discussions
+        }
+        return {futures[future].discussion_name: future.result() for future in as_completed(futures)}
+
+# Queued results are stored when the interpreter exits
+atexit.register(GroupDiscussion.flush_pending_writes)
 
 class ApartmentAdDiscussion(GroupDiscussion):
     """Specialized discussion for creating apartment advertisements"""
@@ -225,7 +556,7 @@ class ApartmentAdDiscussion(GroupDiscussion):
         """)
         
         self.add_context("apartment_description", apartment_description)
-        self.world.broadcast(apartment_description)
+        self.broadcast(apartment_description)
         
         self.configure_extraction(
             objective="Compose an advertisement copy based on the ideas given.",
@@ -259,12 +590,20 @@ class ProductBrainstormingDiscussion(GroupDiscussion):
             rapporteur_name=f"Lisa_{self.discussion_name}"
         )
 
+@lru_cache(maxsize=32)
+def _get_factory(company_context: str) -> TinyPersonFactory:
+    """
+    Get the agent factory of a company context. Interviews sharing a company context share its
+    factory, which remembers the personas it generated, so they also never get the same persona twice.
+    """
+    return TinyPersonFactory(company_context)
+
 class CustomerInterviewDiscussion(GroupDiscussion):
     """Specialized discussion for customer interviews"""
     
     def __init__(self, company_context: str, customer_profile: str):
-        # Create a custom factory for generating agents
-        factory = TinyPersonFactory(company_context)
+        # Get the factory generating agents for this company
+        factory = _get_factory(company_context)
         
         # Call parent class constructor with all required arguments
         super().__init__(
@@ -291,6 +630,11 @@ class CustomerInterviewDiscussion(GroupDiscussion):
             fields=["pain_points", "needs", "suggestions"]
         )
 
+@lru_cache(maxsize=128)
+def _format_ads(ads: Tuple[str, ...]) -> str:
+    """Format numbered ads for discussion, remembering the ad sets formatted recently"""
+    return "\n\n".join(f"Ad {i+1}:\n{ad}" for i, ad in enumerate(ads))
+
 class AdEvaluationDiscussion(GroupDiscussion):
     """Specialized discussion for evaluating advertisements"""
     
@@ -305,7 +649,7 @@ class AdEvaluationDiscussion(GroupDiscussion):
         self.add_context("num_ads", len(ads))
         
         # Format ads for discussion
-        ads_text = "\n\n".join([f"Ad {i+1}:\n{ad}" for i, ad in enumerate(ads)])
+        ads_text = _format_ads(tuple(ads))
         self.set_situation(
         f"""
         We are evaluating {len(ads)} different advertisements for {product_type}.
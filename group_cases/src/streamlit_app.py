@@ -4,21 +4,21 @@ Streamlit frontend for the chat interface and analytics.
 import os
 import sys
 from pathlib import Path
-import json
+import orjson
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 # Determine the project root directory
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
-from typing import Dict, Any, List
+import numpy as np
+from typing import Dict, Any, List, Tuple
 import altair as alt
-from textblob import TextBlob
 from group_cases.src.tools.chat_interface import ChatInterface, MessageType
+from group_cases.src.utils.concurrency import agent_concurrency
 from enhanced_group_memory.src.core.characters import (
     Character, 
     CharacterGroup,
@@ -30,6 +30,18 @@ from enhanced_group_memory.src.core.discussion import (
     DiscussionType
 )
 
+# Number of most recent messages shown in the chat history
+MAX_VISIBLE_MESSAGES = 200
+
+# Maximum number of character responses generated concurrently
+MAX_CONCURRENT_RESPONSES = 8
+
+# Creators of the available characters, by short name
+CHARACTER_CREATORS = {
+    'Lisa': create_lisa_the_data_scientist,
+    'Oscar': create_oscar_the_architect
+}
+
 def init_session_state():
     """Initialize session state variables."""
     if 'discussion' not in st.session_state:
@@ -53,12 +65,9 @@ def init_session_state():
     if 'discussion_obj' not in st.session_state:
         st.session_state.discussion_obj = None
     
-    # Initialize available characters
-    if 'character_creators' not in st.session_state:
-        st.session_state.character_creators = {
-            'Lisa': create_lisa_the_data_scientist,
-            'Oscar': create_oscar_the_architect
-        }
+    # Characters of this session, created once selected
+    if 'characters' not in st.session_state:
+        st.session_state.characters = {}
     
     # Initialize scenarios
     if 'scenarios' not in st.session_state:
@@ -73,28 +82,53 @@ def init_session_state():
             }
         }
 
-def analyze_sentiment(text: str) -> float:
-    """Analyze sentiment of text using TextBlob."""
-    blob = TextBlob(text)
-    return blob.sentiment.polarity
+def get_character(short_name: str) -> Character:
+    """
+    Get an available character by its short name. Characters are created once per session, since
+    creating their agents is expensive and their memories must not be shared with other sessions.
+    """
+    characters = st.session_state.characters
+    if short_name not in characters:
+        characters[short_name] = CHARACTER_CREATORS[short_name]()
+    return characters[short_name]
 
-def render_message(message: Any):
-    """Render a chat message."""
-    with st.container():
-        col1, col2 = st.columns([1, 4])
-        with col1:
-            st.write(f"**{message.sender}**")
-            st.caption(message.timestamp.strftime("%H:%M:%S"))
-        with col2:
-            st.markdown(message.content)
-            sentiment = analyze_sentiment(message.content)
-            sentiment_color = "🟢" if sentiment > 0 else "🔴" if sentiment < 0 else "⚪"
-            st.caption(f"Sentiment: {sentiment_color} ({sentiment:.2f})")
-            if message.reactions:
-                reaction_text = " | ".join(
-                    [f"{r} ({len(users)})" for r, users in message.reactions.items()]
-                )
-                st.caption(f"Reactions: {reaction_text}")
+@st.cache_resource
+def get_character_labels() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Get the short display names and the occupations of the available characters, by full name.
+    They are the same for all sessions, so the characters are only created once to read them.
+    """
+    display_names = {}
+    character_info = {}
+    for short_name, creator in CHARACTER_CREATORS.items():
+        character = creator()
+        display_names[character.name] = short_name
+        character_info[character.name] = character.occupation
+    return display_names, character_info
+
+def render_chat_history(messages: List[Any], display_names: Dict[str, str], character_info: Dict[str, str]):
+    """
+    Render the most recent chat messages as a single Markdown block, rather than with several
+    Streamlit components per message. The Markdown of each message is kept in the session, so
+    a rerun only formats the messages added since the previous one.
+    """
+    rendered = st.session_state.get('rendered_history')
+    if rendered is None or rendered['messages'] is not messages or rendered['count'] > len(messages):
+        rendered = st.session_state.rendered_history = {'messages': messages, 'count': 0, 'parts': []}
+
+    parts = rendered['parts']
+    for message in messages[rendered['count']:]:
+        if message.sender in display_names:
+            parts.append(f"**{display_names[message.sender]}** ({character_info[message.sender]}):\n\n{message.content}")
+        else:
+            parts.append(f"**{message.sender}**:\n\n{message.content}")
+    rendered['count'] = len(messages)
+
+    hidden = len(parts) - MAX_VISIBLE_MESSAGES
+    if hidden > 0:
+        st.caption(f"{hidden} earlier messages are not shown.")
+    if parts:
+        st.markdown("\n\n---\n\n".join(parts[-MAX_VISIBLE_MESSAGES:]))
 
 def render_results():
     """Render discussion results."""
@@ -123,18 +157,50 @@ def render_results():
         with result_tabs[2]:
             st.download_button(
                 "Download Results (JSON)",
-                data=json.dumps(results, indent=2),
+                data=orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS),
                 file_name=f"discussion_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
 
+def get_cached_analytics(chat_interface: Any) -> Dict[str, Any]:
+    """
+    Get the analytics of a chat, recomputing them only once messages or reactions were added
+    since the last rerun that computed them.
+    """
+    messages = chat_interface.messages
+    version = (
+        id(chat_interface),
+        len(messages),
+        sum(len(users) for message in messages for users in message.reactions.values())
+    )
+    cached = st.session_state.get("analytics_cache")
+    if cached is None or cached[0] != version:
+        cached = (version, chat_interface.get_analytics())
+        st.session_state.analytics_cache = cached
+    return cached[1]
+
+@st.cache_data
+def _interaction_heatmap(pairs: Tuple[Tuple[str, str, int], ...]) -> alt.Chart:
+    """
+    Build the interaction heatmap of (sender, receiver, count) pairs. Only the pairs that
+    interacted are sent to the browser, rather than a full sender by receiver matrix.
+    """
+    interaction_df = pd.DataFrame(list(pairs), columns=["From", "To", "Count"])
+    return alt.Chart(interaction_df, title="Interaction Heatmap").mark_rect().encode(
+        x=alt.X("To:N", sort="ascending"),
+        y=alt.Y("From:N", sort="ascending"),
+        color=alt.Color("Count:Q", title="Interactions"),
+        tooltip=["From", "To", "Count"]
+    )
+
+@st.fragment
 def render_analytics_dashboard():
-    """Render analytics dashboard."""
+    """Render analytics dashboard, as a fragment of its own."""
     if not st.session_state.discussion_obj:
         st.warning("Start a discussion to see analytics.")
         return
         
-    analytics = st.session_state.discussion_obj.chat_interface.get_analytics()
+    analytics = get_cached_analytics(st.session_state.discussion_obj.chat_interface)
     
     # Create tabs for different analytics views
     analytics_tabs = st.tabs(["Overview", "Sentiment Analysis", "Topic Evolution", "Interaction Network"])
@@ -157,10 +223,10 @@ def render_analytics_dashboard():
         # Convert participation data to DataFrame
         messages_per_user = analytics.get("messages_per_user", {})
         if messages_per_user:
-            participation_df = pd.DataFrame([
-                {"User": user, "Messages": count}
-                for user, count in messages_per_user.items()
-            ])
+            participation_df = pd.DataFrame({
+                "User": list(messages_per_user),
+                "Messages": np.fromiter(messages_per_user.values(), dtype=np.int64, count=len(messages_per_user))
+            })
             st.bar_chart(participation_df.set_index("User"))
         else:
             st.info("No messages yet.")
@@ -169,13 +235,13 @@ def render_analytics_dashboard():
         st.subheader("Sentiment Analysis")
         topic_evolution = analytics.get("topic_evolution", {}).get("windows", [])
         if topic_evolution:
-            sentiment_df = pd.DataFrame([
-                {
-                    "Time": window["timestamp_start"],
-                    "Sentiment": 1 if window["sentiment"] == "positive" else -1
-                }
-                for window in topic_evolution
-            ])
+            sentiment_df = pd.DataFrame({
+                "Time": [window["timestamp_start"] for window in topic_evolution],
+                "Sentiment": np.fromiter(
+                    (1 if window["sentiment"] == "positive" else -1 for window in topic_evolution),
+                    dtype=np.int64, count=len(topic_evolution)
+                )
+            })
             if not sentiment_df.empty:
                 st.line_chart(sentiment_df.set_index("Time"))
         else:
@@ -185,14 +251,11 @@ def render_analytics_dashboard():
         st.subheader("Topic Evolution")
         topic_evolution = analytics.get("topic_evolution", {}).get("windows", [])
         if topic_evolution:
-            topic_df = pd.DataFrame([
-                {
-                    "Time": window["timestamp_start"],
-                    "Topics": ", ".join(list(window["key_terms"].keys())[:3]),
-                    "Sentiment": window["sentiment"]
-                }
-                for window in topic_evolution
-            ])
+            topic_df = pd.DataFrame({
+                "Time": [window["timestamp_start"] for window in topic_evolution],
+                "Topics": [", ".join(list(window["key_terms"])[:3]) for window in topic_evolution],
+                "Sentiment": [window["sentiment"] for window in topic_evolution]
+            })
             
             if not topic_df.empty:
                 st.dataframe(topic_df)
@@ -203,72 +266,150 @@ def render_analytics_dashboard():
         st.subheader("Interaction Network")
         interactions = analytics.get("interaction_patterns", {}).get("interaction_matrix", {})
         if interactions and len(interactions) > 1:  # Need at least 2 users for interactions
-            interaction_df = pd.DataFrame([
-                {
-                    "From": user1,
-                    "To": user2,
-                    "Count": count
-                }
+            pairs = tuple(
+                (user1, user2, count)
                 for user1, targets in interactions.items()
                 for user2, count in targets.items()
-            ])
+            )
             
-            if not interaction_df.empty:
+            if pairs:
                 # Create a heatmap of interactions
-                pivot_df = interaction_df.pivot(index="From", columns="To", values="Count").fillna(0)
-                fig = px.imshow(
-                    pivot_df,
-                    labels=dict(x="To", y="From", color="Interactions"),
-                    title="Interaction Heatmap"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.altair_chart(_interaction_heatmap(pairs), use_container_width=True)
         else:
             st.info("Not enough interactions to display network.")
 
-def main():
-    """Main Streamlit app."""
-    st.title("Enhanced Group Discussion")
-    init_session_state()
+def generate_responses(prompt: str) -> List[Tuple[Character, str]]:
+    """
+    Get the responses of the selected characters to a prompt, in the characters' order. The
+    (IO-bound) LLM calls are made concurrently, so every character answers the same discussion state,
+    unless TinyTroupe's API cache or a simulation is in use (see agent_concurrency).
+    """
+    characters = st.session_state.selected_characters
+    if not characters:
+        return []
 
-    # Character selection
-    st.sidebar.header("Select Characters")
+    character_group = st.session_state.character_group
+    discussion = st.session_state.discussion_obj
+    with ThreadPoolExecutor(max_workers=agent_concurrency(min(len(characters), MAX_CONCURRENT_RESPONSES))) as executor:
+        responses = list(executor.map(
+            lambda char: character_group._generate_character_response(char, prompt, discussion),
+            characters
+        ))
+    return list(zip(characters, responses))
+
+@st.fragment
+def render_discussion(display_names: Dict[str, str], character_info: Dict[str, str]):
+    """
+    Render the discussion area. It is a fragment, so sending a message or continuing the
+    discussion only reruns this area rather than the whole app.
+    """
+    st.subheader(f"Discussion: {st.session_state.topic}")
     
-    # Create character instances with unique IDs
-    available_characters = st.session_state.character_creators
+    # Display messages from chat history
+    render_chat_history(st.session_state.discussion_obj.chat_interface.messages, display_names, character_info)
     
-    # Store original names for display
-    display_names = {}
-    character_info = {}
+    # Add continue button
+    continue_chat = st.button("Continue Discussion")
     
-    # Create characters once to get their full names and info
-    for short_name, creator_func in available_characters.items():
-        character = creator_func()
-        display_names[character.name] = short_name
-        character_info[character.name] = character.occupation
+    # Add user input
+    user_input = st.chat_input("Your message")
     
-    selected_chars = st.sidebar.multiselect(
-        "Choose characters for the discussion:",
-        options=list(available_characters.keys()),
-        default=[]
-    )
+    if continue_chat:
+        # Generate a continuation prompt based on the discussion context
+        last_messages = st.session_state.discussion_obj.chat_interface.messages[-3:]
+        context = "\n".join([f"{msg.sender}: {msg.content}" for msg in last_messages])
+        continuation_prompt = f"Based on the recent discussion:\n{context}\n\nPlease continue the conversation."
+        
+        # Get responses from characters
+        for char, response in generate_responses(continuation_prompt):
+            display_name = display_names.get(char.name, char.name)
+            with st.chat_message(display_name.lower()):
+                st.write(f"**{display_name}** ({char.occupation}):")
+                if response:
+                    st.write(response)
+                    # Add character response to discussion
+                    st.session_state.discussion_obj.chat_interface.add_message(
+                        sender=char.name,
+                        content=response,
+                        msg_type=MessageType.TEXT
+                    )
+                else:
+                    st.error("No response generated")
+        
+        st.rerun(scope="fragment")
     
-    # Update selected characters
-    st.session_state.selected_characters = [
-        available_characters[char_name]() for char_name in selected_chars
-    ]
+    if user_input:
+        # Add user message to discussion
+        st.session_state.discussion_obj.chat_interface.add_message(
+            sender="User",
+            content=user_input,
+            msg_type=MessageType.TEXT
+        )
+        
+        # Display user message
+        with st.chat_message("user"):
+            st.write(user_input)
+        
+        # Get responses from characters
+        for char, response in generate_responses(user_input):
+            display_name = display_names.get(char.name, char.name)
+            with st.chat_message(display_name.lower()):
+                st.write(f"**{display_name}** ({char.occupation}):")
+                if response:
+                    st.write(response)
+                    # Add character response to discussion
+                    st.session_state.discussion_obj.chat_interface.add_message(
+                        sender=char.name,
+                        content=response,
+                        msg_type=MessageType.TEXT
+                    )
+                else:
+                    st.error("No response generated")
+            
+            # Optional: Show character's recent memory for debugging
+            if st.checkbox("Show Character Memory", key=f"show_memory_{char.name}"):
+                with st.expander(f"{char.name}'s Recent Memory"):
+                    recent_memory = char.tiny_person.episodic_memory.retrieve_recent()
+                    for memory in recent_memory:
+                        st.write(memory)
+
+
+def main():
+    """Main Streamlit app."""
+    st.title("Enhanced Group Discussion")
+    init_session_state()
+
+    # Original names and occupations for display
+    display_names, character_info = get_character_labels()
     
-    # Discussion topic and start button
-    st.sidebar.header("Discussion")
     if 'topic' not in st.session_state:
         st.session_state.topic = ""
     if 'discussion_obj' not in st.session_state:
         st.session_state.discussion_obj = None
+    
+    # Character selection, discussion topic and start button. They are in a form, so changing
+    # the selection doesn't rerun the app until the discussion is started
+    with st.sidebar.form("discussion_setup"):
+        st.header("Select Characters")
+        selected_chars = st.multiselect(
+            "Choose characters for the discussion:",
+            options=list(CHARACTER_CREATORS),
+            default=[]
+        )
         
-    scenario = st.sidebar.selectbox("Select a scenario", list(st.session_state.scenarios.keys()))
+        st.header("Discussion")
+        scenario = st.selectbox("Select a scenario", list(st.session_state.scenarios.keys()))
+        start_discussion = st.form_submit_button("Start Discussion")
+    
+    # Update selected characters
+    st.session_state.selected_characters = [
+        get_character(char_name) for char_name in selected_chars
+    ]
+    
     topic = st.session_state.scenarios[scenario]["topic"]
     initial_prompt = st.session_state.scenarios[scenario]["prompt"]
     
-    if st.sidebar.button("Start Discussion") and len(selected_chars) > 0 and topic and initial_prompt:
+    if start_discussion and len(selected_chars) > 0 and topic and initial_prompt:
         # Create character group and discussion object
         st.session_state.character_group = CharacterGroup(st.session_state.selected_characters)
         st.session_state.topic = topic
@@ -288,98 +429,10 @@ def main():
         )
         
         st.session_state.discussion_started = True
-        st.experimental_rerun()
     
     # Show discussion area if started
     if st.session_state.discussion_started and st.session_state.character_group:
-        st.subheader(f"Discussion: {st.session_state.topic}")
-        
-        # Display messages from chat history
-        for message in st.session_state.discussion_obj.chat_interface.messages:
-            sender = message.sender
-            if sender in display_names:
-                sender = display_names[sender]
-            with st.chat_message(sender.lower()):
-                if sender in display_names:
-                    st.write(f"**{sender}** ({character_info[sender]}):")
-                st.write(message.content)
-        
-        # Add continue button
-        continue_chat = st.button("Continue Discussion")
-        
-        # Add user input
-        user_input = st.chat_input("Your message")
-        
-        if continue_chat:
-            # Generate a continuation prompt based on the discussion context
-            last_messages = st.session_state.discussion_obj.chat_interface.messages[-3:]
-            context = "\n".join([f"{msg.sender}: {msg.content}" for msg in last_messages])
-            continuation_prompt = f"Based on the recent discussion:\n{context}\n\nPlease continue the conversation."
-            
-            # Get responses from characters
-            for char in st.session_state.selected_characters:
-                response = st.session_state.character_group._generate_character_response(
-                    char, 
-                    continuation_prompt,
-                    st.session_state.discussion_obj
-                )
-                
-                display_name = display_names.get(char.name, char.name)
-                with st.chat_message(display_name.lower()):
-                    st.write(f"**{display_name}** ({char.occupation}):")
-                    if response:
-                        st.write(response)
-                        # Add character response to discussion
-                        st.session_state.discussion_obj.chat_interface.add_message(
-                            sender=char.name,
-                            content=response,
-                            msg_type=MessageType.TEXT
-                        )
-                    else:
-                        st.error("No response generated")
-            
-            st.experimental_rerun()
-        
-        if user_input:
-            # Add user message to discussion
-            st.session_state.discussion_obj.chat_interface.add_message(
-                sender="User",
-                content=user_input,
-                msg_type=MessageType.TEXT
-            )
-            
-            # Display user message
-            with st.chat_message("user"):
-                st.write(user_input)
-            
-            # Get responses from characters
-            for char in st.session_state.selected_characters:
-                response = st.session_state.character_group._generate_character_response(
-                    char, 
-                    user_input,
-                    st.session_state.discussion_obj
-                )
-                
-                display_name = display_names.get(char.name, char.name)
-                with st.chat_message(display_name.lower()):
-                    st.write(f"**{display_name}** ({char.occupation}):")
-                    if response:
-                        st.write(response)
-                        # Add character response to discussion
-                        st.session_state.discussion_obj.chat_interface.add_message(
-                            sender=char.name,
-                            content=response,
-                            msg_type=MessageType.TEXT
-                        )
-                    else:
-                        st.error("No response generated")
-                
-                # Optional: Show character's recent memory for debugging
-                if st.sidebar.checkbox("Show Character Memory", key=f"show_memory_{char.name}"):
-                    with st.expander(f"{char.name}'s Recent Memory"):
-                        recent_memory = char.tiny_person.episodic_memory.retrieve_recent()
-                        for memory in recent_memory:
-                            st.write(memory)
+        render_discussion(display_names, character_info)
     
     # Show analytics if discussion has started
     if st.session_state.discussion_started:
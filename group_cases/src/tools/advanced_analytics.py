@@ -1,119 +1,286 @@
 """
 Advanced analytics module for discussion analysis.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
+import copy
+import warnings
+from dataclasses import dataclass
 import numpy as np
-from collections import defaultdict
+import orjson
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from ..tools.word_processor import WordProcessor
+from ..tools.word_processor import WordProcessor, POSITIVE_WORDS, NEGATIVE_WORDS
+from ..utils.response_cache import ResponseCache
+
+# Messages sent within this time after a message count as responses to it
+RESPONSE_WINDOW = timedelta(minutes=5)
+
+@dataclass(frozen=True)
+class _MessageColumns:
+    """
+    The messages of a discussion stored as columns, built once and shared by all the analyses,
+    instead of each analysis looking up (and parsing) the fields of every message dict again.
+    """
+    senders: np.ndarray  # Names of the senders (objects)
+    contents: List[str]
+    timestamps: List[str]  # As given, to report them
+    times: List[datetime]
+    elapsed: np.ndarray  # Microseconds since the first message (int64), so time differences are exact
+    tokens: List[Tuple[str, ...]]
+    words: List[FrozenSet[str]]
+    # Each distinct word of each message, coded as message index * vocabulary_size + word id, sorted
+    word_keys: np.ndarray
+    vocabulary_size: int
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def common_word_counts(self, k: int) -> np.ndarray:
+        """Get the number of words each message has in common with the message k positions after it."""
+        n = len(self)
+        if not self.vocabulary_size:
+            return np.zeros(max(0, n - k), dtype=np.int64)
+            
+        # A word of message i is also in message i+k if its key shifted by k messages is a key too
+        in_both = np.isin(self.word_keys + k * self.vocabulary_size, self.word_keys, assume_unique=True)
+        owners = self.word_keys[in_both] // self.vocabulary_size
+        return np.bincount(owners, minlength=n)[:max(0, n - k)]
 
 class DiscussionAnalytics:
     """Advanced analytics for discussion analysis."""
     
-    def __init__(self):
-        """Initialize analytics engine."""
+    def __init__(self, cache_file: Optional[str] = None, max_cached: int = 32):
+        """
+        Initialize analytics engine.
+        
+        Args:
+            cache_file: Optional path where the analyses are persisted across runs
+            max_cached: Maximum number of analyses kept, the least recently used ones are evicted first
+        """
         self.word_processor = WordProcessor()
+        self._cache = ResponseCache(cache_file=cache_file, max_entries=max_cached)
         
     def analyze_discussion_dynamics(
         self,
-        messages: List[Dict[str, Any]]
+        messages: List[Dict[str, Any]],
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze discussion dynamics and patterns.
         
         Args:
             messages: List of discussion messages
+            use_cache: Whether to return the analysis of identical messages analyzed before
             
         Returns:
             Analysis results
         """
-        return {
-            "participation_metrics": self._analyze_participation(messages),
-            "interaction_patterns": self._analyze_interactions(messages),
-            "topic_evolution": self._analyze_topic_evolution(messages),
-            "engagement_metrics": self._analyze_engagement(messages),
-            "discussion_flow": self._analyze_discussion_flow(messages)
-        }
+        if not use_cache:
+            return self._analyze_dynamics(messages)
+            
+        key = ResponseCache.make_key(orjson.dumps(
+            messages,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str
+        ).decode())
+        results = self._cache.get(key)
+        if results is None:
+            results = self._analyze_dynamics(messages)
+            self._cache.put(key, results)
+            self._cache.save()
+            
+        return copy.deepcopy(results)
         
-    def _analyze_participation(
+    def _analyze_dynamics(
         self,
         messages: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Analyze participation patterns."""
-        participant_stats = defaultdict(lambda: {
-            "message_count": 0,
-            "total_words": 0,
-            "avg_message_length": 0,
-            "response_times": [],
-            "active_periods": []
-        })
+        """Analyze discussion dynamics and patterns, without the cache."""
+        columns = self._message_columns(messages)
+
+        return {
+            "participation_metrics": self._analyze_participation(columns),
+            "interaction_patterns": self._analyze_interactions(columns),
+            "topic_evolution": self._analyze_topic_evolution(columns),
+            "engagement_metrics": self._analyze_engagement(columns),
+            "discussion_flow": self._analyze_discussion_flow(columns)
+        }
+
+    def batch_sentiment(self, texts: List[str]) -> np.ndarray:
+        """
+        Analyze the sentiment of many texts at once.
         
-        last_message_time = None
-        for msg in messages:
-            sender = msg["sender"]
-            timestamp = datetime.fromisoformat(msg["timestamp"])
-            content = msg["content"]
-            
-            # Update basic stats
-            participant_stats[sender]["message_count"] += 1
-            words = len(content.split())
-            participant_stats[sender]["total_words"] += words
+        Args:
+            texts: Texts to analyze
             
-            # Track response times
-            if last_message_time:
-                response_time = (timestamp - last_message_time).total_seconds()
-                participant_stats[sender]["response_times"].append(response_time)
-            last_message_time = timestamp
+        Returns:
+            Polarity of each text, between -1 and 1: the balance of its distinct
+            positive and negative sentiment indicator words
+        """
+        words = [frozenset(self.word_processor._tokenize(text)) for text in texts]
+        
+        # All the words in a single array, with the index of the text they belong to
+        lengths = np.fromiter((len(text_words) for text_words in words), dtype=np.int64, count=len(words))
+        all_words = np.array([word for text_words in words for word in text_words], dtype=str)
+        owners = np.repeat(np.arange(len(words)), lengths)
+        
+        positive = np.bincount(owners, weights=np.isin(all_words, list(POSITIVE_WORDS)), minlength=len(words))
+        negative = np.bincount(owners, weights=np.isin(all_words, list(NEGATIVE_WORDS)), minlength=len(words))
+        return (positive - negative) / np.maximum(positive + negative, 1)
+
+    def _message_columns(
+        self,
+        messages: List[Dict[str, Any]]
+    ) -> _MessageColumns:
+        """Get the columns of the messages, parsing their timestamps and tokenizing their contents once."""
+        contents = [msg["content"] for msg in messages]
+        times, elapsed = self._parse_timestamps([msg["timestamp"] for msg in messages])
+        tokens = [self.word_processor._tokenize(content) for content in contents]
+        
+        senders = np.empty(len(messages), dtype=object)
+        senders[:] = [msg["sender"] for msg in messages]
+        
+        # Integer codes of the words, to compare the words of many messages at once
+        words = [frozenset(message_tokens) for message_tokens in tokens]
+        vocabulary: Dict[str, int] = {}
+        word_ids = [
+            vocabulary.setdefault(word, len(vocabulary))
+            for message_words in words
+            for word in message_words
+        ]
+        owners = np.repeat(np.arange(len(words)), [len(message_words) for message_words in words])
+        word_keys = np.sort(owners * len(vocabulary) + np.array(word_ids, dtype=np.int64))
+        
+        return _MessageColumns(
+            senders=senders,
+            contents=contents,
+            timestamps=[msg["timestamp"] for msg in messages],
+            times=times,
+            elapsed=elapsed,
+            tokens=tokens,
+            words=words,
+            word_keys=word_keys,
+            vocabulary_size=len(vocabulary)
+        )
+        
+    def _parse_timestamps(self, timestamps: List[str]) -> Tuple[List[datetime], np.ndarray]:
+        """
+        Parse ISO timestamps, all at once as datetime64 when they have no timezone.
+        
+        Returns:
+            The parsed datetimes, and the microseconds elapsed since the first one
+        """
+        try:
+            with warnings.catch_warnings():
+                # NumPy only warns about timezones, converting them to UTC
+                warnings.simplefilter("error")
+                parsed = np.array(timestamps, dtype="datetime64[us]")
+        except (ValueError, UserWarning):
+            times = [datetime.fromisoformat(timestamp) for timestamp in timestamps]
+            return times, np.array(
+                [(t - times[0]) // timedelta(microseconds=1) for t in times],
+                dtype=np.int64
+            )
             
-            # Track active periods
-            participant_stats[sender]["active_periods"].append(timestamp)
+        elapsed = (parsed - parsed[0]).astype(np.int64) if len(parsed) else np.zeros(0, dtype=np.int64)
+        return parsed.astype(object).tolist(), elapsed
+        
+    def _analyze_participation(
+        self,
+        columns: _MessageColumns
+    ) -> Dict[str, Any]:
+        """Analyze participation patterns."""
+        if not len(columns):
+            return {}
             
-        # Calculate averages and activity patterns
-        for participant in participant_stats.values():
-            if participant["message_count"] > 0:
-                participant["avg_message_length"] = (
-                    participant["total_words"] / participant["message_count"]
-                )
-            if participant["response_times"]:
-                participant["avg_response_time"] = (
-                    sum(participant["response_times"]) /
-                    len(participant["response_times"])
-                )
+        elapsed = columns.elapsed
+        word_counts = np.array([len(content.split()) for content in columns.contents])
+        
+        # Group the messages by sender, in order of first participation
+        senders, first_index, codes = np.unique(
+            columns.senders,
+            return_index=True,
+            return_inverse=True
+        )
+        participation_order = np.argsort(first_index)
+        group_of = np.empty_like(participation_order)
+        group_of[participation_order] = np.arange(len(senders))
+        codes = group_of[codes.ravel()]
+        num_senders = len(senders)
+        
+        message_counts = np.bincount(codes, minlength=num_senders)
+        total_words = np.bincount(codes, weights=word_counts, minlength=num_senders)
+        
+        # The response time of a message is the time since the previous one
+        response_times = np.diff(elapsed) / 1e6
+        response_codes = codes[1:]
+        response_counts = np.bincount(response_codes, minlength=num_senders)
+        response_totals = np.bincount(response_codes, weights=response_times, minlength=num_senders)
+        
+        first_active = np.full(num_senders, np.iinfo(np.int64).max)
+        last_active = np.full(num_senders, np.iinfo(np.int64).min)
+        np.minimum.at(first_active, codes, elapsed)
+        np.maximum.at(last_active, codes, elapsed)
+        
+        # Per-sender lists of response times and activity timestamps, in message order
+        by_sender = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(message_counts)[:-1]
+        response_by_sender = np.argsort(response_codes, kind="stable")
+        response_bounds = np.cumsum(response_counts)[:-1]
+        
+        participant_stats = {}
+        for k, (message_indices, response_indices) in enumerate(zip(
+            np.split(by_sender, bounds),
+            np.split(response_by_sender, response_bounds)
+        )):
+            stats = {
+                "message_count": int(message_counts[k]),
+                "total_words": int(total_words[k]),
+                "avg_message_length": float(total_words[k] / message_counts[k]),
+                "response_times": response_times[response_indices].tolist(),
+                "active_periods": [columns.times[i] for i in message_indices]
+            }
+            if response_counts[k]:
+                stats["avg_response_time"] = float(response_totals[k] / response_counts[k])
+            stats["activity_duration"] = int(last_active[k] - first_active[k]) / 1e6 / 3600  # in hours
+            participant_stats[senders[participation_order[k]]] = stats
             
-            # Calculate activity patterns
-            times = participant["active_periods"]
-            if times:
-                participant["activity_duration"] = (
-                    (max(times) - min(times)).total_seconds() / 3600
-                )  # in hours
-                
-        return dict(participant_stats)
+        return participant_stats
         
     def _analyze_interactions(
         self,
-        messages: List[Dict[str, Any]]
+        columns: _MessageColumns
     ) -> Dict[str, Any]:
         """Analyze interaction patterns between participants."""
         interaction_matrix = defaultdict(lambda: defaultdict(int))
         reference_patterns = defaultdict(list)
+        if not len(columns):
+            return {"interaction_matrix": {}, "reference_patterns": {}}
         
-        for i, msg in enumerate(messages):
-            sender = msg["sender"]
-            content = msg["content"].lower()
-            
-            # Look for direct mentions or references
-            for prev_msg in messages[max(0, i-5):i]:
-                prev_sender = prev_msg["sender"]
-                if prev_sender != sender and (
-                    prev_sender.lower() in content or
-                    self._has_reference(content, prev_msg["content"])
-                ):
-                    interaction_matrix[sender][prev_sender] += 1
-                    reference_patterns[sender].append({
-                        "referenced": prev_sender,
-                        "context": content,
-                        "timestamp": msg["timestamp"]
-                    })
+        senders = columns.senders
+        senders_lower = np.char.lower(senders.astype(str))
+        contents_lower = [content.lower() for content in columns.contents]
+        contents_array = np.array(contents_lower)
+        
+        # Look for direct mentions or references (at least 3 common words) of the previous
+        # 5 messages, comparing all the messages with the one k messages before them at once
+        references = []
+        for k in range(1, min(6, len(columns))):
+            other_sender = senders[k:] != senders[:-k]
+            mentioned = np.char.find(contents_array[k:], senders_lower[:-k]) >= 0
+            shares_words = columns.common_word_counts(k) >= 3
+            for i in np.flatnonzero(other_sender & (mentioned | shares_words)) + k:
+                references.append((int(i), int(i-k)))
+        
+        for i, j in sorted(references):
+            sender = senders[i]
+            prev_sender = senders[j]
+            interaction_matrix[sender][prev_sender] += 1
+            reference_patterns[sender].append({
+                "referenced": prev_sender,
+                "context": contents_lower[i],
+                "timestamp": columns.timestamps[i]
+            })
                     
         return {
             "interaction_matrix": dict(interaction_matrix),
@@ -122,30 +289,28 @@ class DiscussionAnalytics:
         
     def _analyze_topic_evolution(
         self,
-        messages: List[Dict[str, Any]]
+        columns: _MessageColumns
     ) -> Dict[str, Any]:
         """Analyze how topics evolve throughout the discussion."""
         # Split discussion into time windows
-        window_size = max(1, len(messages) // 4)  # 4 windows minimum
-        windows = [
-            messages[i:i+window_size]
-            for i in range(0, len(messages), window_size)
-        ]
+        window_size = max(1, len(columns) // 4)  # 4 windows minimum
         
         topic_evolution = []
-        for window in windows:
-            combined_text = " ".join(msg["content"] for msg in window)
+        for start in range(0, len(columns), window_size):
+            end = min(start + window_size, len(columns))
+            combined_text = " ".join(columns.contents[start:end])
+            
+            # The words of a window are those of its messages, already tokenized
+            word_counts = Counter()
+            for message_tokens in columns.tokens[start:end]:
+                word_counts.update(message_tokens)
             
             # Analyze window content
             window_analysis = {
-                "timestamp_start": window[0]["timestamp"],
-                "timestamp_end": window[-1]["timestamp"],
-                "key_terms": self.word_processor._get_keyword_frequency(
-                    self.word_processor._tokenize(combined_text)
-                ),
-                "sentiment": self.word_processor._analyze_sentiment(
-                    combined_text
-                ),
+                "timestamp_start": columns.timestamps[start],
+                "timestamp_end": columns.timestamps[end-1],
+                "key_terms": self.word_processor._get_keyword_frequency(word_counts),
+                "sentiment": self.word_processor._sentiment_of_words(word_counts.keys()),
                 "key_points": self.word_processor.extract_key_points(
                     combined_text,
                     num_points=2
@@ -160,7 +325,7 @@ class DiscussionAnalytics:
         
     def _analyze_engagement(
         self,
-        messages: List[Dict[str, Any]]
+        columns: _MessageColumns
     ) -> Dict[str, Any]:
         """Analyze participant engagement levels."""
         engagement_metrics = defaultdict(lambda: {
@@ -170,18 +335,30 @@ class DiscussionAnalytics:
             "contribution_impact": []
         })
         
+        # The responses to a message are those of the next 5 minutes: find their
+        # bounds in the messages sorted by time, rather than scanning all of them
+        words = columns.words
+        times = columns.elapsed
+        order = np.argsort(times, kind="stable")
+        sorted_times = times[order]
+        window_starts = np.searchsorted(sorted_times, times, side="right")
+        window_ends = np.searchsorted(
+            sorted_times,
+            times + RESPONSE_WINDOW // timedelta(microseconds=1),
+            side="right"
+        )
+        
         # Calculate metrics per participant
-        for msg in messages:
-            sender = msg["sender"]
-            content = msg["content"]
-            
+        for i, (sender, content) in enumerate(zip(columns.senders, columns.contents)):
             # Content richness based on length and unique words
-            words = set(self.word_processor._tokenize(content))
-            richness_score = len(words) / max(1, len(content.split()))
+            richness_score = len(words[i]) / max(1, len(content.split()))
             engagement_metrics[sender]["content_richness"].append(richness_score)
             
             # Contribution impact based on responses
-            impact_score = self._calculate_impact_score(msg, messages)
+            impact_score = self._calculate_impact_score(
+                words[i],
+                [words[j] for j in order[window_starts[i]:window_ends[i]]]
+            )
             engagement_metrics[sender]["contribution_impact"].append(impact_score)
             
         # Calculate time-based metrics
@@ -202,48 +379,51 @@ class DiscussionAnalytics:
         
     def _analyze_discussion_flow(
         self,
-        messages: List[Dict[str, Any]]
+        columns: _MessageColumns
     ) -> Dict[str, Any]:
         """Analyze the flow and coherence of discussion."""
+        # Topic coherence of each message with the previous one: the share of their words
+        # they have in common, or 0 if either has no words
+        sizes = np.array([len(message_words) for message_words in columns.words], dtype=np.int64)
+        common = columns.common_word_counts(1)
+        coherence = np.divide(
+            common,
+            sizes[:-1] + sizes[1:] - common,
+            out=np.zeros(len(common)),
+            where=(sizes[:-1] > 0) & (sizes[1:] > 0)
+        ).tolist()
         flow_metrics = {
-            "topic_coherence": [],
+            "topic_coherence": coherence,
             "turn_taking": [],
             "response_chains": []
         }
+        if len(columns) < 2:
+            return flow_metrics
         
-        for i in range(1, len(messages)):
-            prev_msg = messages[i-1]
-            curr_msg = messages[i]
+        # Analyze turn-taking patterns
+        senders = columns.senders
+        for i in np.flatnonzero(senders[:-1] != senders[1:]) + 1:
+            flow_metrics["turn_taking"].append({
+                "from": senders[i-1],
+                "to": senders[i],
+                "timestamp": columns.timestamps[i]
+            })
             
-            # Analyze topic coherence
-            coherence = self._calculate_coherence(
-                prev_msg["content"],
-                curr_msg["content"]
+        # Track response chains, which need both coherences of three consecutive messages
+        coherent = np.array(coherence) > 0.2
+        for i in np.flatnonzero(coherent[:-1] & coherent[1:]) + 2:
+            chain = self._identify_response_chain(
+                columns,
+                i-2,
+                coherence[i-2:i]
             )
-            flow_metrics["topic_coherence"].append(coherence)
-            
-            # Analyze turn-taking patterns
-            if prev_msg["sender"] != curr_msg["sender"]:
-                flow_metrics["turn_taking"].append({
-                    "from": prev_msg["sender"],
-                    "to": curr_msg["sender"],
-                    "timestamp": curr_msg["timestamp"]
-                })
-                
-            # Track response chains
-            if i >= 2:
-                chain = self._identify_response_chain(
-                    messages[i-2:i+1]
-                )
-                if chain:
-                    flow_metrics["response_chains"].append(chain)
+            if chain:
+                flow_metrics["response_chains"].append(chain)
                     
         return flow_metrics
         
-    def _has_reference(self, text1: str, text2: str) -> bool:
-        """Check if one text references another."""
-        words1 = set(self.word_processor._tokenize(text1))
-        words2 = set(self.word_processor._tokenize(text2))
+    def _has_reference(self, words1: FrozenSet[str], words2: FrozenSet[str]) -> bool:
+        """Check if one text references another, given their words."""
         return len(words1 & words2) >= 3  # At least 3 common words
         
     def _detect_topic_shifts(
@@ -274,61 +454,41 @@ class DiscussionAnalytics:
         
     def _calculate_impact_score(
         self,
-        message: Dict[str, Any],
-        all_messages: List[Dict[str, Any]]
+        words: FrozenSet[str],
+        response_words: List[FrozenSet[str]]
     ) -> float:
-        """Calculate the impact score of a message."""
-        msg_time = datetime.fromisoformat(message["timestamp"])
-        response_count = 0
-        content_similarity = 0
-        
-        # Look at messages within next 5 minutes
-        for msg in all_messages:
-            curr_time = datetime.fromisoformat(msg["timestamp"])
-            if curr_time > msg_time and (
-                curr_time - msg_time
-            ) <= timedelta(minutes=5):
-                response_count += 1
-                if self._has_reference(msg["content"], message["content"]):
-                    content_similarity += 1
+        """
+        Calculate the impact score of a message, given its words and those of
+        the messages sent within RESPONSE_WINDOW after it.
+        """
+        response_count = len(response_words)
+        content_similarity = sum(
+            1 for response in response_words
+            if self._has_reference(response, words)
+        )
                     
         return (response_count + content_similarity) / 2
         
-    def _calculate_coherence(self, text1: str, text2: str) -> float:
-        """Calculate coherence between two messages."""
-        words1 = set(self.word_processor._tokenize(text1))
-        words2 = set(self.word_processor._tokenize(text2))
-        
-        if not words1 or not words2:
-            return 0.0
-            
-        common_words = len(words1 & words2)
-        total_words = len(words1 | words2)
-        
-        return common_words / total_words
-        
     def _identify_response_chain(
         self,
-        messages: List[Dict[str, Any]]
+        columns: _MessageColumns,
+        start: int,
+        coherence_scores: List[float]
     ) -> Optional[Dict[str, Any]]:
-        """Identify a response chain in messages."""
-        if len(messages) < 3:
+        """
+        Identify a response chain in the messages from the given start, given the
+        coherence of each of them with the next one.
+        """
+        if len(coherence_scores) < 2:
             return None
             
         # Check if messages form a coherent chain
-        coherence_scores = [
-            self._calculate_coherence(
-                messages[i]["content"],
-                messages[i+1]["content"]
-            )
-            for i in range(len(messages)-1)
-        ]
-        
+        end = start + len(coherence_scores)
         if all(score > 0.2 for score in coherence_scores):
             return {
-                "participants": [msg["sender"] for msg in messages],
-                "start_time": messages[0]["timestamp"],
-                "end_time": messages[-1]["timestamp"],
+                "participants": columns.senders[start:end+1].tolist(),
+                "start_time": columns.timestamps[start],
+                "end_time": columns.timestamps[end],
                 "coherence_score": sum(coherence_scores) / len(coherence_scores)
             }
             
@@ -1,11 +1,21 @@
 """
 Enhanced chat interface with advanced features.
 """
-from typing import Dict, List, Any, Optional
+import io
+import os
+import re
+from html import escape
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
-import json
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import numpy as np
+import orjson
+
+# Words of the contents, for their frequencies in the topic evolution
+_WORD_RE = re.compile(r"[a-zA-Z']+")
 
 class MessageType(Enum):
     """Types of messages in the chat."""
@@ -16,7 +26,7 @@ class MessageType(Enum):
     THREAD = "thread"
     MEDIA = "media"
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     """Represents a chat message."""
     sender: str
@@ -25,8 +35,11 @@ class ChatMessage:
     msg_type: MessageType
     thread_id: Optional[str] = None
     parent_id: Optional[str] = None
-    reactions: Dict[str, List[str]] = None
+    # Users of each reaction, as the keys of an insertion-ordered dict for constant-time membership tests
+    reactions: Dict[str, Dict[str, None]] = None
     metadata: Dict[str, Any] = None
+    # The timestamp in ISO format, formatted once when the message is first exported
+    _iso_timestamp: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Initialize optional fields."""
@@ -34,19 +47,76 @@ class ChatMessage:
             self.reactions = {}
         if self.metadata is None:
             self.metadata = {}
+            
+    @property
+    def iso_timestamp(self) -> str:
+        """Get the timestamp in ISO format."""
+        if self._iso_timestamp is None:
+            self._iso_timestamp = self.timestamp.isoformat()
+        return self._iso_timestamp
+        
+    def reaction_lists(self) -> Dict[str, List[str]]:
+        """Get the users of each reaction as lists, in the order they reacted."""
+        return {reaction: list(users) for reaction, users in self.reactions.items()}
 
 class ChatInterface:
     """Enhanced chat interface with advanced features."""
     
-    def __init__(self):
-        """Initialize chat interface."""
+    def __init__(self, log_file: Optional[str] = None):
+        """
+        Initialize chat interface.
+        
+        Args:
+            log_file: Optional path of a JSONL log the messages, and then their updates, are appended to
+        """
         self.messages: List[ChatMessage] = []
+        # Columns of the fields the history is filtered on, parallel to the messages, so that
+        # filtering only touches the messages it returns. The timestamps are also used for
+        # time-range lookups while they are in order (the clock may go back)
+        self._timestamps: List[datetime] = []
+        self._senders: List[str] = []
+        self._msg_types: List[MessageType] = []
+        self._timestamps_sorted = True
+        # Indices of the messages by sender and by type
+        self._by_user: Dict[str, List[int]] = {}
+        self._by_type: Dict[MessageType, List[int]] = {}
+        # Running counts for the analytics: messages of each sender, and distinct reactions of each message
+        self._messages_per_user: Counter = Counter()
+        # How often each sender replied to each other user
+        self._interactions: Dict[str, Counter] = defaultdict(Counter)
+        self._reaction_counts: List[int] = []
+        # For the topic evolution: the words (longer than 3 letters) of all the messages interned as ids
+        # of the vocabulary, the number of words of each message, and whether it mentions "good"
+        self._vocabulary: Dict[str, int] = {}
+        self._word_ids: List[int] = []
+        self._word_counts: List[int] = []
+        self._mentions_good: List[bool] = []
         self.active_users: Dict[str, Dict[str, Any]] = {}
         self.threads: Dict[str, List[ChatMessage]] = {}
         self.reactions_enabled = True
         self.threading_enabled = True
         self.typing_indicators = {}
         
+        self.log_file = log_file
+        self._log = None
+        if log_file:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Unbuffered, so every record is on disk once a call returns
+            self._log = open(log_file, 'ab', buffering=0)
+            
+    def _append_log(self, record: Dict[str, Any]):
+        """Append a record to the log, if any."""
+        if self._log is not None:
+            self._log.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+            
+    def close(self):
+        """Close the log, if any."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+            
     def add_message(
         self,
         sender: str,
@@ -56,7 +126,7 @@ class ChatInterface:
         parent_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> ChatMessage:
-        """Add a new message to the chat."""
+        """Add a new message to the chat. The parent_id, if any, is the index of the message replied to."""
         message = ChatMessage(
             sender=sender,
             content=content,
@@ -68,7 +138,31 @@ class ChatInterface:
             metadata=metadata or {}
         )
         
+        replied = self._replied_message(thread_id, parent_id)
+        if replied is not None and replied.sender != sender:
+            self._interactions[sender][replied.sender] += 1
+            
+        if self._timestamps and message.timestamp < self._timestamps[-1]:
+            self._timestamps_sorted = False
+        index = len(self.messages)
         self.messages.append(message)
+        self._timestamps.append(message.timestamp)
+        self._senders.append(sender)
+        self._msg_types.append(msg_type)
+        self._by_user.setdefault(sender, []).append(index)
+        self._by_type.setdefault(msg_type, []).append(index)
+        self._messages_per_user[sender] += 1
+        self._reaction_counts.append(0)
+        lowered = content.lower()
+        word_ids = [
+            self._vocabulary.setdefault(word, len(self._vocabulary))
+            for word in _WORD_RE.findall(lowered) if len(word) > 3
+        ]
+        self._word_ids.extend(word_ids)
+        self._word_counts.append(len(word_ids))
+        self._mentions_good.append("good" in lowered)
+        if self._log is not None:
+            self._append_log({"record": "message", "id": index, **self._msg_to_dict(message)})
         
         if thread_id:
             if thread_id not in self.threads:
@@ -86,6 +180,14 @@ class ChatInterface:
         
         return message
         
+    def _replied_message(self, thread_id: Optional[str], parent_id: Optional[str]) -> Optional[ChatMessage]:
+        """Get the message a new message replies to: its parent, else the first one of its thread, else the last one."""
+        if parent_id is not None and parent_id.isdigit() and int(parent_id) < len(self.messages):
+            return self.messages[int(parent_id)]
+        if self.threads.get(thread_id):
+            return self.threads[thread_id][0]
+        return self.messages[-1] if self.messages else None
+        
     def add_reaction(
         self,
         message_index: int,
@@ -99,9 +201,11 @@ class ChatInterface:
         if 0 <= message_index < len(self.messages):
             message = self.messages[message_index]
             if reaction not in message.reactions:
-                message.reactions[reaction] = []
+                message.reactions[reaction] = {}
+                self._reaction_counts[message_index] += 1
             if user not in message.reactions[reaction]:
-                message.reactions[reaction].append(user)
+                message.reactions[reaction][user] = None
+                self._append_log({"record": "message_update", "id": message_index, "reactions": message.reaction_lists()})
             return True
         return False
         
@@ -118,6 +222,7 @@ class ChatInterface:
             parent_message = self.messages[parent_message_index]
             parent_message.thread_id = thread_id
             self.threads[thread_id] = [parent_message]
+            self._append_log({"record": "message_update", "id": parent_message_index, "thread_id": thread_id})
             return thread_id
         return None
         
@@ -165,33 +270,51 @@ class ChatInterface:
         msg_type: Optional[MessageType] = None
     ) -> List[ChatMessage]:
         """Get filtered message history."""
-        filtered_messages = self.messages
-        
-        if start_time:
-            filtered_messages = [
-                msg for msg in filtered_messages
-                if msg.timestamp >= start_time
-            ]
-            
-        if end_time:
-            filtered_messages = [
-                msg for msg in filtered_messages
-                if msg.timestamp <= end_time
-            ]
+        if not (start_time or end_time or user or msg_type):
+            return self.messages
             
-        if user:
-            filtered_messages = [
-                msg for msg in filtered_messages
-                if msg.sender == user
-            ]
+        # Look up the messages of the time range, rather than scanning all of them
+        lo, hi = 0, len(self.messages)
+        if self._timestamps_sorted:
+            lo = bisect_left(self._timestamps, start_time) if start_time else 0
+            hi = bisect_right(self._timestamps, end_time) if end_time else len(self.messages)
+            start_time = end_time = None
             
-        if msg_type:
-            filtered_messages = [
-                msg for msg in filtered_messages
-                if msg.msg_type == msg_type
-            ]
-            
-        return filtered_messages
+        # Only scan the smallest of the candidates: the messages of the time range, of the user or of the type
+        candidates = range(lo, hi)
+        for indexed, key in ((self._by_user, user), (self._by_type, msg_type)):
+            if key:
+                indices = indexed.get(key, [])
+                if len(indices) < len(candidates):
+                    candidates = indices
+                    
+        # Check all the remaining filters on the columns at once, in a single pass over the candidates,
+        # and only get the messages that pass them
+        timestamps, senders, msg_types = self._timestamps, self._senders, self._msg_types
+        return [
+            self.messages[i] for i in candidates
+            if lo <= i < hi
+            and (not start_time or timestamps[i] >= start_time)
+            and (not end_time or timestamps[i] <= end_time)
+            and (not user or senders[i] == user)
+            and (not msg_type or msg_types[i] == msg_type)
+        ]
+        
+    @staticmethod
+    def _msg_to_dict(msg: ChatMessage, include_thread: bool = True) -> Dict[str, Any]:
+        """Get the exported fields of a message, the thread ones only if include_thread."""
+        msg_dict = {
+            "sender": msg.sender,
+            "content": msg.content,
+            "timestamp": msg.iso_timestamp,
+            "type": msg.msg_type.value
+        }
+        if include_thread:
+            msg_dict["thread_id"] = msg.thread_id
+            msg_dict["parent_id"] = msg.parent_id
+        msg_dict["reactions"] = msg.reaction_lists()
+        msg_dict["metadata"] = msg.metadata
+        return msg_dict
         
     def export_chat_history(
         self,
@@ -201,144 +324,140 @@ class ChatInterface:
         """Export chat history in specified format."""
         if format == "json":
             history = {
-                "messages": [
-                    {
-                        "sender": msg.sender,
-                        "content": msg.content,
-                        "timestamp": msg.timestamp.isoformat(),
-                        "type": msg.msg_type.value,
-                        "thread_id": msg.thread_id,
-                        "parent_id": msg.parent_id,
-                        "reactions": msg.reactions,
-                        "metadata": msg.metadata
-                    }
-                    for msg in self.messages
-                ],
+                "messages": [self._msg_to_dict(msg) for msg in self.messages],
                 "threads": {
-                    thread_id: [
-                        {
-                            "sender": msg.sender,
-                            "content": msg.content,
-                            "timestamp": msg.timestamp.isoformat(),
-                            "type": msg.msg_type.value,
-                            "reactions": msg.reactions,
-                            "metadata": msg.metadata
-                        }
-                        for msg in thread_messages
-                    ]
+                    thread_id: [self._msg_to_dict(msg, include_thread=False) for msg in thread_messages]
                     for thread_id, thread_messages in self.threads.items()
                 },
                 "users": self.get_active_users()
             }
             
-            return json.dumps(history, indent=2)
+            return orjson.dumps(history, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
             
-        elif format == "markdown":
-            lines = []
+        elif format == "jsonl":
+            # One message per line, without building the list of all the messages first
+            lines = bytearray()
             for msg in self.messages:
-                thread_info = f" (Thread: {msg.thread_id})" if msg.thread_id else ""
-                reactions = (
-                    f"\nReactions: {', '.join(f'{r}: {len(users)}' for r, users in msg.reactions.items())}"
-                    if msg.reactions else ""
-                )
-                
-                lines.append(
-                    f"**{msg.sender}** ({msg.timestamp.isoformat()})"
-                    f"{thread_info}\n{msg.content}{reactions}\n"
-                )
-            return "\n".join(lines)
+                lines += orjson.dumps(self._msg_to_dict(msg), option=orjson.OPT_NON_STR_KEYS)
+                lines += b"\n"
+            return lines.decode()
             
-        elif format == "html":
-            lines = ["<div class='chat-history'>"]
-            for msg in self.messages:
-                thread_class = f" thread-{msg.thread_id}" if msg.thread_id else ""
-                reactions_html = []
-                for reaction, users in msg.reactions.items():
-                    reactions_html.append(
-                        f"<span class='reaction'>{reaction} ({len(users)})</span>"
-                    )
-                reactions = (
-                    f"<div class='reactions'>{''.join(reactions_html)}</div>"
-                    if reactions_html else ""
-                )
-                
-                lines.append(
-                    f"<div class='message{thread_class}'>"
-                    f"<div class='header'>"
-                    f"<span class='sender'>{msg.sender}</span>"
-                    f"<span class='timestamp'>{msg.timestamp.isoformat()}</span>"
-                    f"</div>"
-                    f"<div class='content'>{msg.content}</div>"
-                    f"{reactions}"
-                    f"</div>"
-                )
-            lines.append("</div>")
-            return "\n".join(lines)
+        elif format in ("markdown", "html"):
+            chunks = self.iter_export_markdown() if format == "markdown" else self.iter_export_html()
+            buffer = io.StringIO()
+            buffer.writelines(chunks)
+            return buffer.getvalue()
             
         raise ValueError(f"Unsupported export format: {format}")
         
+    def iter_export_markdown(self) -> Iterator[str]:
+        """Export the chat history as Markdown, one message at a time, e.g. to write it to a file."""
+        for i, msg in enumerate(self.messages):
+            # The messages are separated by an empty line
+            separator = "\n" if i else ""
+            thread_info = f" (Thread: {msg.thread_id})" if msg.thread_id else ""
+            reactions = (
+                f"\nReactions: {', '.join(f'{r}: {len(users)}' for r, users in msg.reactions.items())}"
+                if msg.reactions else ""
+            )
+            
+            yield (
+                f"{separator}**{msg.sender}** ({msg.iso_timestamp})"
+                f"{thread_info}\n{msg.content}{reactions}\n"
+            )
+            
+    def iter_export_html(self) -> Iterator[str]:
+        """Export the chat history as HTML, one message at a time, e.g. to write it to a file."""
+        yield "<div class='chat-history'>"
+        for msg in self.messages:
+            thread_class = f" thread-{escape(msg.thread_id)}" if msg.thread_id else ""
+            reactions_html = "".join(
+                f"<span class='reaction'>{escape(reaction)} ({len(users)})</span>"
+                for reaction, users in msg.reactions.items()
+            )
+            reactions = f"<div class='reactions'>{reactions_html}</div>" if reactions_html else ""
+            
+            yield (
+                f"\n<div class='message{thread_class}'>"
+                f"<div class='header'>"
+                f"<span class='sender'>{escape(msg.sender)}</span>"
+                f"<span class='timestamp'>{msg.iso_timestamp}</span>"
+                f"</div>"
+                f"<div class='content'>{escape(msg.content)}</div>"
+                f"{reactions}"
+                f"</div>"
+            )
+        yield "\n</div>"
+        
     def get_analytics(self) -> Dict[str, Any]:
         """Get analytics data for the chat."""
+        messages_per_user = dict(self._messages_per_user)
         analytics = {
             "total_messages": len(self.messages),
             "active_users": len(self.active_users),
             "total_threads": 0,  
-            "messages_per_user": {},
-            "reactions_per_message": [],
+            "messages_per_user": messages_per_user,
+            "reactions_per_message": [count for count in self._reaction_counts if count],
             "interaction_patterns": {
-                "interaction_matrix": {}
+                # How often each sender replied to each other user
+                "interaction_matrix": {
+                    sender: dict(self._interactions.get(sender, {})) for sender in messages_per_user
+                }
             },
             "topic_evolution": {
                 "windows": []
             }
         }
         
-        # Calculate messages per user
-        for message in self.messages:
-            if message.sender not in analytics["messages_per_user"]:
-                analytics["messages_per_user"][message.sender] = 0
-            analytics["messages_per_user"][message.sender] += 1
-            
-            # Count reactions
-            if message.reactions:
-                analytics["reactions_per_message"].append(len(message.reactions))
-                
-        # Calculate interaction patterns
-        for message in self.messages:
-            sender = message.sender
-            if sender not in analytics["interaction_patterns"]["interaction_matrix"]:
-                analytics["interaction_patterns"]["interaction_matrix"][sender] = {}
-            
-            for other_user in self.active_users:
-                if other_user != sender:
-                    if other_user not in analytics["interaction_patterns"]["interaction_matrix"][sender]:
-                        analytics["interaction_patterns"]["interaction_matrix"][sender][other_user] = 0
-                    analytics["interaction_patterns"]["interaction_matrix"][sender][other_user] += 1
-        
         # Calculate topic evolution
         window_size = 3  
-        for i in range(0, len(self.messages), window_size):
+        key_terms = self._window_key_terms(window_size, 5)
+        for window, i in enumerate(range(0, len(self.messages), window_size)):
             window_messages = self.messages[i:i+window_size]
-            if window_messages:
-                window_text = " ".join([msg.content for msg in window_messages])
-                sentiment = "positive" if "good" in window_text.lower() else "negative"
-                
-                words = window_text.lower().split()
-                word_freq = {}
-                for word in words:
-                    if len(word) > 3:  
-                        if word not in word_freq:
-                            word_freq[word] = 0
-                        word_freq[word] += 1
-                
-                analytics["topic_evolution"]["windows"].append({
-                    "timestamp_start": window_messages[0].timestamp.isoformat(),
-                    "timestamp_end": window_messages[-1].timestamp.isoformat(),
-                    "key_terms": dict(sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]),
-                    "sentiment": sentiment
-                })
+            analytics["topic_evolution"]["windows"].append({
+                "timestamp_start": window_messages[0].iso_timestamp,
+                "timestamp_end": window_messages[-1].iso_timestamp,
+                "key_terms": key_terms[window],
+                "sentiment": "positive" if any(self._mentions_good[i:i+window_size]) else "negative"
+            })
         
         return analytics
+        
+    def _window_key_terms(self, window_size: int, top_k: int) -> List[Dict[str, int]]:
+        """
+        Get the most frequent words of each window of messages, counting the words of all the windows at once.
+        
+        Returns:
+            For each window, its top_k words with their counts, by decreasing count and then first occurrence
+        """
+        key_terms = [{} for _ in range(0, len(self.messages), window_size)]
+        if not self._word_ids:
+            return key_terms
+            
+        # Code each word of each window as window * vocabulary_size + word id, and count the codes
+        vocabulary_size = len(self._vocabulary)
+        windows = np.repeat(np.arange(len(self.messages)) // window_size, self._word_counts)
+        codes, first_index, counts = np.unique(
+            windows * vocabulary_size + np.array(self._word_ids),
+            return_index=True,
+            return_counts=True
+        )
+        code_windows = codes // vocabulary_size
+        
+        # Rank the words of each window, and keep the top_k of each
+        order = np.lexsort((first_index, -counts, code_windows))
+        ranked_windows = code_windows[order]
+        ranks = np.arange(len(order)) - np.searchsorted(ranked_windows, ranked_windows)
+        top = order[ranks < top_k]
+        
+        words = list(self._vocabulary)
+        for window, word_id, count in zip(
+            code_windows[top].tolist(),
+            (codes[top] % vocabulary_size).tolist(),
+            counts[top].tolist()
+        ):
+            key_terms[window][words[word_id]] = count
+        return key_terms
 
 def analyze_sentiment(text: str) -> str:
     # This is a placeholder for a sentiment analysis function
@@ -1,17 +1,33 @@
 """
 Word processing tools for discussion content management.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Tuple, Union
 import re
 from collections import Counter
 from datetime import datetime
+from functools import lru_cache
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Words indicating a positive or a negative sentiment
+POSITIVE_WORDS = frozenset({"good", "great", "excellent", "positive", "agree"})
+NEGATIVE_WORDS = frozenset({"bad", "poor", "negative", "disagree", "issue"})
+
+@lru_cache(maxsize=4096)
+def _tokenize_text(text: str, stop_words: FrozenSet[str]) -> Tuple[str, ...]:
+    """Tokenize text into lowercase words without punctuation, leaving out stop words."""
+    # Removing punctuation never splits or joins words, so it can be done before splitting
+    return tuple(
+        w for w in _PUNCTUATION_RE.sub('', text.lower()).split()
+        if w not in stop_words
+    )
 
 class WordProcessor:
     """Processor for discussion content analysis and manipulation."""
     
     def __init__(self):
         """Initialize word processor."""
-        self.stop_words = set([
+        self.stop_words = frozenset([
             "a", "an", "and", "are", "as", "at", "be", "by", "for",
             "from", "has", "he", "in", "is", "it", "its", "of", "on",
             "that", "the", "to", "was", "were", "will", "with"
@@ -102,20 +118,9 @@ class WordProcessor:
         else:
             return self._format_plain(messages)
             
-    def _tokenize(self, text: str) -> List[str]:
-        """Tokenize text into words."""
-        # Convert to lowercase and split
-        words = text.lower().split()
-        
-        # Remove punctuation and filter stop words
-        words = [
-            re.sub(r'[^\w\s]', '', word)
-            for word in words
-        ]
-        return [
-            w for w in words
-            if w and w not in self.stop_words
-        ]
+    def _tokenize(self, text: str) -> Tuple[str, ...]:
+        """Tokenize text into words. The words of recently tokenized texts are cached."""
+        return _tokenize_text(text, self.stop_words)
         
     def _average_word_length(self, words: List[str]) -> float:
         """Calculate average word length."""
@@ -123,8 +128,8 @@ class WordProcessor:
             return 0.0
         return sum(len(w) for w in words) / len(words)
         
-    def _get_keyword_frequency(self, words: List[str]) -> Dict[str, int]:
-        """Get frequency of keywords."""
+    def _get_keyword_frequency(self, words: Union[Iterable[str], Counter]) -> Dict[str, int]:
+        """Get frequency of keywords, given the words or their counts."""
         word_freq = Counter(words)
         # Return top 10 most common words
         return dict(word_freq.most_common(10))
@@ -148,14 +153,15 @@ class WordProcessor:
         
     def _analyze_sentiment(self, text: str) -> Dict[str, int]:
         """Analyze text sentiment indicators."""
-        positive_words = {"good", "great", "excellent", "positive", "agree"}
-        negative_words = {"bad", "poor", "negative", "disagree", "issue"}
+        return self._sentiment_of_words(self._tokenize(text))
         
-        words = set(self._tokenize(text))
+    def _sentiment_of_words(self, words: Iterable[str]) -> Dict[str, int]:
+        """Analyze the sentiment indicators of tokenized words."""
+        words = set(words)
         
         return {
-            "positive": len(words & positive_words),
-            "negative": len(words & negative_words)
+            "positive": len(words & POSITIVE_WORDS),
+            "negative": len(words & NEGATIVE_WORDS)
         }
         
     def _split_sentences(self, text: str) -> List[str]:
@@ -0,0 +1,37 @@
+"""
+Limits on how many TinyTroupe agents act at the same time.
+
+Agents mostly wait on the LLM, so they are made to act concurrently, but two TinyTroupe
+features are not thread safe:
+
+- The API call cache (CACHE_API_CALLS) is a dictionary that is updated and pickled to disk
+  without a lock, so concurrent calls can lose entries or fail while the cache is being saved.
+- A simulation (control.begin()) checkpoints and replays the transactions of agents and
+  environments in the order they occur, which concurrent threads would make nondeterministic.
+
+When either one is in use, agents act one at a time, in the order they were submitted.
+"""
+import logging
+
+from tinytroupe import control, openai_utils
+
+logger = logging.getLogger(__name__)
+
+def _api_cache_enabled() -> bool:
+    """Whether the LLM client caches its API calls."""
+    try:
+        return bool(getattr(openai_utils.client(), "cache_api_calls", False))
+    except ValueError:
+        # The configured API type has no client, so no call can be cached either
+        return False
+
+def agent_concurrency(max_concurrency: int) -> int:
+    """
+    The number of agents that may act at the same time, at most max_concurrency, or 1 when
+    TinyTroupe's API cache or a simulation is in use.
+    """
+    if _api_cache_enabled() or control.current_simulation() is not None:
+        if max_concurrency > 1:
+            logger.debug("Agents act one at a time, as the API cache or a simulation is in use")
+        return 1
+    return max(1, max_concurrency)
@@ -5,7 +5,13 @@ import os
 import mysql.connector
 import psycopg2
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+INSERT_DISCUSSION_SQL = """
+    INSERT INTO discussions 
+    (discussion_type, discussion_name, context, metadata, results)
+    VALUES (%s, %s, %s, %s, %s)
+"""
 
 class DatabaseManager:
     """Manages database connections and operations for both MySQL and PostgreSQL"""
@@ -55,23 +61,31 @@ class DatabaseManager:
             
     def store_data(self, results: Dict[str, Any], metadata: Dict[str, Any]):
         """Store data in both MySQL and PostgreSQL databases"""
-        # Store in MySQL
-        try:
-            conn = mysql.connector.connect(**self.mysql_config)
-            cursor = conn.cursor()
-            self._create_tables(cursor, True)
+        self.store_data_batch([(results, metadata)])
+        
+    def store_data_batch(self, rows: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        """Store several (results, metadata) rows in both MySQL and PostgreSQL databases, in a single transaction each"""
+        if not rows:
+            return
             
-            cursor.execute("""
-                INSERT INTO discussions 
-                (discussion_type, discussion_name, context, metadata, results)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (
+        values = [
+            (
                 metadata.get('discussion_type', 'unknown'),
                 metadata.get('discussion_name', 'unnamed'),
                 metadata.get('context', ''),
                 metadata.get('metadata', '{}'),
                 str(results)
-            ))
+            )
+            for results, metadata in rows
+        ]
+        
+        # Store in MySQL
+        try:
+            conn = mysql.connector.connect(**self.mysql_config)
+            cursor = conn.cursor()
+            self._create_tables(cursor, True)
+            
+            cursor.executemany(INSERT_DISCUSSION_SQL, values)
             conn.commit()
             
         except Exception as e:
@@ -86,17 +100,7 @@ class DatabaseManager:
             cursor = conn.cursor()
             self._create_tables(cursor, False)
             
-            cursor.execute("""
-                INSERT INTO discussions 
-                (discussion_type, discussion_name, context, metadata, results)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (
-                metadata.get('discussion_type', 'unknown'),
-                metadata.get('discussion_name', 'unnamed'),
-                metadata.get('context', ''),
-                metadata.get('metadata', '{}'),
-                str(results)
-            ))
+            cursor.executemany(INSERT_DISCUSSION_SQL, values)
             conn.commit()
             
         except Exception as e:
@@ -0,0 +1,96 @@
+"""
+Persistent cache for agent responses.
+
+Entries are keyed on a hash of what identifies a request (e.g. the agent, the discussion
+phase and the prompt), kept in least-recently-used order and optionally expire.
+"""
+import os
+import pickle
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """LRU cache of responses, optionally persisted across runs. The cache can be shared by several threads."""
+
+    def __init__(self, cache_file: Optional[str] = None, max_entries: int = 10000,
+                 ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_file: Optional path where the cache is persisted across runs
+            max_entries: Maximum number of entries, the least recently used ones are evicted first
+            ttl: Optional time to live of the entries, in seconds
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # Maps keys to (creation time, value), from least to most recently used
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        if cache_file and os.path.exists(cache_file):
+            self.load()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the parts identifying a request."""
+        return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the cached value for a key, or None if there is none or it expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            created, value = entry
+            if self.ttl is not None and time.time() - created > self.ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def save(self) -> None:
+        """Persist the cache to its cache file, if any."""
+        if not self.cache_file:
+            return
+
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock, open(self.cache_file, 'wb') as f:
+            pickle.dump(list(self._entries.items()), f)
+
+    def load(self) -> None:
+        """Load the cache from its cache file."""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                self._entries = OrderedDict(pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Could not load response cache from {self.cache_file}: {str(e)}")
@@ -5,6 +5,9 @@ from typing import Dict, List, Any
 import json
 from collections import defaultdict
 
+# Results are extracted by TinyTroupe, re-exported here with the rest of the result processing
+from tinytroupe.extraction import ResultsExtractor, ResultsReducer, default_extractor
+
 def format_results(raw_results: List[Dict[str, Any]], discussion_type: str) -> Dict[str, Any]:
     """
     Format raw discussion results based on discussion type.
@@ -0,0 +1,146 @@
+"""
+Semantic cache for LLM-generated responses.
+
+Lookups are tiered: an exact match on the prompt text is tried first, and only then
+the prompt is embedded and compared against previously cached prompts, returning the
+stored value when the cosine similarity is above a threshold.
+"""
+import os
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Caches values computed from prompts, reusing them for identical or very similar prompts.
+    The cache can be shared by several threads.
+    """
+
+    def __init__(self, threshold: float = 0.85, model_name: str = "all-MiniLM-L6-v2",
+                 cache_file: Optional[str] = None, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a semantic hit
+            model_name: Name of the sentence transformer model used for the embeddings
+            cache_file: Optional path where the cache is persisted across runs, by save()
+            max_entries: Maximum number of entries, the least recently used ones are evicted first
+        """
+        self.threshold = threshold
+        self.model_name = model_name
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+
+        # The embedding model is only loaded once a semantic lookup is actually needed
+        self._model = None
+        self._lock = threading.RLock()
+
+        # Maps (namespace, text) to (embedding, value), from least to most recently used
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, Any]]" = OrderedDict()
+
+        if cache_file and os.path.exists(cache_file):
+            self.load()
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed a text as a unit vector, so that dot products are cosine similarities."""
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+
+        embedding = np.asarray(self._model.encode([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def get(self, namespace: str, text: str) -> Optional[Any]:
+        """
+        Get the cached value for a prompt, or None if there is none.
+
+        Args:
+            namespace: Scope of the lookup (e.g. the character name), so entries are never shared across scopes
+            text: The prompt text
+        """
+        with self._lock:
+            entry = self._entries.get((namespace, text))
+            if entry is not None:
+                self._entries.move_to_end((namespace, text))
+                return entry[1]
+
+            candidates = [key for key in self._entries if key[0] == namespace]
+            if not candidates:
+                return None
+            embeddings = np.stack([self._entries[key][0] for key in candidates])
+
+        similarities = embeddings @ self._embed(text)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        with self._lock:
+            # The entry may have been evicted while the prompt was embedded
+            entry = self._entries.get(candidates[best])
+            if entry is None:
+                return None
+            self._entries.move_to_end(candidates[best])
+            return entry[1]
+
+    def put(self, namespace: str, text: str, value: Any) -> None:
+        """
+        Store a value computed for a prompt, replacing the value of an identical prompt and
+        evicting the least recently used entries beyond max_entries.
+        """
+        key = (namespace, text)
+        with self._lock:
+            entry = self._entries.get(key)
+        embedding = entry[0] if entry is not None else self._embed(text)
+
+        with self._lock:
+            self._entries[key] = (embedding, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, namespace: str, text: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for a prompt, computing and storing it on a miss."""
+        value = self.get(namespace, text)
+        if value is None:
+            value = compute()
+            if value:
+                self.put(namespace, text, value)
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def save(self) -> None:
+        """Persist the cache to its cache file, if any."""
+        if not self.cache_file:
+            return
+
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock, open(self.cache_file, 'wb') as f:
+            pickle.dump(list(self._entries.items()), f)
+
+    def load(self) -> None:
+        """Load the cache from its cache file."""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                self._entries = OrderedDict(pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Could not load semantic cache from {self.cache_file}: {str(e)}")
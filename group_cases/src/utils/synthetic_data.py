@@ -5,7 +5,7 @@ from typing import Dict, List, Any, Optional
 import json
 import random
 from datetime import datetime, timedelta
-from ..core.base_discussion import DiscussionType
+from ..core.base_discussion import DiscussionType, BRAINSTORMING, EVALUATION, INTERVIEW
 
 class SyntheticDataGenerator:
     """Generator for synthetic discussion data."""
@@ -139,19 +139,19 @@ class SyntheticDataGenerator:
         }
         
         # Add type-specific content
-        if discussion_type == DiscussionType.BRAINSTORMING:
+        if discussion_type == BRAINSTORMING:
             base_response.update({
                 "num_ideas": random.randint(1, 4),
                 "creativity_score": random.uniform(0.4, 0.9),
                 "feasibility_score": random.uniform(0.3, 0.8)
             })
-        elif discussion_type == DiscussionType.EVALUATION:
+        elif discussion_type == EVALUATION:
             base_response.update({
                 "rating": random.uniform(1, 5),
                 "confidence_score": random.uniform(0.6, 0.9),
                 "criteria_coverage": random.uniform(0.7, 1.0)
             })
-        elif discussion_type == DiscussionType.INTERVIEW:
+        elif discussion_type == INTERVIEW:
             base_response.update({
                 "answer_completeness": random.uniform(0.5, 1.0),
                 "detail_level": random.uniform(0.6, 0.9),
@@ -201,7 +201,7 @@ class SyntheticDataGenerator:
     def _generate_metadata(self, discussion_type: DiscussionType) -> Dict[str, Any]:
         """Generate discussion metadata."""
         return {
-            "type": discussion_type.value,
+            "type": discussion_type,
             "generated_at": datetime.now().isoformat(),
             "version": "1.0",
             "seed": self.seed
@@ -273,19 +273,19 @@ class SyntheticDataGenerator:
             "action_clarity": random.uniform(0.7, 1.0)
         }
         
-        if discussion_type == DiscussionType.BRAINSTORMING:
+        if discussion_type == BRAINSTORMING:
             base_metrics.update({
                 "idea_quality": random.uniform(0.6, 0.9),
                 "innovation_level": random.uniform(0.5, 0.95),
                 "implementation_feasibility": random.uniform(0.4, 0.8)
             })
-        elif discussion_type == DiscussionType.EVALUATION:
+        elif discussion_type == EVALUATION:
             base_metrics.update({
                 "decision_confidence": random.uniform(0.7, 0.95),
                 "criteria_coverage": random.uniform(0.8, 1.0),
                 "evaluation_thoroughness": random.uniform(0.75, 0.95)
             })
-        elif discussion_type == DiscussionType.INTERVIEW:
+        elif discussion_type == INTERVIEW:
             base_metrics.update({
                 "information_completeness": random.uniform(0.7, 0.9),
                 "insight_depth": random.uniform(0.6, 0.85),
@@ -297,19 +297,19 @@ class SyntheticDataGenerator:
     def _get_phase_name(self, step: int, discussion_type: DiscussionType) -> str:
         """Get phase name based on step and discussion type."""
         phase_maps = {
-            DiscussionType.BRAINSTORMING: [
+            BRAINSTORMING: [
                 "ideation",
                 "elaboration",
                 "evaluation",
                 "refinement"
             ],
-            DiscussionType.EVALUATION: [
+            EVALUATION: [
                 "criteria_review",
                 "assessment",
                 "discussion",
                 "conclusion"
             ],
-            DiscussionType.INTERVIEW: [
+            INTERVIEW: [
                 "introduction",
                 "core_questions",
                 "deep_dive",
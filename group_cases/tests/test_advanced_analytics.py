@@ -0,0 +1,72 @@
+"""
+Unit tests for the advanced analytics module.
+"""
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import numpy as np
+from group_cases.src.tools.advanced_analytics import DiscussionAnalytics
+
+class TestDiscussionAnalytics(unittest.TestCase):
+    """Test cases for DiscussionAnalytics class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analytics = DiscussionAnalytics()
+        self.messages = [
+            {"sender": "Lisa", "content": "Solar panels reduce energy costs on roofs.",
+             "timestamp": "2024-01-01T10:00:00"},
+            {"sender": "Oscar", "content": "Lisa, solar panels on roofs also need maintenance, energy costs vary.",
+             "timestamp": "2024-01-01T10:01:00"},
+            {"sender": "Lisa", "content": "Maintenance of solar panels on roofs is cheap.",
+             "timestamp": "2024-01-01T10:02:00"}
+        ]
+
+    def test_discussion_dynamics(self):
+        """Test the interaction and flow analyses."""
+        results = self.analytics.analyze_discussion_dynamics(self.messages)
+
+        self.assertEqual(results["interaction_patterns"]["interaction_matrix"], {"Oscar": {"Lisa": 1}, "Lisa": {"Oscar": 1}})
+        self.assertEqual(len(results["discussion_flow"]["topic_coherence"]), 2)
+        self.assertEqual(len(results["discussion_flow"]["response_chains"]), 1)
+        self.assertEqual(results["engagement_metrics"]["Lisa"]["contribution_impact"], [2.0, 0.0])
+        self.assertEqual(results["participation_metrics"]["Lisa"]["message_count"], 2)
+
+    def test_messages_are_tokenized_once(self):
+        """Test that the words of each message are shared by the per-message analyses."""
+        tokenize = self.analytics.word_processor._tokenize
+        # The topic evolution scores the sentences of the messages for its key points
+        with patch.object(self.analytics, "_analyze_topic_evolution", return_value={}), \
+                patch.object(self.analytics.word_processor, "_tokenize", side_effect=tokenize) as mock_tokenize:
+            self.analytics.analyze_discussion_dynamics(self.messages)
+
+        tokenized = [call.args[0] for call in mock_tokenize.call_args_list]
+        for msg in self.messages:
+            self.assertEqual(tokenized.count(msg["content"]), 1)
+
+    def test_analyses_are_cached(self):
+        """Test that identical messages are only analyzed once, also across instances sharing a cache file."""
+        with TemporaryDirectory() as tmpdir:
+            cache_file = os.path.join(tmpdir, "analytics.pkl")
+            analytics = DiscussionAnalytics(cache_file=cache_file)
+            results = analytics.analyze_discussion_dynamics(self.messages)
+
+            reloaded = DiscussionAnalytics(cache_file=cache_file)
+            with patch.object(reloaded, "_analyze_dynamics", return_value={}) as mock_analyze:
+                self.assertEqual(reloaded.analyze_discussion_dynamics(self.messages), results)
+                mock_analyze.assert_not_called()
+
+                reloaded.analyze_discussion_dynamics(self.messages[:2])
+                mock_analyze.assert_called_once()
+
+    def test_batch_sentiment(self):
+        """Test the sentiment polarity of several texts at once."""
+        np.testing.assert_array_equal(
+            self.analytics.batch_sentiment(["Good, great idea!", "Bad idea, I disagree but it is good.", "", "Let us meet."]),
+            [1.0, -1 / 3, 0.0, 0.0]
+        )
+        self.assertEqual(len(self.analytics.batch_sentiment([])), 0)
+
+if __name__ == '__main__':
+    unittest.main()
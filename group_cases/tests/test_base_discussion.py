@@ -5,7 +5,7 @@ import unittest
 import json
 import os
 from tempfile import TemporaryDirectory
-from group_cases.src.core.base_discussion import BaseDiscussion, DiscussionType
+from group_cases.src.core.base_discussion import BaseDiscussion, BRAINSTORMING
 
 class MockDiscussion(BaseDiscussion):
     """Mock discussion class for testing."""
@@ -19,7 +19,7 @@ class TestBaseDiscussion(unittest.TestCase):
         """Set up test fixtures."""
         self.discussion = MockDiscussion(
             name="Test Discussion",
-            discussion_type=DiscussionType.BRAINSTORMING
+            discussion_type=BRAINSTORMING
         )
         
     def test_initialization(self):
@@ -27,7 +27,7 @@ class TestBaseDiscussion(unittest.TestCase):
         self.assertEqual(self.discussion.name, "Test Discussion")
         self.assertEqual(
             self.discussion.discussion_type,
-            DiscussionType.BRAINSTORMING
+            BRAINSTORMING
         )
         self.assertEqual(
             self.discussion.metadata["name"],
@@ -0,0 +1,248 @@
+"""
+Unit tests for the characters module.
+"""
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from tinytroupe.agent import TinyPerson
+from tinytroupe.environment import TinyWorld
+from group_cases.src.core.characters import Character, CharacterGroup
+
+class TestCharacterGroup(unittest.TestCase):
+    """Test cases for Character and CharacterGroup classes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        TinyWorld.clear_environments()
+        TinyPerson.clear_agents()
+
+        self.lisa = Character(
+            name="Lisa Test",
+            age=28,
+            occupation="Senior Data Scientist",
+            nationality="Canadian",
+            interests=["machine learning", "data visualization", "rock climbing"],
+            personality=["analytical", "detail-oriented", "professional"]
+        )
+        self.oscar = Character(
+            name="Oscar Test",
+            age=35,
+            occupation="Architect",
+            nationality="Spanish",
+            interests=["urban design", "photography"],
+            personality=["creative", "empathetic"]
+        )
+        self.group = CharacterGroup([self.lisa, self.oscar], use_response_cache=False)
+
+    def test_character_traits(self):
+        """Test that character traits are configured in the TinyPerson."""
+        configuration = self.lisa.tiny_person._configuration
+
+        self.assertEqual(configuration["professional_interests"], ["machine learning", "data visualization"])
+        self.assertEqual(configuration["personal_interests"], ["rock climbing"])
+        self.assertIn("Lisa Test is a 28-year-old Canadian Senior Data Scientist", configuration["background"])
+        self.assertEqual(configuration["communication_style"]["formality_level"], "formal")
+        self.assertEqual(self.oscar.communication_style["emotional_expression"], "high")
+
+    def test_tiny_person_is_created_lazily(self):
+        """Test that the TinyPerson is only created when first accessed."""
+        maya = Character(
+            name="Maya Test",
+            age=41,
+            occupation="Clinical Psychologist",
+            nationality="Indian",
+            interests=["mindfulness", "music"],
+            personality=["empathetic", "curious"]
+        )
+        self.assertIsNone(maya._tiny)
+
+        tiny_person = maya.tiny_person
+        self.assertIsInstance(tiny_person, TinyPerson)
+        self.assertIs(maya.tiny_person, tiny_person)
+        self.assertEqual(tiny_person._configuration["personal_interests"], ["music"])
+
+    def test_agents_are_reused_across_groups(self):
+        """Test that a new group reuses the characters' agents with a clean state."""
+        tiny_person = self.lisa.tiny_person
+        tiny_person.internalize_goal("Win the debate")
+
+        group = CharacterGroup([self.lisa, self.oscar], use_response_cache=False)
+
+        self.assertIs(self.lisa.tiny_person, tiny_person)
+        self.assertIs(tiny_person.environment, group.world)
+        self.assertEqual(tiny_person._configuration["current_goals"], [])
+        self.assertEqual(tiny_person._accessible_agents, [self.oscar.tiny_person])
+
+    def test_responses_are_not_cached_by_default(self):
+        """Test that by default every response is generated by the character, without a response cache."""
+        group = CharacterGroup([self.lisa, self.oscar])
+        discussion = SimpleNamespace(discussion_name="Green roofs", chat_interface=SimpleNamespace(messages=[]))
+
+        with patch("group_cases.src.core.characters.SemanticCache") as mock_cache, \
+                patch.object(self.lisa.tiny_person, "listen_and_act", return_value=["[TALK] Plants cool the roof"]) as mock_act:
+            response, _ = group._generate_character_response(self.lisa, "What about heat?", discussion)
+
+        self.assertEqual(response, "Plants cool the roof")
+        mock_act.assert_called_once_with("What about heat?", return_actions=True)
+        mock_cache.assert_not_called()
+
+    def test_response_cache_is_shared_by_threads(self):
+        """Test that characters responding concurrently all get the one response cache of the discussion."""
+        group = CharacterGroup([self.lisa, self.oscar], use_response_cache=True)
+        discussion = SimpleNamespace(discussion_name="Green roofs")
+
+        def slow_cache(cache_file=None):
+            time.sleep(0.01)
+            return object()
+
+        with patch("group_cases.src.core.characters.SemanticCache", side_effect=slow_cache) as mock_cache, \
+                ThreadPoolExecutor(max_workers=4) as executor:
+            caches = list(executor.map(lambda _: group._get_response_cache(discussion), range(8)))
+
+        mock_cache.assert_called_once()
+        self.assertTrue(all(cache is caches[0] for cache in caches))
+
+    def test_analyze_sentiment(self):
+        """Test keyword-based sentiment analysis."""
+        self.assertEqual(self.group._analyze_sentiment("Great idea, I agree!"), "positive")
+        self.assertEqual(self.group._analyze_sentiment("That is WRONG and problematic."), "negative")
+        self.assertEqual(self.group._analyze_sentiment("Let us meet tomorrow."), "neutral")
+        self.assertEqual(self.group._analyze_sentiment("Good, but I disagree: it is bad."), "negative")
+        self.assertEqual(
+            self.group.batch_analyze_sentiment(["Excellent!", "I am worried.", "", "goodness", "good", "bad"]),
+            ["positive", "negative", "neutral", "neutral", "positive", "negative"]
+        )
+        self.assertEqual(self.group.batch_analyze_sentiment([]), [])
+
+    def test_extract_response_from_actions(self):
+        """Test response extraction priorities."""
+        actions = [
+            {"type": "THINK", "content": "a thought"},
+            {"type": "TALK", "content": "something said"}
+        ]
+        self.assertEqual(self.group._extract_response_from_actions(actions), "something said")
+        self.assertEqual(self.group._extract_response_from_actions(["[THINK] > pondering"]), "pondering")
+        self.assertEqual(self.group._extract_response_from_actions([{"message": "hello"}]), "hello")
+        self.assertEqual(
+            self.group._extract_response_from_actions([
+                {"action": {"type": "THINK", "content": "a thought"}, "cognitive_state": {}},
+                {"action": {"type": "TALK", "content": "said by the agent"}, "cognitive_state": {}},
+                {"action": {"type": "DONE", "content": ""}, "cognitive_state": {}}
+            ]),
+            "said by the agent"
+        )
+        self.assertEqual(
+            self.group._extract_response_from_actions(["plain text", "[THINK] > hmm", "[TALK] > first", "[SAY] second"]),
+            "first"
+        )
+        self.assertIsNone(self.group._extract_response_from_actions([]))
+
+    def test_extract_response_from_mixed_markers(self):
+        """Test that of several markers in an action, the content of the first one with the highest priority is used."""
+        extract = self.group._extract_response_from_actions
+        self.assertEqual(extract(["[THINK] hmm [TALK] hello"]), "hello")
+        self.assertEqual(extract(["[TALK] a [TALK] b"]), "a")
+        self.assertEqual(extract(["[TALK] > first\n[THINK] > then a thought"]), "first")
+        self.assertEqual(extract(["[TALK] [THINK] only a thought"]), "only a thought")
+
+    def test_create_response_context(self):
+        """Test the context built for a character's response."""
+        discussion = SimpleNamespace(
+            discussion_name="Green {roofs}",
+            chat_interface=SimpleNamespace(messages=[
+                SimpleNamespace(sender="System", content="Welcome"),
+                SimpleNamespace(sender="Oscar Test", content="Plants need {water}")
+            ])
+        )
+
+        context = self.group._create_response_context(self.lisa, "What about {costs}?", discussion)
+
+        self.assertTrue(context.startswith(
+            "As Lisa Test, a Senior Data Scientist with expertise in machine learning, data visualization, rock climbing, \n"
+            "you are participating in a discussion about Green {roofs}."
+        ))
+        self.assertIn("Your personality traits are: analytical, detail-oriented, professional\n", context)
+        self.assertIn("Current discussion context:\nWhat about {costs}?\n", context)
+        self.assertTrue(context.endswith("Recent messages:\nSystem: Welcome\nOscar Test: Plants need {water}\n"))
+
+        # The recent messages are shared by all characters, and refreshed once a message is added
+        recent_block = self.group._get_recent_block(discussion)
+        self.assertIs(self.group._get_recent_block(discussion), recent_block)
+        discussion.chat_interface.messages.append(SimpleNamespace(sender="Lisa Test", content="Agreed"))
+        self.assertTrue(self.group._create_response_context(self.oscar, "", discussion).endswith("Lisa Test: Agreed\n"))
+
+    def test_fallback_response(self):
+        """Test occupation-based fallback responses."""
+        response = self.group._generate_fallback_response(self.oscar, "cities need trees")
+        self.assertTrue(response.endswith("cities need trees"))
+        self.assertIn("Architect", response)
+
+    def test_update_discussion_results_timestamp(self):
+        """Test that all the records of a response share one timestamp."""
+        self.group._update_discussion_results(self.lisa, "This is a great point.", "2024-01-01T10:00:00")
+
+        self.assertEqual(self.group.discussion_results['insights'][-1]['timestamp'], "2024-01-01T10:00:00")
+        self.assertEqual(self.group.discussion_results['sentiment_analysis'][-1]['timestamp'], "2024-01-01T10:00:00")
+
+    def test_start_discussion_timestamps(self):
+        """Test that the memory and discussion records of an initial response share one timestamp."""
+        # The discussion itself is stubbed, as its memory loads an embedding model
+        discussion = SimpleNamespace(discussion_name="Green roofs", chat_interface=MagicMock(messages=[]))
+        with patch("group_cases.src.core.characters.GroupDiscussion", return_value=discussion), \
+                patch.object(TinyPerson, "communication_display", False), \
+                patch.object(self.lisa.tiny_person, "listen_and_act", return_value=["[TALK] Green roofs are great"]), \
+                patch.object(self.oscar.tiny_person, "listen_and_act", return_value=["[TALK] I am worried about costs"]):
+            self.group.start_discussion("Green roofs", "Should cities subsidize green roofs?")
+
+        for char, insight in zip([self.lisa, self.oscar], self.group.discussion_results['insights']):
+            (contribution,) = [memory for memory in char.tiny_person.episodic_memory.retrieve_all()
+                               if memory.get('type') == 'discussion_contribution']
+            self.assertEqual(insight['character'], char.name)
+            self.assertEqual(insight['timestamp'], contribution['timestamp'])
+            self.assertEqual(self.group._last_contributions[char.name], contribution['timestamp'])
+
+    def test_discussion_summary(self):
+        """Test the discussion summary analytics."""
+        self.assertEqual(self.group.get_discussion_summary()["interaction_patterns"]["sentiment_trends"]["overall_sentiment"], "neutral")
+
+        self.group._update_discussion_results(self.lisa, "This is a great point.")
+        self.group._update_discussion_results(self.oscar, "I am worried about costs.")
+        self.group._update_discussion_results(self.lisa, "Good, let us continue.")
+
+        summary = self.group.get_discussion_summary()
+
+        self.assertEqual(summary["participation"]["Lisa Test"]["message_count"], 2)
+        self.assertEqual(summary["participation"]["Oscar Test"]["message_count"], 1)
+        self.assertEqual(
+            summary["interaction_patterns"]["sentiment_trends"]["sentiment_distribution"],
+            {"positive": 2, "negative": 1, "neutral": 0}
+        )
+        self.assertEqual(summary["interaction_patterns"]["sentiment_trends"]["overall_sentiment"], "positive")
+        self.assertEqual(
+            [(step["from"], step["to"]) for step in summary["interaction_patterns"]["discussion_flow"]],
+            [("Lisa Test", "Oscar Test"), ("Oscar Test", "Lisa Test")]
+        )
+
+    def test_insights_log(self):
+        """Test that insights are streamed to a JSONL log when a results directory is given."""
+        with TemporaryDirectory() as tmpdir:
+            group = CharacterGroup([self.lisa, self.oscar], use_response_cache=False, results_dir=tmpdir)
+            group._update_discussion_results(self.lisa, "This is a great point.")
+            group._update_discussion_results(self.oscar, "I am worried about costs.")
+
+            summary = group.get_discussion_summary()
+
+            self.assertEqual(group.discussion_results['insights'], [])
+            with open(group._insights_log_file) as f:
+                self.assertEqual(len(f.readlines()), 2)
+            self.assertEqual([insight["character"] for insight in summary["insights"]], ["Lisa Test", "Oscar Test"])
+            self.assertEqual([entry["sentiment"] for entry in summary["sentiment_analysis"]], ["positive", "negative"])
+            self.assertEqual(summary["participation"]["Oscar Test"]["message_count"], 1)
+            self.assertEqual(len(summary["interaction_patterns"]["discussion_flow"]), 1)
+            group.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Unit tests for the chat interface module.
+"""
+import os
+import json
+import unittest
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from group_cases.src.tools.chat_interface import ChatInterface, MessageType
+
+class _Clock(datetime):
+    """Clock advancing by a second on every reading, so that all messages have distinct timestamps."""
+    current = datetime(2024, 1, 1, 10, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        cls.current += timedelta(seconds=1)
+        return cls.current
+
+class TestChatInterface(unittest.TestCase):
+    """Test cases for ChatInterface class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.chat = ChatInterface()
+        with patch("group_cases.src.tools.chat_interface.datetime", _Clock):
+            self.chat.add_message("System", "Welcome", msg_type=MessageType.SYSTEM)
+            self.chat.add_message("Lisa", "Solar panels are good.", metadata={"round": 1})
+            self.chat.add_message("Oscar", "They need maintenance.")
+        self.chat.add_reaction(1, "Oscar", "👍")
+        self.thread_id = self.chat.create_thread(1)
+
+    def test_message_history(self):
+        """Test the filters of the message history."""
+        lisa, oscar = self.chat.messages[1:]
+
+        self.assertIs(self.chat.get_message_history(), self.chat.messages)
+        self.assertEqual(self.chat.get_message_history(user="Lisa"), [lisa])
+        self.assertEqual(self.chat.get_message_history(msg_type=MessageType.TEXT), [lisa, oscar])
+        self.assertEqual(self.chat.get_message_history(start_time=lisa.timestamp, user="Oscar"), [oscar])
+        self.assertEqual(self.chat.get_message_history(end_time=lisa.timestamp, msg_type=MessageType.TEXT), [lisa])
+        self.assertEqual(self.chat.get_message_history(user="Maya"), [])
+        self.assertEqual(self.chat.get_message_history(user="Lisa", msg_type=MessageType.SYSTEM), [])
+        self.assertEqual(self.chat.get_message_history(end_time=oscar.timestamp, user="Oscar"), [oscar])
+
+    def test_message_history_out_of_order(self):
+        """Test the time filters when the clock went back between messages."""
+        lisa, oscar = self.chat.messages[1:]
+        with patch("group_cases.src.tools.chat_interface.datetime", _Clock):
+            _Clock.current = lisa.timestamp - timedelta(seconds=2)
+            maya = self.chat.add_message("Maya", "Trees are cheaper.")
+
+        self.assertEqual(self.chat.get_message_history(start_time=lisa.timestamp), [lisa, oscar])
+        self.assertEqual(self.chat.get_message_history(end_time=lisa.timestamp, user="Maya"), [maya])
+
+    def test_analytics(self):
+        """Test the message, reaction and interaction counts of the analytics."""
+        self.chat.add_reaction(1, "System", "👍")
+        self.chat.add_reaction(1, "Lisa", "🎉")
+        self.chat.add_reaction(2, "Lisa", "👍")
+        self.assertFalse(self.chat.add_reaction(3, "Lisa", "👍"))
+
+        analytics = self.chat.get_analytics()
+
+        self.assertEqual(analytics["total_messages"], 3)
+        self.assertEqual(analytics["messages_per_user"], {"System": 1, "Lisa": 1, "Oscar": 1})
+        self.assertEqual(analytics["reactions_per_message"], [2, 1])
+        self.assertEqual(
+            analytics["interaction_patterns"]["interaction_matrix"],
+            {"System": {}, "Lisa": {"System": 1}, "Oscar": {"Lisa": 1}}
+        )
+        self.assertEqual(analytics["topic_evolution"]["windows"], [{
+            "timestamp_start": self.chat.messages[0].timestamp.isoformat(),
+            "timestamp_end": self.chat.messages[2].timestamp.isoformat(),
+            "key_terms": {"welcome": 1, "solar": 1, "panels": 1, "good": 1, "they": 1},
+            "sentiment": "positive"
+        }])
+
+    def test_interactions(self):
+        """Test that messages count as replies to their parent, else to their thread, else to the previous message."""
+        self.chat.add_message("Maya", "Which panels?", parent_id="1")
+        self.chat.add_message("Oscar", "Monocrystalline.", thread_id=self.thread_id)
+        self.chat.add_message("Oscar", "They last longer.")
+        self.chat.add_message("Lisa", "Agreed.", parent_id="42")
+
+        self.assertEqual(self.chat.get_analytics()["interaction_patterns"]["interaction_matrix"], {
+            "System": {},
+            "Lisa": {"System": 1, "Oscar": 1},
+            "Oscar": {"Lisa": 2},
+            "Maya": {"Lisa": 1}
+        })
+
+    def test_export_json(self):
+        """Test the JSON export of the messages, threads and users."""
+        history = json.loads(self.chat.export_chat_history("json"))
+
+        self.assertEqual([msg["sender"] for msg in history["messages"]], ["System", "Lisa", "Oscar"])
+        self.assertEqual(history["messages"][0]["type"], "system")
+        self.assertEqual(history["messages"][1]["thread_id"], self.thread_id)
+        self.assertEqual(history["messages"][1]["reactions"], {"👍": ["Oscar"]})
+        self.assertEqual(history["messages"][1]["metadata"], {"round": 1})
+        self.assertEqual(
+            set(history["threads"][self.thread_id][0]),
+            {"sender", "content", "timestamp", "type", "reactions", "metadata"}
+        )
+        self.assertEqual(len(history["users"]), 3)
+
+    def test_export_jsonl(self):
+        """Test that the JSON Lines export has one line per message, like the JSON messages."""
+        lines = self.chat.export_chat_history("jsonl").splitlines()
+
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            json.loads(self.chat.export_chat_history("json"))["messages"]
+        )
+        self.assertEqual(ChatInterface().export_chat_history("jsonl"), "")
+
+    def test_log(self):
+        """Test that messages and their updates are appended to the log as they happen."""
+        with TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "chat", "log.jsonl")
+            chat = ChatInterface(log_file=log_file)
+            chat.add_message("Lisa", "Solar panels are good.")
+            chat.add_message("Oscar", "They need maintenance.")
+            chat.add_reaction(0, "Oscar", "👍")
+            chat.add_reaction(0, "Oscar", "👍")
+            thread_id = chat.create_thread(1)
+            chat.close()
+
+            with open(log_file, 'rb') as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual([(record["record"], record["id"]) for record in records], [
+            ("message", 0), ("message", 1), ("message_update", 0), ("message_update", 1)
+        ])
+        self.assertEqual(records[1]["content"], "They need maintenance.")
+        self.assertEqual(records[2]["reactions"], {"👍": ["Oscar"]})
+        self.assertEqual(records[3]["thread_id"], thread_id)
+
+    def test_export_markdown_and_html(self):
+        """Test the Markdown and HTML exports, and that the HTML one escapes the contents."""
+        self.chat.add_message("Maya", "<script>alert('hi')</script>")
+        lisa = self.chat.messages[1]
+
+        markdown = self.chat.export_chat_history("markdown")
+        self.assertEqual(markdown, "".join(self.chat.iter_export_markdown()))
+        self.assertIn(
+            f"\n\n**Lisa** ({lisa.iso_timestamp}) (Thread: {self.thread_id})\nSolar panels are good.\nReactions: 👍: 1\n\n",
+            markdown
+        )
+
+        html = self.chat.export_chat_history("html")
+        self.assertTrue(html.startswith("<div class='chat-history'>\n<div class='message'>"))
+        self.assertTrue(html.endswith("</div>\n</div>"))
+        self.assertIn("<span class='reaction'>👍 (1)</span>", html)
+        self.assertIn("&lt;script&gt;alert(&#x27;hi&#x27;)&lt;/script&gt;", html)
+        self.assertNotIn("<script>", html)
+
+    def test_export_unsupported_format(self):
+        """Test that unknown export formats are rejected."""
+        with self.assertRaises(ValueError):
+            self.chat.export_chat_history("xml")
+
+if __name__ == '__main__':
+    unittest.main()
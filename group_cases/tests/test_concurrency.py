@@ -0,0 +1,38 @@
+"""
+Unit tests for the concurrency module.
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from group_cases.src.utils import concurrency
+
+class TestAgentConcurrency(unittest.TestCase):
+    """Test cases for the limit on concurrently acting agents."""
+
+    def test_concurrent_without_cache_or_simulation(self):
+        """Test that agents act concurrently when neither the API cache nor a simulation is in use."""
+        with patch.object(concurrency.openai_utils, "client", return_value=SimpleNamespace(cache_api_calls=False)), \
+                patch.object(concurrency.control, "current_simulation", return_value=None):
+            self.assertEqual(concurrency.agent_concurrency(8), 8)
+            self.assertEqual(concurrency.agent_concurrency(0), 1)
+
+    def test_serial_with_api_cache(self):
+        """Test that agents act one at a time while API calls are cached."""
+        with patch.object(concurrency.openai_utils, "client", return_value=SimpleNamespace(cache_api_calls=True)), \
+                patch.object(concurrency.control, "current_simulation", return_value=None):
+            self.assertEqual(concurrency.agent_concurrency(8), 1)
+
+    def test_serial_during_simulation(self):
+        """Test that agents act one at a time while a simulation is active."""
+        with patch.object(concurrency.openai_utils, "client", return_value=SimpleNamespace(cache_api_calls=False)), \
+                patch.object(concurrency.control, "current_simulation", return_value=object()):
+            self.assertEqual(concurrency.agent_concurrency(8), 1)
+
+    def test_unsupported_api_type(self):
+        """Test that an API type without a client does not limit concurrency."""
+        with patch.object(concurrency.openai_utils, "client", side_effect=ValueError("Unsupported API type")), \
+                patch.object(concurrency.control, "current_simulation", return_value=None):
+            self.assertEqual(concurrency.agent_concurrency(4), 4)
+
+if __name__ == '__main__':
+    unittest.main()
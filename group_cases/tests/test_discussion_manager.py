@@ -1,10 +1,16 @@
 """
 Unit tests for the discussion manager module.
 """
+import asyncio
+import json
+import os
+import time
 import unittest
+from tempfile import TemporaryDirectory
 from unittest.mock import Mock, patch
+from tinytroupe.environment import TinyWorld
 from group_cases.src.core.discussion_manager import DiscussionManager, Agent, AgentGroup
-from group_cases.src.core.base_discussion import BaseDiscussion, DiscussionType
+from group_cases.src.core.base_discussion import BaseDiscussion, BRAINSTORMING
 from group_cases.src.core.prompt import Prompt
 
 class TestDiscussionManager(unittest.TestCase):
@@ -12,9 +18,11 @@ class TestDiscussionManager(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        TinyWorld.clear_environments()
+
         self.mock_discussion = Mock(spec=BaseDiscussion)
         self.mock_discussion.name = "Test Discussion"
-        self.mock_discussion.discussion_type = DiscussionType.BRAINSTORMING
+        self.mock_discussion.discussion_type = BRAINSTORMING
         self.mock_discussion.context = {}
         
         self.manager = DiscussionManager(self.mock_discussion)
@@ -49,27 +57,45 @@ class TestDiscussionManager(unittest.TestCase):
         mock_agent_group.assert_called_once()
         self.assertIsNotNone(self.manager.agent_group)
         
+    @patch('group_cases.src.core.discussion_manager.Agent')
+    @patch('group_cases.src.core.discussion_manager.AgentGroup')
+    def test_world_is_created_lazily(self, mock_agent_group, mock_agent):
+        """Test that the world is only created once needed, with all the agents."""
+        def create_agent(name):
+            agent = Mock()
+            agent.name = name
+            return agent
+        mock_agent.side_effect = create_agent
+        self.manager.setup_agents([{"name": "Moderator"}])
+        self.assertIsNone(self.manager._world)
+        self.assertNotIn("Test Discussion", TinyWorld.all_environments)
+
+        world = self.manager.world
+        self.manager.setup_agents([{"name": "Observer"}])
+
+        self.assertIs(self.manager.world, world)
+        self.assertIs(self.manager.get_agent("Observer"), self.manager.agents[1])
+        self.assertIsNone(self.manager.get_agent("Critic"))
+        self.assertEqual(world.agents, self.manager.agents)
+        self.assertEqual(len(world.agents), 2)
+
     @patch('group_cases.src.core.discussion_manager.AgentGroup')
     def test_run_step_without_setup(self, mock_agent_group):
-        """Test running step without setup."""
-        with self.assertRaises(RuntimeError):
-            self.manager.run_step({})
+        """Test that a step without agents completes without responses."""
+        self.assertEqual(
+            self.manager.run_step({}),
+            {"responses": [], "summary": "Discussion step completed"}
+        )
             
     @patch('group_cases.src.core.discussion_manager.Agent')
     @patch('group_cases.src.core.discussion_manager.AgentGroup')
     def test_run_step(self, mock_agent_group, mock_agent):
         """Test running a discussion step."""
         # Setup mocks
-        mock_agent.return_value = Mock()
-        mock_group = Mock()
-        mock_group.discuss.return_value = [
-            Mock(
-                agent_name="Agent1",
-                content="Response1",
-                metadata={"key": "value"}
-            )
-        ]
-        mock_agent_group.return_value = mock_group
+        agent = Mock()
+        agent.name = "Agent1"
+        agent.act.return_value = [{"agent": "Agent1", "action": {"content": "Response1"}}]
+        mock_agent.return_value = agent
         
         # Setup agents
         self.manager.setup_agents([
@@ -83,11 +109,123 @@ class TestDiscussionManager(unittest.TestCase):
         })
         
         # Verify results
-        self.assertEqual(result["phase"], "test_phase")
+        self.assertEqual(result["summary"], "Discussion step completed")
         self.assertEqual(len(result["responses"]), 1)
         self.assertEqual(result["responses"][0]["agent"], "Agent1")
         self.assertEqual(result["responses"][0]["response"], "Response1")
+        self.assertIn("Test_Phase", agent.listen.call_args.args[0])
         
+    def test_run_step_concurrent_agents(self):
+        """Test that agents act concurrently and responses keep the agents' order."""
+        agents = []
+        for name in ["Agent1", "Agent2", "Agent3"]:
+            agent = Mock()
+            agent.name = name
+            agent.act.return_value = [{"agent": name, "action": {"content": f"{name} response"}}]
+            agents.append(agent)
+        agents[1].act.side_effect = RuntimeError("LLM unavailable")
+        self.manager.agents = agents
+
+        result = self.manager.run_step({"phase": "test_phase", "previous_results": []})
+
+        self.assertEqual(
+            result["responses"],
+            [
+                {"agent": "Agent1", "response": "Agent1 response"},
+                {"agent": "Agent3", "response": "Agent3 response"}
+            ]
+        )
+        for agent in agents:
+            agent.act.assert_called_once_with(return_actions=True)
+
+    def test_stream_step(self):
+        """Test that responses are streamed in the order agents finish."""
+        agents = []
+        for name, delay in [("Slow", 0.2), ("Fast", 0.0)]:
+            agent = Mock()
+            agent.name = name
+            agent.act.side_effect = lambda return_actions, name=name, delay=delay: (
+                time.sleep(delay) or [{"agent": name, "action": {"content": f"{name} response"}}]
+            )
+            agents.append(agent)
+        self.manager.agents = agents
+
+        async def stream():
+            return [response["agent"] async for response in self.manager.astream_step({"phase": "ideas"})]
+
+        self.assertEqual(asyncio.run(stream()), ["Fast", "Slow"])
+        self.assertEqual(
+            [response["agent"] for response in self.manager.run_step({"phase": "ideas"})["responses"]],
+            ["Slow", "Fast"]
+        )
+
+    def test_concurrent_steps(self):
+        """Test that each agent handles concurrent steps one at a time."""
+        agent = Mock()
+        agent.name = "Agent1"
+        agent.act.return_value = [{"agent": "Agent1", "action": {"content": "response"}}]
+        self.manager.agents = [agent]
+
+        async def run_steps():
+            return await asyncio.gather(
+                self.manager.arun_step({"phase": "first"}),
+                self.manager.arun_step({"phase": "second"})
+            )
+
+        results = asyncio.run(run_steps())
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            [name for name, _, _ in agent.mock_calls],
+            ["listen", "act", "listen", "act"]
+        )
+        self.assertIn("First", agent.listen.call_args_list[0].args[0])
+        self.assertIn("Second", agent.listen.call_args_list[1].args[0])
+
+    def test_response_cache(self):
+        """Test that agents don't act again for a prompt they already responded to."""
+        with TemporaryDirectory() as tmpdir:
+            TinyWorld.clear_environments()
+            manager = DiscussionManager(self.mock_discussion, use_cache=True,
+                                        cache_file=os.path.join(tmpdir, "responses.pkl"))
+            agent = Mock()
+            agent.name = "Agent1"
+            agent.act.return_value = [{"agent": "Agent1", "action": {"content": "Response"}}]
+            manager.agents = [agent]
+
+            first = manager.run_step({"phase": "ideas"})
+            second = manager.run_step({"phase": "ideas"})
+            manager.run_step({"phase": "consolidation"})
+
+            self.assertEqual(first, second)
+            self.assertEqual(agent.act.call_count, 2)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "responses.pkl")))
+
+    def test_step_prompt_cache_prefix(self):
+        """Test that step prompts only start with the static prefix when the prompt cache is used."""
+        self.assertNotIn(self.manager._static_prefix, self.manager._create_step_prompt({"phase": "first"}))
+
+        self.manager.use_prompt_cache = True
+        first = self.manager._create_step_prompt({"phase": "first"})
+        second = self.manager._create_step_prompt({"phase": "second"})
+
+        self.assertTrue(first.startswith(self.manager._static_prefix + "\n"))
+        self.assertTrue(second.startswith(self.manager._static_prefix + "\n"))
+        self.assertIn("First", first[len(self.manager._static_prefix):])
+
+    def test_dumps_results(self):
+        """Test that previous results are serialized like json.dumps, and only once each."""
+        results = [
+            {"responses": [{"agent": "Agent1", "response": "Line 1\nLine 2"}], "summary": "Done"},
+            {"responses": [], "summary": "Empty"}
+        ]
+
+        self.assertEqual(self.manager._dumps_results(results), json.dumps(results, indent=2))
+        self.assertEqual(self.manager._dumps_results([]), "[]")
+
+        results[0]["summary"] = "Changed"
+        self.assertIn('"Done"', self.manager._dumps_results(results))
+
     def test_generate_personality(self):
         """Test personality generation."""
         # Test known role
@@ -123,10 +261,16 @@ class TestDiscussionManager(unittest.TestCase):
         prompt = self.manager._create_step_prompt(context)
         
         # Verify prompt structure
-        self.assertIsInstance(prompt, Prompt)
-        self.assertIn("test_phase", prompt.template)
-        self.assertEqual(prompt.variables["phase"], "test_phase")
-        self.assertEqual(prompt.variables["step"], 1)
+        self.assertIsInstance(prompt, str)
+        self.assertIn("You are participating in a brainstorming discussion about .", prompt)
+        self.assertIn('Current Context:\n{\n  "key": "value"\n}', prompt)
+        self.assertIn("Task:\nTest_Phase\n", prompt)
+        self.assertIn("Previous Discussion:\n[]\n", prompt)
+
+        # The formatted prompt is the one of the step's Prompt
+        built = self.manager._build_step_prompt(context)
+        self.assertIsInstance(built, Prompt)
+        self.assertEqual(built.format(), prompt)
         
 if __name__ == '__main__':
     unittest.main()
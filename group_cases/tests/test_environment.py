@@ -0,0 +1,85 @@
+"""
+Unit tests for the environment module.
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from tinytroupe.agent import TinyPerson
+from group_cases.src.core.environment import TinyWorld, TinySocialNetwork
+
+class TestTinyWorld(unittest.TestCase):
+    """Test cases for TinyWorld class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        TinyPerson.clear_agents()
+        TinyWorld.clear_environments()
+        self.agents = [TinyPerson("Lisa"), TinyPerson("Oscar")]
+
+    def test_broadcast(self):
+        """Test that broadcasts are recorded, and heard by all agents but their source."""
+        world = TinyWorld("Roof Talk", self.agents)
+        with patch.object(TinyPerson, "communication_display", False):
+            world.broadcast("The roof leaks.")
+            world.broadcast("I will fix it.", source=self.agents[0])
+
+        self.assertEqual([message["content"] for message in world.messages], ["The roof leaks.", "I will fix it."])
+        self.assertNotIn("I will fix it.", self.agents[0].pretty_current_interactions(max_content_length=None))
+        self.assertIn("I will fix it.", self.agents[1].pretty_current_interactions(max_content_length=None))
+        self.assertEqual(self.agents[0]._configuration["currently_accessible_agents"][0]["name"], "Oscar")
+
+    def test_unique_names(self):
+        """Test that worlds of the same name are numbered, and that closed worlds free their name."""
+        first = TinyWorld("Roof Talk", self.agents)
+        second = TinyWorld("Roof Talk", self.agents)
+        self.assertEqual((first.name, second.name), ("Roof Talk", "Roof Talk (2)"))
+
+        first.close()
+        self.assertEqual(TinyWorld("Roof Talk", self.agents).name, "Roof Talk")
+
+class TestTinySocialNetwork(unittest.TestCase):
+    """Test cases for TinySocialNetwork class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.network = TinySocialNetwork([SimpleNamespace(name=name) for name in ["Lisa", "Oscar", "Marcos"]])
+
+    def test_initial_relationships(self):
+        """Test that every pair of distinct agents starts with default metrics."""
+        relationships = self.network.relationships
+
+        self.assertEqual(set(relationships), {"Lisa", "Oscar", "Marcos"})
+        self.assertEqual(set(relationships["Lisa"]), {"Oscar", "Marcos"})
+        self.assertEqual(relationships["Lisa"]["Oscar"], {"trust": 0.5, "familiarity": 0.0})
+
+    def test_update_relationship(self):
+        """Test that updates are directed and clamped to [0, 1]."""
+        self.network.update_relationship("Lisa", "Oscar", trust_delta=0.75, familiarity_delta=0.5)
+        self.network.update_relationship("Oscar", "Lisa", trust_delta=-0.75, familiarity_delta=0.125)
+
+        relationships = self.network.relationships
+        self.assertEqual(relationships["Lisa"]["Oscar"], {"trust": 1.0, "familiarity": 0.5})
+        self.assertEqual(relationships["Oscar"]["Lisa"], {"trust": 0.0, "familiarity": 0.125})
+
+    def test_update_unknown_or_self_relationship(self):
+        """Test that updates of unknown agents or of an agent with itself are ignored."""
+        self.network.update_relationship("Lisa", "Unknown")
+        self.network.update_relationship("Lisa", "Lisa")
+
+        self.assertEqual(self.network.relationships["Oscar"]["Lisa"]["familiarity"], 0.0)
+
+    def test_bulk_update(self):
+        """Test that bulk updates apply to all relationships and are clamped."""
+        trust_deltas = np.zeros((3, 3))
+        trust_deltas[0, 1] = 0.75
+
+        self.network.bulk_update(trust_deltas=trust_deltas, familiarity_deltas=0.25)
+
+        relationships = self.network.relationships
+        self.assertEqual(relationships["Lisa"]["Oscar"], {"trust": 1.0, "familiarity": 0.25})
+        self.assertEqual(relationships["Marcos"]["Oscar"], {"trust": 0.5, "familiarity": 0.25})
+        self.assertTrue(np.isnan(self.network.trust[0, 0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for the group discussion module.
+"""
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from tinytroupe.agent import TinyPerson
+from group_cases.src import group_discussion
+from group_cases.src.group_discussion import DiscussionType, GroupDiscussion, run_many
+from group_cases.src.core.environment import TinyWorld
+from group_cases.src.utils.db_utils import DatabaseManager
+from group_cases.src.utils.response_cache import ResponseCache
+
+def _produce_message(agent):
+    """Stand-in for the LLM call of an acting agent: it says something to everyone, then is done."""
+    if agent._actions_buffer:
+        action = {"type": "DONE", "content": "", "target": ""}
+    else:
+        action = {"type": "TALK", "content": f"{agent.name} talks about roofs", "target": ""}
+    return "assistant", {"action": action, "cognitive_state": {"goals": "", "attention": "", "emotions": ""}}
+
+def _extract_from_world(world, extraction_objective=None, fields=None):
+    """Stand-in for the LLM extraction: the results summarize the world's messages."""
+    return {"messages": len(world.messages)}
+
+class TestGroupDiscussion(unittest.TestCase):
+    """Test cases for GroupDiscussion class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        TinyPerson.clear_agents()
+        TinyWorld.clear_environments()
+        self.agents = [TinyPerson("Ana Test"), TinyPerson("Ben Test")]
+
+        patchers = [
+            patch.object(TinyPerson, "_produce_message", _produce_message),
+            patch.object(TinyPerson, "communication_display", False),
+            patch.object(TinyWorld, "communication_display", False),
+            patch.object(group_discussion, "_get_result_cache", return_value=ResponseCache()),
+            patch.object(group_discussion, "ResultsExtractor")
+        ]
+        mocks = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.extractor = mocks[-1].return_value
+        self.extractor.extract_results_from_world.side_effect = _extract_from_world
+
+    def _discussion(self, name: str = "Solar Roofs", agents=None) -> GroupDiscussion:
+        """Create a discussion of the given agents, by default the test agents."""
+        discussion = GroupDiscussion(name, DiscussionType.CUSTOM, "Discussing solar roofs", agents=agents or self.agents)
+        discussion.configure_extraction(objective="Summarize the discussion")
+        return discussion
+
+    def test_run_discussion(self):
+        """Test that the situation is broadcast, every agent talks at every step, and the results are extracted."""
+        discussion = self._discussion()
+        discussion.situation = "The roof needs replacing."
+
+        self.assertEqual(discussion.run_discussion(num_steps=3), {"messages": 7})
+        messages = [message["content"] for message in discussion.world.messages]
+        self.assertEqual(messages[:3], [
+            "The roof needs replacing.", "Ana Test talks about roofs", "Ben Test talks about roofs"
+        ])
+        self.assertIn("Ben Test talks about roofs", self.agents[0].pretty_current_interactions(max_content_length=None))
+
+    def test_default_agents_are_pooled(self):
+        """Test that default agents stay with their discussion until released, and are then reused by the next one."""
+        with GroupDiscussion("Pool A", DiscussionType.INTERVIEW) as discussion:
+            self.assertEqual(discussion.run_discussion(num_steps=2), {"messages": 2})
+            (agent,) = discussion.agents
+            self.assertEqual(agent.name, "Lisa_Pool A")
+            self.assertEqual(len(discussion.world.messages), 2)
+
+        with GroupDiscussion("Pool B", DiscussionType.INTERVIEW) as discussion:
+            self.assertEqual(discussion.agents, [agent])
+            self.assertEqual(agent.name, "Lisa_Pool B")
+            self.assertEqual(discussion.world.messages, [])
+
+    def test_results_are_cached(self):
+        """Test that an identical run returns the cached results, without running or extracting again."""
+        self.assertEqual(self._discussion().run_discussion(num_steps=2), {"messages": 4})
+
+        discussion = self._discussion()
+        self.assertEqual(discussion.run_discussion(num_steps=2), {"messages": 4})
+        self.assertEqual(discussion.world.messages, [])
+        self.assertEqual(self.extractor.extract_results_from_world.call_count, 1)
+
+        self.assertEqual(discussion.run_discussion(num_steps=2, use_cache=False), {"messages": 4})
+        self.assertEqual(self.extractor.extract_results_from_world.call_count, 2)
+
+    def test_cached_results_need_no_agents(self):
+        """Test that results cached for default agents are found without building or leasing the agents again."""
+        with GroupDiscussion("Cached Interview", DiscussionType.INTERVIEW) as discussion:
+            results = discussion.run_discussion(num_steps=2)
+
+        discussion = GroupDiscussion("Cached Interview", DiscussionType.INTERVIEW)
+        self.assertEqual(discussion.run_discussion(num_steps=2), results)
+        self.assertIsNone(discussion._agents)
+        self.assertEqual(discussion._leased_agents, [])
+        self.assertEqual(self.extractor.extract_results_from_world.call_count, 1)
+
+    def test_extraction_cache(self):
+        """Test that results are only extracted again once the transcript changed."""
+        discussion = self._discussion()
+        discussion.world.run(1)
+
+        results = discussion.get_results()
+        results["messages"] = 0
+        self.assertEqual(discussion.get_results(), {"messages": 2})
+        self.assertEqual(self.extractor.extract_results_from_world.call_count, 1)
+
+        discussion.world.run(1)
+        self.assertEqual(discussion.get_results(), {"messages": 4})
+        self.assertEqual(self.extractor.extract_results_from_world.call_count, 2)
+
+    def test_results_after_run_discussion(self):
+        """Test that getting the results of a finished discussion reuses the extraction of its run."""
+        with GroupDiscussion("Extraction", DiscussionType.INTERVIEW) as discussion:
+            discussion.configure_extraction(objective="Summarize the interview")
+            results = discussion.run_discussion(num_steps=3)
+
+            self.assertEqual(discussion.get_results(), results)
+            self.assertEqual(results, {"messages": 3})
+            self.assertEqual(self.extractor.extract_results_from_world.call_count, 1)
+
+    def test_run_discussion_stream(self):
+        """Test that streamed discussions stop once all the extraction fields have a value."""
+        self.extractor.extract_results_from_world.side_effect = lambda world, **kwargs: {
+            "summary": "Solar roofs pay off" if len(world.messages) >= 4 else None
+        }
+        discussion = self._discussion()
+        discussion.configure_extraction(objective="Summarize the discussion", fields=["summary"])
+
+        results = list(discussion.run_discussion_stream(num_steps=5))
+
+        self.assertEqual(results, [{"summary": None}, {"summary": "Solar roofs pay off"}])
+        self.assertEqual(len(discussion.world.messages), 4)
+
+    def test_run_many(self):
+        """Test that independent discussions are all run, and their results returned by name."""
+        discussions = [
+            self._discussion(f"Discussion {i}", agents=[TinyPerson(f"Ana {i}"), TinyPerson(f"Ben {i}")])
+            for i in range(3)
+        ]
+
+        results = run_many(discussions, num_steps=2, max_workers=2)
+
+        self.assertEqual(results, {f"Discussion {i}": {"messages": 4} for i in range(3)})
+
+    def test_batched_database_writes(self):
+        """Test that saved results are stored in the databases in batches."""
+        discussion = self._discussion()
+        with TemporaryDirectory() as tmpdir, \
+                patch.object(GroupDiscussion, "_batch_size", 2), \
+                patch.object(DatabaseManager, "store_data_batch") as mock_store:
+            discussion.save_results({"messages": 1}, os.path.join(tmpdir, "results", "first.json"))
+            mock_store.assert_not_called()
+
+            discussion.save_results({"messages": 2}, os.path.join(tmpdir, "results", "second.json"))
+            mock_store.assert_called_once()
+            self.assertEqual([results for results, _ in mock_store.call_args.args[0]], [{"messages": 1}, {"messages": 2}])
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "results", "second.json")))
+
+            GroupDiscussion.flush_pending_writes()
+            mock_store.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
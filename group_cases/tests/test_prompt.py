@@ -0,0 +1,45 @@
+"""
+Unit tests for the prompt module.
+"""
+import unittest
+from group_cases.src.core.prompt import Prompt, _compile_template, _format_template
+
+class TestPrompt(unittest.TestCase):
+    """Test cases for Prompt class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        _format_template.cache_clear()
+        self.prompt = Prompt("Discuss {topic} with {count} agents", {"topic": "solar panels"})
+
+    def test_format_cached(self):
+        """Test that identical formattings are served from the cache."""
+        self.assertEqual(self.prompt.format_cached(count=3), "Discuss solar panels with 3 agents")
+        self.assertEqual(self.prompt.format_cached(count=3), self.prompt.format(count=3))
+        self.assertEqual(_format_template.cache_info().hits, 1)
+
+    def test_format_cached_distinguishes_types(self):
+        """Test that equal values of different types are not mixed up."""
+        self.assertEqual(self.prompt.format_cached(count=1), "Discuss solar panels with 1 agents")
+        self.assertEqual(self.prompt.format_cached(count=True), "Discuss solar panels with True agents")
+
+    def test_format_cached_unhashable(self):
+        """Test that unhashable variable values are formatted without the cache."""
+        self.assertEqual(self.prompt.format_cached(count=[1, 2]), "Discuss solar panels with [1, 2] agents")
+
+    def test_compiled_template(self):
+        """Test that compiled templates format like str.format."""
+        template = "{{Literal}} {name!r:>8} scored {score:.1f}\\n, again {name}"
+        prompt = Prompt(template, {"name": "Lisa"})
+
+        self.assertIsNotNone(_compile_template(template))
+        self.assertEqual(prompt.format(score=9.25), template.format(name="Lisa", score=9.25))
+        with self.assertRaises(KeyError):
+            prompt.format()
+
+        # Fields that can't be inlined are left to str.format
+        self.assertIsNone(_compile_template("{0} and {value.real:{width}}"))
+        self.assertEqual(Prompt("{value.real}").format(value=2), "2")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit tests for the response cache module.
+"""
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from group_cases.src.utils.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = ResponseCache(max_entries=2)
+
+    def test_make_key(self):
+        """Test that keys identify the request parts."""
+        self.assertEqual(ResponseCache.make_key("Agent1", "ideas", "prompt"), ResponseCache.make_key("Agent1", "ideas", "prompt"))
+        self.assertNotEqual(ResponseCache.make_key("Agent1", "ideas", "prompt"), ResponseCache.make_key("Agent2", "ideas", "prompt"))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted first."""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.put("c", 3)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_ttl(self):
+        """Test that expired entries are not returned."""
+        cache = ResponseCache(ttl=60)
+        with patch("group_cases.src.utils.response_cache.time.time", return_value=1000.0):
+            cache.put("a", 1)
+        with patch("group_cases.src.utils.response_cache.time.time", return_value=1030.0):
+            self.assertEqual(cache.get("a"), 1)
+        with patch("group_cases.src.utils.response_cache.time.time", return_value=1100.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_persistence(self):
+        """Test that the cache is persisted and reloaded from disk."""
+        with TemporaryDirectory() as tmpdir:
+            cache_file = os.path.join(tmpdir, "cache", "responses.pkl")
+
+            cache = ResponseCache(cache_file=cache_file)
+            cache.put("a", {"action": {"content": "Response"}})
+            cache.save()
+
+            self.assertEqual(ResponseCache(cache_file=cache_file).get("a"), {"action": {"content": "Response"}})
+
+if __name__ == '__main__':
+    unittest.main()
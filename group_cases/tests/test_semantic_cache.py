@@ -0,0 +1,105 @@
+"""
+Unit tests for the semantic cache module.
+"""
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+import numpy as np
+from group_cases.src.utils.semantic_cache import SemanticCache
+
+# Deterministic embeddings, so the tests don't depend on downloading a model
+EMBEDDINGS = {
+    "What do you think about solar panels?": [1.0, 0.0, 0.0],
+    "What do you think about solar panels": [0.95, 0.05, 0.0],
+    "Tell me about your favourite food.": [0.0, 1.0, 0.0]
+}
+
+class TestSemanticCache(unittest.TestCase):
+    """Test cases for SemanticCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = self._create_cache()
+
+    def _create_cache(self, cache_file=None, max_entries=10000):
+        cache = SemanticCache(threshold=0.85, cache_file=cache_file, max_entries=max_entries)
+        cache._embed = lambda text: np.array(EMBEDDINGS[text]) / np.linalg.norm(EMBEDDINGS[text])
+        return cache
+
+    def test_exact_hit(self):
+        """Test that identical prompts reuse the computed value."""
+        compute = Mock(return_value=["response"])
+
+        first = self.cache.get_or_compute("Lisa", "What do you think about solar panels?", compute)
+        second = self.cache.get_or_compute("Lisa", "What do you think about solar panels?", compute)
+
+        self.assertEqual(first, ["response"])
+        self.assertEqual(second, ["response"])
+        compute.assert_called_once()
+
+    def test_semantic_hit_and_miss(self):
+        """Test that only sufficiently similar prompts are served from the cache."""
+        self.cache.put("Lisa", "What do you think about solar panels?", ["solar"])
+
+        self.assertEqual(self.cache.get("Lisa", "What do you think about solar panels"), ["solar"])
+        self.assertIsNone(self.cache.get("Lisa", "Tell me about your favourite food."))
+
+    def test_namespaces_are_isolated(self):
+        """Test that entries are not shared across namespaces."""
+        self.cache.put("Lisa", "What do you think about solar panels?", ["solar"])
+
+        self.assertIsNone(self.cache.get("Oscar", "What do you think about solar panels?"))
+
+    def test_empty_values_are_not_cached(self):
+        """Test that empty results are recomputed."""
+        compute = Mock(return_value=[])
+
+        self.cache.get_or_compute("Lisa", "What do you think about solar panels?", compute)
+        self.cache.get_or_compute("Lisa", "What do you think about solar panels?", compute)
+
+        self.assertEqual(compute.call_count, 2)
+
+    def test_put_replaces_identical_prompts(self):
+        """Test that storing a value for a cached prompt replaces its value, without adding an entry."""
+        self.cache.put("Lisa", "What do you think about solar panels?", ["solar"])
+        self.cache.put("Lisa", "What do you think about solar panels?", ["panels"])
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get("Lisa", "What do you think about solar panels"), ["panels"])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that beyond max_entries, the least recently used entries are evicted."""
+        cache = self._create_cache(max_entries=2)
+        cache.put("Lisa", "What do you think about solar panels?", ["solar"])
+        cache.put("Lisa", "Tell me about your favourite food.", ["food"])
+        cache.get("Lisa", "What do you think about solar panels?")
+        cache.put("Oscar", "Tell me about your favourite food.", ["tapas"])
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("Lisa", "Tell me about your favourite food."))
+        self.assertEqual(cache.get("Lisa", "What do you think about solar panels?"), ["solar"])
+
+    def test_persistence(self):
+        """Test that the cache is persisted and reloaded from disk."""
+        with TemporaryDirectory() as tmpdir:
+            cache_file = os.path.join(tmpdir, "responses.pkl")
+
+            cache = self._create_cache(cache_file)
+            cache.put("Lisa", "What do you think about solar panels?", ["solar"])
+            self.assertFalse(os.path.exists(cache_file))
+            cache.save()
+            self.assertTrue(os.path.exists(cache_file))
+
+            reloaded = self._create_cache(cache_file)
+            self.assertEqual(
+                reloaded.get("Lisa", "What do you think about solar panels?"),
+                ["solar"]
+            )
+            self.assertEqual(
+                reloaded.get("Lisa", "What do you think about solar panels"),
+                ["solar"]
+            )
+
+if __name__ == '__main__':
+    unittest.main()
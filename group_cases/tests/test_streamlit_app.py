@@ -0,0 +1,42 @@
+"""
+Unit tests for the Streamlit app module.
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from group_cases.src import streamlit_app
+
+class TestStreamlitApp(unittest.TestCase):
+    """Test cases for the Streamlit app helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.lisa = SimpleNamespace(name="Lisa Test")
+        self.oscar = SimpleNamespace(name="Oscar Test")
+        # The character group the app imports, without creating its characters' agents
+        self.group = streamlit_app.CharacterGroup.__new__(streamlit_app.CharacterGroup)
+
+    def test_generate_responses(self):
+        """Test that the responses of the app's character group are returned in the characters' order."""
+        session_state = SimpleNamespace(
+            selected_characters=[self.lisa, self.oscar],
+            character_group=self.group,
+            discussion_obj=SimpleNamespace(discussion_name="Green roofs")
+        )
+        responses = {"Lisa Test": "Roofs can hold gardens.", "Oscar Test": None}
+
+        with patch.object(streamlit_app.st, "session_state", session_state), \
+                patch.object(streamlit_app.CharacterGroup, "_generate_character_response", autospec=True,
+                             side_effect=lambda group, char, prompt, discussion: responses[char.name]) as mock_generate:
+            result = streamlit_app.generate_responses("What about green roofs?")
+
+        self.assertEqual(result, [(self.lisa, "Roofs can hold gardens."), (self.oscar, None)])
+        self.assertEqual(mock_generate.call_count, 2)
+
+    def test_generate_responses_without_characters(self):
+        """Test that no responses are generated when no characters are selected."""
+        with patch.object(streamlit_app.st, "session_state", SimpleNamespace(selected_characters=[])):
+            self.assertEqual(streamlit_app.generate_responses("Hello"), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@ Unit tests for synthetic data generation.
 import unittest
 from datetime import datetime
 from group_cases.src.utils.synthetic_data import SyntheticDataGenerator
-from group_cases.src.core.base_discussion import DiscussionType
+from group_cases.src.core.base_discussion import DISCUSSION_TYPES, BRAINSTORMING, EVALUATION, INTERVIEW
 
 class TestSyntheticDataGenerator(unittest.TestCase):
     """Test cases for SyntheticDataGenerator class."""
@@ -16,7 +16,7 @@ class TestSyntheticDataGenerator(unittest.TestCase):
     def test_generate_discussion_data(self):
         """Test complete discussion data generation."""
         data = self.generator.generate_discussion_data(
-            DiscussionType.BRAINSTORMING,
+            BRAINSTORMING,
             num_participants=3,
             num_steps=2
         )
@@ -45,19 +45,19 @@ class TestSyntheticDataGenerator(unittest.TestCase):
             
     def test_different_discussion_types(self):
         """Test data generation for different discussion types."""
-        for discussion_type in DiscussionType:
+        for discussion_type in DISCUSSION_TYPES:
             data = self.generator.generate_discussion_data(discussion_type)
             
             # Check type-specific content
             for step in data["steps"]:
                 for response in step["responses"]:
-                    if discussion_type == DiscussionType.BRAINSTORMING:
+                    if discussion_type == BRAINSTORMING:
                         self.assertIn("num_ideas", response)
                         self.assertIn("creativity_score", response)
-                    elif discussion_type == DiscussionType.EVALUATION:
+                    elif discussion_type == EVALUATION:
                         self.assertIn("rating", response)
                         self.assertIn("confidence_score", response)
-                    elif discussion_type == DiscussionType.INTERVIEW:
+                    elif discussion_type == INTERVIEW:
                         self.assertIn("answer_completeness", response)
                         self.assertIn("follow_up_questions", response)
                         
@@ -66,8 +66,8 @@ class TestSyntheticDataGenerator(unittest.TestCase):
         gen1 = SyntheticDataGenerator(seed=42)
         gen2 = SyntheticDataGenerator(seed=42)
         
-        data1 = gen1.generate_discussion_data(DiscussionType.BRAINSTORMING)
-        data2 = gen2.generate_discussion_data(DiscussionType.BRAINSTORMING)
+        data1 = gen1.generate_discussion_data(BRAINSTORMING)
+        data2 = gen2.generate_discussion_data(BRAINSTORMING)
         
         # Compare key metrics
         self.assertEqual(
@@ -111,9 +111,9 @@ class TestSyntheticDataGenerator(unittest.TestCase):
             
     def test_metadata(self):
         """Test metadata generation."""
-        metadata = self.generator._generate_metadata(DiscussionType.BRAINSTORMING)
+        metadata = self.generator._generate_metadata(BRAINSTORMING)
         
-        self.assertEqual(metadata["type"], DiscussionType.BRAINSTORMING.value)
+        self.assertEqual(metadata["type"], BRAINSTORMING)
         self.assertEqual(metadata["version"], "1.0")
         self.assertEqual(metadata["seed"], 42)
         
@@ -128,21 +128,21 @@ class TestSyntheticDataGenerator(unittest.TestCase):
         # Test brainstorming phases
         phase = self.generator._get_phase_name(
             0,
-            DiscussionType.BRAINSTORMING
+            BRAINSTORMING
         )
         self.assertEqual(phase, "ideation")
         
         # Test evaluation phases
         phase = self.generator._get_phase_name(
             1,
-            DiscussionType.EVALUATION
+            EVALUATION
         )
         self.assertEqual(phase, "assessment")
         
         # Test interview phases
         phase = self.generator._get_phase_name(
             2,
-            DiscussionType.INTERVIEW
+            INTERVIEW
         )
         self.assertEqual(phase, "deep_dive")
         
@@ -99,7 +99,6 @@ def aux_extract_content(focus_agent: TinyPerson, source_agent:TinyPerson, target
     
     
     entry = (author, content)
-    print(entry)
     return entry
     
 
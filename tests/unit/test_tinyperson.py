@@ -63,6 +63,16 @@ def test_define_several(setup):
         assert "Machine learning" in agent._configuration["skills"], f"{agent.name} should have Machine learning as a skill."
         assert "GPT-3" in agent._configuration["skills"], f"{agent.name} should have GPT-3 as a skill."
 
+def test_minibio(setup):
+    # Test that the mini-biography is cached, but refreshed after the configuration changes
+    for agent in [create_oscar_the_architect(), create_lisa_the_data_scientist()]:
+        bio = agent.minibio()
+        assert agent.name in bio, f"{agent.name} should have the name in the mini-biography."
+        assert agent.minibio() is bio, f"{agent.name} should reuse the cached mini-biography while the configuration is unchanged."
+
+        agent.define('age', 25)
+        assert '25 year old' in agent.minibio(), f"{agent.name} should have the new age in the mini-biography after defining it."
+
 def test_socialize(setup):
     # Test that socializing with another agent works as expected
     an_oscar = create_oscar_the_architect()
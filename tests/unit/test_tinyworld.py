@@ -45,6 +45,17 @@ def test_broadcast(setup, focus_group_world):
         assert "Folks, we need to brainstorm" in agent.episodic_memory.retrieve_first(1)[0]['content']['stimuli'][0]['content'], f"{agent.name} should have received the message."
 
 
+def test_make_everyone_accessible(setup, focus_group_world):
+    world = focus_group_world
+    world.make_everyone_accessible()
+
+    for agent in world.agents:
+        accessible_names = [a["name"] for a in agent._configuration["currently_accessible_agents"]]
+
+        # every other agent should be accessible exactly once, and the agent itself should not
+        assert agent.name not in accessible_names, f"{agent.name} should not be accessible to itself."
+        assert sorted(accessible_names) == sorted(other.name for other in world.agents if other is not agent), f"{agent.name} should have access to all the other agents."
+
 def test_encode_complete_state(setup, focus_group_world):
     world = focus_group_world
 
@@ -154,6 +154,9 @@ class TinyPerson(JsonSerializableRegistry):
         # saving these communications to another output form later (e.g., caching)
         self._displayed_communications_buffer = []
 
+        # the rendered mini-biography, computed on demand and invalidated whenever the configuration changes
+        self._minibio_cache = None
+
         if not hasattr(self, 'episodic_memory'):
             # This default value MUST NOT be in the method signature, otherwise it will be shared across all instances.
             self.episodic_memory = EpisodicMemory()
@@ -236,6 +239,7 @@ class TinyPerson(JsonSerializableRegistry):
     def _rename(self, new_name:str):    
         self.name = new_name
         self._configuration["name"] = self.name
+        self._minibio_cache = None
 
 
     def generate_agent_prompt(self):
@@ -263,6 +267,9 @@ class TinyPerson(JsonSerializableRegistry):
 
     def reset_prompt(self):
 
+        # the configuration might have changed, so the cached mini-biography is no longer valid
+        self._minibio_cache = None
+
         # render the template with the current configuration
         self._init_system_message = self.generate_agent_prompt()
 
@@ -708,6 +715,31 @@ class TinyPerson(JsonSerializableRegistry):
                 f"[{self.name}] Agent {agent.name} is already accessible to {self.name}."
             )
 
+    @transactional
+    def make_agents_accessible(
+        self,
+        agents: list,
+        relation_description: str = "An agent I can currently interact with.",
+    ):
+        """
+        Makes several agents accessible to this agent at once. This is equivalent to calling
+        `make_agent_accessible` for each of them, but runs as a single transaction and checks
+        whether each agent is already accessible in constant time.
+        """
+        already_accessible = {id(agent) for agent in self._accessible_agents}
+
+        for agent in agents:
+            if id(agent) not in already_accessible:
+                already_accessible.add(id(agent))
+                self._accessible_agents.append(agent)
+                self._configuration["currently_accessible_agents"].append(
+                    {"name": agent.name, "relation_description": relation_description}
+                )
+            else:
+                logger.warning(
+                    f"[{self.name}] Agent {agent.name} is already accessible to {self.name}."
+                )
+
     @transactional
     def make_agent_inaccessible(self, agent: Self):
         """
@@ -893,9 +925,13 @@ class TinyPerson(JsonSerializableRegistry):
 
     def minibio(self):
         """
-        Returns a mini-biography of the TinyPerson.
+        Returns a mini-biography of the TinyPerson. The rendering is cached until the configuration changes 
+        (i.e., until the next `define`, rename or prompt reset), since it is often requested several times per agent.
         """
-        return f"{self.name} is a {self._configuration['age']} year old {self._configuration['occupation']}, {self._configuration['nationality']}, currently living in {self._configuration['country_of_residence']}."
+        if self._minibio_cache is None:
+            self._minibio_cache = f"{self.name} is a {self._configuration['age']} year old {self._configuration['occupation']}, {self._configuration['nationality']}, currently living in {self._configuration['country_of_residence']}."
+
+        return self._minibio_cache
 
     def pp_current_interactions(
         self,
@@ -1188,6 +1224,7 @@ class TinyPerson(JsonSerializableRegistry):
         new_config['name'] = new_name
 
         new_agent._configuration = new_config
+        new_agent._minibio_cache = None
 
         return new_agent
         
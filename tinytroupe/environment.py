@@ -464,10 +464,9 @@ class TinyWorld:
         """
         Makes all agents in the environment accessible to each other.
         """
+        # one batched call per agent, rather than one (transactional) call per pair of agents
         for agent_1 in self.agents:
-            for agent_2 in self.agents:
-                if agent_1 != agent_2:
-                    agent_1.make_agent_accessible(agent_2)
+            agent_1.make_agents_accessible([agent_2 for agent_2 in self.agents if agent_2 is not agent_1])
             
 
     ###########################################################